@@ -1,15 +1,50 @@
-from flask import Flask, render_template, url_for, redirect, request, abort, jsonify, flash
+from flask import Flask, render_template, url_for, redirect, request, abort, jsonify, flash, send_from_directory, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin, login_user, LoginManager, login_required, logout_user, current_user
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, DecimalField, SubmitField
 from wtforms.validators import InputRequired, Length, ValidationError, DataRequired, EqualTo
 from flask_bcrypt import Bcrypt
-from datetime import datetime, timedelta
+import click
+from datetime import datetime, timedelta, date
 import os
+import re
+import atexit
+import base64
+import binascii
+import hashlib
+import hmac
+import gzip
+import io
+import urllib.parse
+import json
+import math
+import mimetypes
+import random
+import secrets
+import shutil
+import tempfile
 import logging
+import sqlite3
+import threading
 import time
-from sqlalchemy.exc import OperationalError
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from sqlalchemy import text, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError, IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.pool import StaticPool
+from PIL import Image
+from markupsafe import Markup, escape
+from werkzeug.security import safe_join
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 instance_dir = os.path.join(basedir, 'instance')
@@ -17,33 +52,298 @@ instance_dir = os.path.join(basedir, 'instance')
 if not os.path.exists(instance_dir):
     os.makedirs(instance_dir)
 
+# Routes are registered on this app at import, but the extensions are only bound
+# by create_app(). The defaults below come from the environment; create_app()
+# then applies the Python settings file named by LAMOPETS_SETTINGS and its own
+# overrides
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(instance_dir, 'database.db')
+# DATABASE_URL can point at a file-backed or in-memory SQLite database, or at Postgres
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(instance_dir, 'database.db'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 5))
+app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+app.config['DB_LOCK_RETRIES'] = int(os.environ.get('DB_LOCK_RETRIES', 5))
+app.config['DB_RETRY_BASE_DELAY'] = float(os.environ.get('DB_RETRY_BASE_DELAY', 0.05))
+app.config['DB_RETRY_MAX_DELAY'] = float(os.environ.get('DB_RETRY_MAX_DELAY', 2.0))
 app.config['UPLOAD_FOLDER'] = os.path.join(basedir, 'static/avatars')
-app.config['SECRET_KEY'] = 'Battery-AAA'
-db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
+# Without one, create_app() generates a key and keeps it in instance/secret_key
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
+app.config['IMAGE_CACHE_MAX_AGE'] = 60 * 60 * 24 * 365
+# Request bodies above this get a 413 before they are read; uploads are also
+# rejected past MAX_UPLOAD_PIXELS so a small file can't decode into a huge bitmap
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 4 * 1024 * 1024))
+app.config['MAX_UPLOAD_PIXELS'] = int(os.environ.get('MAX_UPLOAD_PIXELS', 4096 * 4096))
+# Output of `flask build-assets`: fingerprinted copies of static/ plus a manifest
+app.config['ASSET_BUILD_FOLDER'] = os.path.join(basedir, 'static/build')
+app.config['ASSET_CACHE_MAX_AGE'] = 60 * 60 * 24 * 365
+# Output of `flask build-atlases`: pet, egg and thumbnail sprite sheets
+app.config['ATLAS_FOLDER'] = os.path.join(basedir, 'static/atlases')
+app.config['RENDER_CACHE_FOLDER'] = os.path.join(instance_dir, 'avatar_renders')
+# Minigame rewards are buffered in memory and written in batches when enabled
+app.config['REWARD_WRITE_BEHIND'] = False
+app.config['REWARD_FLUSH_INTERVAL'] = 1.0
+app.config['REWARD_FLUSH_SIZE'] = 100
+# Password hashing runs on a small bounded pool instead of the request worker.
+# Changing the cost rehashes each user's password on their next login
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64))
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+# /metrics is open to moderators, or to scrapers sending this bearer token
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+# A request that runs the same SQL statement more than this many times is logged as a likely N+1
+app.config['N_PLUS_ONE_THRESHOLD'] = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))
+# Number of rendered catalog pages kept in memory
+app.config['PAGE_CACHE_SIZE'] = int(os.environ.get('PAGE_CACHE_SIZE', 128))
+
+def storage_engine_options(database_uri):
+    url = make_url(database_uri)
+    if url.get_backend_name() != 'sqlite':
+        return {'pool_size': app.config['DB_POOL_SIZE'], 'max_overflow': app.config['DB_MAX_OVERFLOW'], 'pool_pre_ping': True}
+    options = {'connect_args': {'timeout': app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}}
+    if url.database and url.database != ':memory:':
+        # In-memory databases use a single shared connection instead of a pool
+        options.update(pool_size=app.config['DB_POOL_SIZE'], max_overflow=app.config['DB_MAX_OVERFLOW'])
+    return options
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}")
+    cursor.execute(f"PRAGMA journal_mode = {app.config['SQLITE_JOURNAL_MODE']}")
+    cursor.execute(f"PRAGMA synchronous = {app.config['SQLITE_SYNCHRONOUS']}")
+    cursor.close()
+
+db = SQLAlchemy()
+bcrypt = Bcrypt()
+
+class PasswordHasher:
+    def start(self, workers, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        # Caps queued plus running jobs; callers past the cap get a 503
+        self.slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, func, *args):
+        if not self.slots.acquire(timeout=app.config['PASSWORD_HASH_TIMEOUT']):
+            abort(503)
+        try:
+            future = self.executor.submit(func, *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda f: self.slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(bcrypt.generate_password_hash, password, app.config['BCRYPT_LOG_ROUNDS']).decode('utf-8')
+
+    def check(self, password_hash, password):
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    @staticmethod
+    def needs_rehash(password_hash):
+        # bcrypt hashes look like $2b$<cost>$<salt and digest>
+        try:
+            return int(password_hash.split('$')[2]) != app.config['BCRYPT_LOG_ROUNDS']
+        except (IndexError, ValueError):
+            return True
+
+    def stop(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# Started by create_app()
+password_hasher = PasswordHasher()
+
+# Lock-wait counters for retry_on_database_lock
+storage_stats = {'lock_errors': 0, 'lock_retries': 0, 'lock_wait_seconds': 0.0, 'lock_failures': 0}
+storage_stats_lock = threading.Lock()
+
+def is_database_locked(error):
+    message = str(error.orig if getattr(error, 'orig', None) is not None else error).lower()
+    return 'database is locked' in message or 'database table is locked' in message
+
+def run_with_lock_retry(operation, *args, **kwargs):
+    # Runs a whole unit of work, rolling back and running it again with
+    # jittered exponential backoff when SQLite reports a lock. Retrying only
+    # the commit is not enough: a failed flush or commit rolls the session
+    # back and discards its pending changes.
+    retries = app.config['DB_LOCK_RETRIES']
+    for attempt in range(retries + 1):
+        try:
+            return operation(*args, **kwargs)
+        except OperationalError as e:
+            if not is_database_locked(e):
+                raise
+            db.session.rollback()
+            with storage_stats_lock:
+                storage_stats['lock_errors'] += 1
+                if attempt == retries:
+                    storage_stats['lock_failures'] += 1
+            if attempt == retries:
+                raise
+            delay = min(app.config['DB_RETRY_MAX_DELAY'], app.config['DB_RETRY_BASE_DELAY'] * 2 ** attempt)
+            delay = random.uniform(delay / 2, delay)
+            with storage_stats_lock:
+                storage_stats['lock_retries'] += 1
+                storage_stats['lock_wait_seconds'] += delay
+            time.sleep(delay)
+
+def retry_on_database_lock(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return run_with_lock_retry(view, *args, **kwargs)
+    return wrapper
 
 logging.basicConfig()
 logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
 
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestMetrics:
+    # Per-endpoint request counts, latency histograms, SQL counts and time and
+    # N+1 warnings, rendered in the Prometheus text format
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter()
+        self.latency_buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+        self.latency_sum = Counter()
+        self.latency_count = Counter()
+        self.sql_statements = Counter()
+        self.sql_seconds = Counter()
+        self.n_plus_one = Counter()
+
+    def record(self, endpoint, method, status, seconds, statements, sql_seconds, repeated):
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            buckets = self.latency_buckets[endpoint]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self.latency_sum[endpoint] += seconds
+            self.latency_count[endpoint] += 1
+            self.sql_statements[endpoint] += statements
+            self.sql_seconds[endpoint] += sql_seconds
+            if repeated:
+                self.n_plus_one[endpoint] += 1
+
+    def render(self):
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def sample(name, value, **labels):
+            label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+            lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        with self._lock:
+            header('lamopets_http_requests_total', 'counter', 'HTTP requests by endpoint, method and status.')
+            for (endpoint, method, status), n in sorted(self.requests.items()):
+                sample('lamopets_http_requests_total', n, endpoint=endpoint, method=method, status=status)
+            header('lamopets_http_request_duration_seconds', 'histogram', 'Request latency by endpoint.')
+            for endpoint in sorted(self.latency_count):
+                for bound, n in zip(LATENCY_BUCKETS, self.latency_buckets[endpoint]):
+                    sample('lamopets_http_request_duration_seconds_bucket', n, endpoint=endpoint, le=bound)
+                sample('lamopets_http_request_duration_seconds_bucket', self.latency_count[endpoint], endpoint=endpoint, le='+Inf')
+                sample('lamopets_http_request_duration_seconds_sum', self.latency_sum[endpoint], endpoint=endpoint)
+                sample('lamopets_http_request_duration_seconds_count', self.latency_count[endpoint], endpoint=endpoint)
+            for name, help_text, values in (
+                    ('lamopets_sql_statements_total', 'SQL statements executed while serving each endpoint.', self.sql_statements),
+                    ('lamopets_sql_duration_seconds_total', 'Time spent in SQL while serving each endpoint.', self.sql_seconds),
+                    ('lamopets_n_plus_one_requests_total', 'Requests that repeated one statement more than N_PLUS_ONE_THRESHOLD times.', self.n_plus_one)):
+                header(name, 'counter', help_text)
+                for endpoint, value in sorted(values.items()):
+                    sample(name, value, endpoint=endpoint)
+        with storage_stats_lock:
+            stats = dict(storage_stats)
+        for key, help_text in (('lock_errors', 'Database lock errors seen by retry_on_database_lock.'),
+                               ('lock_retries', 'Units of work retried after a database lock.'),
+                               ('lock_failures', 'Units of work that ran out of lock retries.'),
+                               ('lock_wait_seconds', 'Time spent backing off after database locks.')):
+            header(f'lamopets_db_{key}_total', 'counter', help_text)
+            sample(f'lamopets_db_{key}_total', stats[key])
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+# The start time lives on the statement's execution context, which is
+# dropped with it, so a statement that raises leaves nothing behind
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.statement_started = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'statement_started', None)
+    if has_request_context() and 'sql_statements' in g:
+        g.sql_statements[statement] += 1
+        if started is not None:
+            g.sql_seconds += time.perf_counter() - started
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.sql_statements = Counter()
+    g.sql_seconds = 0.0
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' not in g:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+    threshold = app.config['N_PLUS_ONE_THRESHOLD']
+    repeated = [(statement, n) for statement, n in g.sql_statements.items() if n > threshold]
+    for statement, n in repeated:
+        app.logger.warning('Possible N+1 in %s: statement ran %d times: %s', endpoint, n, ' '.join(statement.split())[:200])
+    request_metrics.record(endpoint, request.method, response.status_code, time.perf_counter() - g.request_started,
+                           sum(g.sql_statements.values()), g.sql_seconds, bool(repeated))
+    return response
+
 login_manager = LoginManager()
-login_manager.init_app(app)
 login_manager.login_view = "login"
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # Cached on g so the user row is fetched at most once per request
+    user = g.get('loaded_user')
+    if user is None or user.id != int(user_id):
+        user = db.session.get(User, int(user_id))
+        g.loaded_user = user
+    return user
+
+MIN_BALANCE = 0
+MAX_BALANCE = 10000
+DAILY_CHANCES = 20
+MINIGAMES = ('ft', 'jjj')
+
+def current_game_day():
+    return date.today()
 
 class Inventory(db.Model):
     __tablename__ = 'inventory'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.String(20), db.ForeignKey('user.id'))
-    item_id = db.Column(db.Integer, db.ForeignKey('item.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    item_id = db.Column(db.String(20), db.ForeignKey('item.id'))
     user_obj = db.relationship('User', back_populates='inventory')
     item = db.relationship('Item', back_populates='inventory')
 
+    __table_args__ = (db.Index('ix_inventory_user_item', 'user_id', 'item_id', unique=True),)
+
+    @staticmethod
+    def is_owned(user_id, item_id):
+        return db.session.query(Inventory.query.filter_by(user_id=user_id, item_id=item_id).exists()).scalar()
+
+    @staticmethod
+    def get_owned_item_ids(user_id):
+        return {item_id for item_id, in db.session.query(Inventory.item_id).filter_by(user_id=user_id)}
+
 class AdoptedPet(db.Model):
     __tablename__ = 'adopted_pet'
     adopt_id = db.Column(db.Integer, primary_key=True)
@@ -58,14 +358,20 @@ class User(db.Model, UserMixin):
     username = db.Column(db.String(20), nullable=False, unique=True)
     password = db.Column(db.String(80), nullable=False)
     currency_balance = db.Column(db.Integer, default=1000)
-    avatar = db.Column(db.Text, nullable=True)
-    profile_pic = db.Column(db.Text, nullable=True)
+    # Legacy base64 columns, emptied by migrate_images_to_store(). Deferred so
+    # loading a user never pulls them unless they are accessed.
+    avatar = db.deferred(db.Column(db.Text, nullable=True))
+    profile_pic = db.deferred(db.Column(db.Text, nullable=True))
+    avatar_hash = db.Column(db.String(64), nullable=True)
+    profile_pic_hash = db.Column(db.String(64), nullable=True)
     last_gift_time = db.Column(db.DateTime)
     moderator = db.Column(db.String(3), nullable=False, default='no')
-    last_played_time_ft = db.Column(db.String)
-    last_played_time_jjj = db.Column(db.String)
-    daily_chances_ft = db.Column(db.Integer, default=20)
-    daily_chances_jjj = db.Column(db.Integer, default=20)
+    # daily_chances_* only count for the day in last_played_date_*; on any
+    # other day the user has the full DAILY_CHANCES
+    last_played_date_ft = db.Column(db.Date)
+    last_played_date_jjj = db.Column(db.Date)
+    daily_chances_ft = db.Column(db.Integer, default=DAILY_CHANCES)
+    daily_chances_jjj = db.Column(db.Integer, default=DAILY_CHANCES)
 
     inventory = db.relationship('Inventory', back_populates='user_obj')
     adoptedpet = db.relationship('AdoptedPet', back_populates='user_obj')
@@ -75,16 +381,21 @@ class User(db.Model, UserMixin):
         self.currency_balance = 1000
 
     def set_password(self, password):
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hasher.check(self.password, password)
+
+    def get_daily_chances(self, game, day=None):
+        if getattr(self, f'last_played_date_{game}') != (day or current_game_day()):
+            return DAILY_CHANCES
+        return getattr(self, f'daily_chances_{game}')
     
     def __setattr__(self, name, value):
-        if name == 'currency_balance' and value > 10000:
-            value = 10000
-        if name == 'currency_balance' and value < 0:
-            value = 0
+        if name == 'currency_balance' and value > MAX_BALANCE:
+            value = MAX_BALANCE
+        if name == 'currency_balance' and value < MIN_BALANCE:
+            value = MIN_BALANCE
         super().__setattr__(name, value)
 
 class Topic(db.Model):
@@ -92,6 +403,37 @@ class Topic(db.Model):
     title = db.Column(db.String, unique=True, nullable=False)
     description = db.Column(db.String)
     username = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    # Kept up to date by record_comment_created and delete_comment_subtrees;
+    # repair-forum-counters recomputes them from the comment rows
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_comment_at = db.Column(db.DateTime)
+    # Newest comment, or the topic's creation when it has none
+    last_activity_at = db.Column(db.DateTime, default=datetime.now)
+
+    __table_args__ = (db.Index('ix_topic_activity', 'last_activity_at', 'id'),)
+
+    def page_cursor(self):
+        return f'{self.last_activity_at.isoformat()}_{self.id}'
+
+    @staticmethod
+    def parse_page_cursor(cursor):
+        try:
+            activity, _, topic_id = cursor.rpartition('_')
+            return datetime.fromisoformat(activity), int(topic_id)
+        except (AttributeError, ValueError):
+            return None
+
+    @staticmethod
+    def get_page(before=None, limit=20):
+        # Most recently active topics first, continuing after the topic named
+        # by the cursor. Returns the page and the next cursor, or None on the last page
+        query = Topic.query
+        position = Topic.parse_page_cursor(before)
+        if position is not None:
+            query = query.filter(db.tuple_(Topic.last_activity_at, Topic.id) < position)
+        topics = query.order_by(Topic.last_activity_at.desc(), Topic.id.desc()).limit(limit + 1).all()
+        return topics[:limit], topics[limit - 1].page_cursor() if len(topics) > limit else None
 
 class Comment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -100,17 +442,43 @@ class Comment(db.Model):
     topic = db.relationship('Topic', backref=db.backref('comments', lazy=True, cascade='all, delete-orphan'))
     username = db.Column(db.String(20), nullable=False)
     parent_id = db.Column(db.Integer, db.ForeignKey('comment.id'), nullable=True)
-    replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]), lazy=True)
+    # Nesting level, set on insert: 0 for top-level comments, parent's depth + 1 for replies
+    depth = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    # Number of direct replies, maintained alongside Topic.comment_count
+    reply_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]), lazy=True, order_by='Comment.id')
+
+    __table_args__ = (
+        db.Index('ix_comment_topic_parent', 'topicId', 'parent_id', 'id'),
+        db.Index('ix_comment_parent', 'parent_id'),
+        {'extend_existing': True},
+    )
 
-    __table_args__ = {'extend_existing': True}
-
-    def get_nesting_level(self):
-        level = 0
-        current = self
-        while current.parent_id:
-            level += 1
-            current = current.parent
-        return level
+    @staticmethod
+    def get_topic_comment_page(topic_id, after_id=None, limit=20):
+        # Loads a page of top-level comments, oldest first after after_id, with
+        # all of their replies in two queries, and fills in every comment's
+        # replies so rendering never triggers a lazy load. Returns the
+        # top-level comments, every loaded comment and the next cursor or None
+        query = Comment.query.filter(Comment.topicId == topic_id, Comment.parent_id.is_(None))
+        if after_id is not None:
+            query = query.filter(Comment.id > after_id)
+        top_level = query.order_by(Comment.id).limit(limit + 1).all()
+        next_after = top_level[limit - 1].id if len(top_level) > limit else None
+        top_level = top_level[:limit]
+        replies = []
+        if top_level:
+            subtree = db.select(Comment.id).where(Comment.parent_id.in_([comment.id for comment in top_level])).cte('subtree', recursive=True)
+            subtree = subtree.union_all(db.select(Comment.id).join(subtree, Comment.parent_id == subtree.c.id))
+            replies = Comment.query.filter(Comment.id.in_(db.select(subtree.c.id))).order_by(Comment.id).all()
+        replies_by_parent = {}
+        for comment in replies:
+            replies_by_parent.setdefault(comment.parent_id, []).append(comment)
+        comments = top_level + replies
+        for comment in comments:
+            set_committed_value(comment, 'replies', replies_by_parent.get(comment.id, []))
+        return top_level, comments, next_after
 
 class Pet(db.Model): 
     species = db.Column(db.String(2), primary_key=True, nullable=False)
@@ -120,7 +488,7 @@ class Pet(db.Model):
     pet_image_url = db.Column(db.String(200), nullable=False)
 
 class Item(db.Model): 
-    id = db.Column(db.String(2), primary_key=True, nullable=False)
+    id = db.Column(db.String(20), primary_key=True, nullable=False)
     base_id = db.Column(db.String(10), nullable=False)
     gender = db.Column(db.String(1), nullable=False)
     price = db.Column(db.Integer, nullable=False)
@@ -141,6 +509,55 @@ class Item(db.Model):
             grouped_items[item.base_id].append(item)
         return grouped_items
 
+CatalogItem = namedtuple('CatalogItem', ['id', 'base_id', 'gender', 'price', 'colour', 'filter_colour', 'thumbnail_url', 'image_url'])
+CatalogPet = namedtuple('CatalogPet', ['species', 'name', 'price', 'egg_image_url', 'pet_image_url'])
+Catalog = namedtuple('Catalog', ['version', 'grouped_items', 'items_by_id', 'pets', 'pets_by_species', 'fingerprint'])
+
+class CatalogCache:
+    # Read-through cache of the item and pet catalog. Snapshots are immutable
+    # and detached from the session, so they can be shared across requests
+    # and threads. The catalog only changes when seed_catalog() runs, which
+    # bumps the version and makes the next get() rebuild the snapshot.
+    def __init__(self):
+        self.version = 0
+        self._catalog = None
+        self._lock = threading.Lock()
+
+    def bump_version(self):
+        with self._lock:
+            self.version += 1
+
+    def get(self):
+        catalog = self._catalog
+        if catalog is not None and catalog.version == self.version:
+            return catalog
+        with self._lock:
+            if self._catalog is None or self._catalog.version != self.version:
+                self._catalog = self._load(self.version)
+            return self._catalog
+
+    @staticmethod
+    def _load(version):
+        grouped_items = {}
+        items_by_id = {}
+        for base_id, items in Item.get_items_grouped_by_base_id().items():
+            group = tuple(CatalogItem(item.id, item.base_id, item.gender, item.price, item.colour, item.filter_colour,
+                                      item.thumbnail_url, item.image_url) for item in items)
+            grouped_items[base_id] = group
+            items_by_id.update((item.id, item) for item in group)
+        pets = tuple(CatalogPet(pet.species, pet.name, pet.price, pet.egg_image_url, pet.pet_image_url) for pet in Pet.query.all())
+        # Content hash, unlike version, is stable across processes and restarts
+        fingerprint = hashlib.sha256(repr((sorted(items_by_id.values()), sorted(pets))).encode()).hexdigest()
+        return Catalog(version, MappingProxyType(grouped_items), MappingProxyType(items_by_id), pets,
+                       MappingProxyType({pet.species: pet for pet in pets}), fingerprint)
+
+catalog_cache = CatalogCache()
+
+class SeedState(db.Model):
+    # Checksum of the seed data files last loaded into each seeded table group
+    name = db.Column(db.String(20), primary_key=True)
+    checksum = db.Column(db.String(64), nullable=False)
+
 class RegisterForm(FlaskForm):
     username = StringField(validators=[InputRequired(), Length(min=4, max=20)], render_kw={"placeholder": "Username"})
     password = PasswordField(validators=[InputRequired(), Length(min=4, max=20)], render_kw={"placeholder": "Password"})
@@ -172,17 +589,417 @@ class ChangePasswordForm(FlaskForm):
     confirm_new_password = PasswordField('Confirm New Password', validators=[DataRequired(), EqualTo('new_password')], render_kw={"placeholder": "Confirm Password"})
     submit = SubmitField('Change Password')
 
+# Content-addressed image store: each PNG is written once to UPLOAD_FOLDER as
+# <sha256>.png and users only keep the hash.
+IMAGE_HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+with open(os.path.join(basedir, 'static/assets/starter_avatar.png'), 'rb') as f:
+    STARTER_AVATAR_PNG = f.read()
+
+def decode_image_data(data):
+    if ',' in data:
+        data = data.split(',', 1)[1]
+    return base64.b64decode(data, validate=True)
+
+def store_image(png_bytes, webp_bytes=None):
+    # The WebP, when given, is stored beside the PNG under the same digest
+    digest = hashlib.sha256(png_bytes).hexdigest()
+    for extension, data in (('.png', png_bytes), ('.webp', webp_bytes)):
+        path = os.path.join(app.config['UPLOAD_FOLDER'], digest + extension)
+        if data is not None and not os.path.exists(path):
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+    return digest
+
+PROFILE_PIC_SIZE = (200, 200)
+UPLOAD_IMAGE_FORMATS = {'PNG': 'image/png', 'WEBP': 'image/webp', 'JPEG': 'image/jpeg'}
+
+def open_uploaded_image(field):
+    # The upload as a file object: a multipart file field, a raw image/* body
+    # streamed to a spooled temp file, or the older JSON base64 data URL.
+    # MAX_CONTENT_LENGTH is enforced by Werkzeug while the body is read
+    if field in request.files:
+        return request.files[field].stream
+    if request.mimetype in UPLOAD_IMAGE_FORMATS.values():
+        upload = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        shutil.copyfileobj(request.stream, upload)
+        upload.seek(0)
+        return upload
+    data = request.get_json(silent=True)
+    try:
+        return io.BytesIO(decode_image_data(data[field]))
+    except (KeyError, TypeError, binascii.Error):
+        raise ValueError('Invalid image data')
+
+def prepare_uploaded_image(upload, size):
+    # Validates the upload with Pillow, shrinks it to fit size and re-encodes
+    # it as a palette PNG plus a lossless WebP of the same pixels, returned as
+    # (png_bytes, webp_bytes); the WebP is None when it is not the smaller one
+    try:
+        with Image.open(upload) as image:
+            if image.format not in UPLOAD_IMAGE_FORMATS or image.width * image.height > app.config['MAX_UPLOAD_PIXELS']:
+                raise ValueError('Unsupported image')
+            image = image.convert('RGBA')
+    except (OSError, SyntaxError, Image.DecompressionBombError):
+        raise ValueError('Invalid image data')
+    image.thumbnail(size, Image.LANCZOS)
+    image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+    png = io.BytesIO()
+    image.save(png, 'PNG', optimize=True)
+    webp = io.BytesIO()
+    image.convert('RGBA').save(webp, 'WEBP', lossless=True, method=6)
+    return png.getvalue(), webp.getvalue() if webp.tell() < png.tell() else None
+
+def store_uploaded_image(field, size):
+    return store_image(*prepare_uploaded_image(open_uploaded_image(field), size))
+
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({'success': False, 'error': 'Upload too large'}), 413
+
+@app.template_global()
+def image_url(digest):
+    if not digest:
+        return None
+    return url_for('stored_image', digest=digest)
+
+@app.route('/images/<digest>.png')
+def stored_image(digest):
+    if not IMAGE_HASH_PATTERN.fullmatch(digest):
+        abort(404)
+    # Uploads also have a WebP copy, served to browsers that accept it
+    if request.accept_mimetypes['image/webp'] and os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], digest + '.webp')):
+        filename, mimetype = digest + '.webp', 'image/webp'
+    else:
+        filename, mimetype = digest + '.png', 'image/png'
+    response = send_from_directory(app.config['UPLOAD_FOLDER'], filename, mimetype=mimetype, max_age=app.config['IMAGE_CACHE_MAX_AGE'])
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept')
+    return response
+
+# Text assets get .gz (and .br when brotli is installed) siblings at build time
+COMPRESSIBLE_ASSET_EXTENSIONS = {'.css', '.js', '.json', '.svg', '.txt', '.otf', '.ttf'}
+# Absolute /static/... references inside these are rewritten to the fingerprinted names
+REWRITTEN_ASSET_EXTENSIONS = {'.css', '.js'}
+STATIC_REFERENCE_PATTERN = re.compile(r'/static/([\w./-]+)')
+
+def load_asset_manifest():
+    path = os.path.join(app.config['ASSET_BUILD_FOLDER'], 'manifest.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+# Logical name -> fingerprinted name, filled in by create_app(); rebuilding needs a restart
+asset_manifest = {}
+
+@app.url_defaults
+def fingerprint_static_url(endpoint, values):
+    # Makes url_for('static', filename=...) point at the fingerprinted build
+    if endpoint == 'static':
+        built = asset_manifest.get(values.get('filename'))
+        if built:
+            values['filename'] = 'build/' + built
+
+def load_sprite_atlases():
+    # Image URL -> (atlas, sprite index, width, height) from the atlas maps
+    sprites = {}
+    folder = app.config['ATLAS_FOLDER']
+    if not os.path.isdir(folder):
+        return sprites
+    for name in sorted(os.listdir(folder)):
+        if name.endswith('.json'):
+            with open(os.path.join(folder, name)) as f:
+                atlas = json.load(f)
+            for url, sprite in atlas['sprites'].items():
+                sprites[url] = (atlas['name'], sprite['index'], sprite['width'], sprite['height'])
+    return sprites
+
+sprite_atlas = {}
+app.add_template_global(sprite_atlas, 'sprite_atlas')
+
+@app.template_global()
+def sprite_img(url, **attributes):
+    # An <img> for a catalog image. When the image is in an atlas the src is a
+    # transparent placeholder of the same size and the atlas is drawn as its
+    # background, so CSS sizing the <img> keeps working; data-src keeps the
+    # real URL for scripts. Pass class_ for the class attribute. With a style
+    # the height attribute is left out, so a CSS width keeps the aspect ratio
+    css_class = attributes.pop('class_', None)
+    sprite = sprite_atlas.get(url)
+    if sprite is None:
+        attributes = dict(src=url, **attributes)
+    else:
+        atlas, index, width, height = sprite
+        placeholder = f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' viewBox='0 0 {width} {height}'/>"
+        attributes = dict(src='data:image/svg+xml,' + urllib.parse.quote(placeholder), width=width,
+                          height=None if 'style' in attributes else height, **attributes)
+        attributes['data-src'] = url
+        css_class = f'sprite sprite-{atlas} sprite-{atlas}-{index}' + (f' {css_class}' if css_class else '')
+    if css_class:
+        attributes['class'] = css_class
+    return Markup('<img ' + ' '.join(f'{key}="{escape(value)}"' for key, value in attributes.items() if value is not None) + '>')
+
+@app.route('/static/build/<path:filename>')
+def built_asset(filename):
+    build_folder = app.config['ASSET_BUILD_FOLDER']
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    served = filename
+    encoding = None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        path = safe_join(build_folder, filename + suffix)
+        if request.accept_encodings[candidate] and path and os.path.isfile(path):
+            served, encoding = filename + suffix, candidate
+            break
+    response = send_from_directory(build_folder, served, mimetype=mimetype, max_age=app.config['ASSET_CACHE_MAX_AGE'])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# Keeps each IN (...) below SQLite's bound-parameter limit
+IN_QUERY_CHUNK_SIZE = 500
+
+def get_profile_pics(usernames):
+    # One batched lookup of profile pictures for every author shown on a page
+    usernames = list(set(usernames))
+    profile_pics = {}
+    for start in range(0, len(usernames), IN_QUERY_CHUNK_SIZE):
+        chunk = usernames[start:start + IN_QUERY_CHUNK_SIZE]
+        rows = db.session.query(User.username, User.profile_pic_hash).filter(User.username.in_(chunk)).all()
+        profile_pics.update({username: profile_pic_hash or '' for username, profile_pic_hash in rows})
+    return profile_pics
+
+# Server-side avatar compositing. Layers are drawn in the same order and at
+# the same size as the customisation canvas in static/js/custom.js.
+AVATAR_CANVAS_SIZE = (410, 500)
+AVATAR_LAYER_ORDER = ['gender', 'eyes', 'mouth', 'misc', 'pants', 'shirt', 'hair', 'shoes']
+AVATAR_PART_BY_PREFIX = {'H': 'hair', 'U': 'shirt', 'L': 'pants', 'M': 'misc', 'F': 'shoes'}
+AVATAR_DEFAULT_LAYERS = {
+    'Male': {'gender': 'gender/Male.png', 'eyes': 'eyes/m-eyes1.png', 'mouth': 'mouth/m-mouth1.png',
+             'shirt': 'shirt/m-shirt6.png', 'pants': 'pants/m-pants5.png'},
+    'Female': {'gender': 'gender/Female.png', 'eyes': 'eyes/f-eyes1.png', 'mouth': 'mouth/f-mouth1.png',
+               'shirt': 'shirt/f-shirt7.png', 'pants': 'pants/f-pants5.png'},
+}
+# Skin tone and eye colour are filters over the default layers rather than
+# items: (CSS filter, swatch colour) for each button on the custom page
+AVATAR_BASE_FILTERS = {
+    'gender': (('', '#F1E8D2'),
+               ('sepia(65%) hue-rotate(300deg) brightness(0.62) contrast(300%)', '#DBC6B8'),
+               ('sepia(65%) hue-rotate(300deg) brightness(0.50) contrast(400%)', '#806959')),
+    'eyes': (('', '#848484'),
+             ('saturate(100%) sepia(100%) hue-rotate(150deg)', '#79c7d9'),
+             ('saturate(100%) sepia(100%) hue-rotate(60deg)', '#7de877')),
+}
+app.add_template_global(AVATAR_BASE_FILTERS, 'avatar_base_filters')
+# Bump when the renderer changes so cached renders are not reused
+AVATAR_RENDER_VERSION = 1
+CSS_FILTER_PATTERN = re.compile(r'([a-z-]+)\(\s*([-\d.]+)(%|deg)?\s*\)')
+IDENTITY_COLOUR_MATRIX = ((1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0))
+
+def css_filter_matrix(name, amount):
+    # 3x4 affine colour matrices (offset in 0-255) from the Filter Effects spec
+    if name == 'grayscale':
+        a = 1 - min(amount, 1)
+        return ((0.2126 + 0.7874 * a, 0.7152 - 0.7152 * a, 0.0722 - 0.0722 * a, 0),
+                (0.2126 - 0.2126 * a, 0.7152 + 0.2848 * a, 0.0722 - 0.0722 * a, 0),
+                (0.2126 - 0.2126 * a, 0.7152 - 0.7152 * a, 0.0722 + 0.9278 * a, 0))
+    if name == 'sepia':
+        a = 1 - min(amount, 1)
+        return ((0.393 + 0.607 * a, 0.769 - 0.769 * a, 0.189 - 0.189 * a, 0),
+                (0.349 - 0.349 * a, 0.686 + 0.314 * a, 0.168 - 0.168 * a, 0),
+                (0.272 - 0.272 * a, 0.534 - 0.534 * a, 0.131 + 0.869 * a, 0))
+    if name == 'saturate':
+        s = amount
+        return ((0.213 + 0.787 * s, 0.715 - 0.715 * s, 0.072 - 0.072 * s, 0),
+                (0.213 - 0.213 * s, 0.715 + 0.285 * s, 0.072 - 0.072 * s, 0),
+                (0.213 - 0.213 * s, 0.715 - 0.715 * s, 0.072 + 0.928 * s, 0))
+    if name == 'hue-rotate':
+        cos, sin = math.cos(math.radians(amount)), math.sin(math.radians(amount))
+        return ((0.213 + cos * 0.787 - sin * 0.213, 0.715 - cos * 0.715 - sin * 0.715, 0.072 - cos * 0.072 + sin * 0.928, 0),
+                (0.213 - cos * 0.213 + sin * 0.143, 0.715 + cos * 0.285 + sin * 0.140, 0.072 - cos * 0.072 - sin * 0.283, 0),
+                (0.213 - cos * 0.213 - sin * 0.787, 0.715 - cos * 0.715 + sin * 0.715, 0.072 + cos * 0.928 + sin * 0.072, 0))
+    if name == 'brightness':
+        return ((amount, 0, 0, 0), (0, amount, 0, 0), (0, 0, amount, 0))
+    if name == 'contrast':
+        offset = (0.5 - 0.5 * amount) * 255
+        return ((amount, 0, 0, offset), (0, amount, 0, offset), (0, 0, amount, offset))
+    raise ValueError(f"Unsupported filter: {name}")
+
+@lru_cache(maxsize=None)
+def colour_matrix_for_filter(filter_colour):
+    # Folds a CSS filter string such as "sepia(95%) hue-rotate(350deg)" into one
+    # affine matrix in Pillow's 12-tuple layout
+    matrix = IDENTITY_COLOUR_MATRIX
+    for name, value, unit in CSS_FILTER_PATTERN.findall(filter_colour):
+        amount = float(value) / 100 if unit == '%' else float(value)
+        step = css_filter_matrix(name, amount)
+        matrix = tuple(
+            tuple(sum(step[row][k] * matrix[k][col] for k in range(3)) + (step[row][3] if col == 3 else 0) for col in range(4))
+            for row in range(3))
+    if matrix == IDENTITY_COLOUR_MATRIX:
+        return None
+    return tuple(value for row in matrix for value in row)
+
+def load_avatar_layer(image_path, filter_colour=''):
+    layer = Image.open(os.path.join(app.static_folder, image_path)).convert('RGBA').resize(AVATAR_CANVAS_SIZE)
+    matrix = colour_matrix_for_filter(filter_colour)
+    if matrix:
+        alpha = layer.getchannel('A')
+        layer = layer.convert('RGB').convert('RGB', matrix)
+        layer.putalpha(alpha)
+    return layer
+
+def render_avatar(layers):
+    canvas = Image.new('RGBA', AVATAR_CANVAS_SIZE)
+    for image_path, filter_colour in layers:
+        canvas.alpha_composite(load_avatar_layer(image_path, filter_colour))
+    output = io.BytesIO()
+    canvas.save(output, 'PNG', optimize=True)
+    return output.getvalue()
+
+def get_rendered_avatar(gender, items, base_filters=None):
+    # Returns the image store hash for an outfit, rendering it only the first
+    # time the same combination of layers is seen. base_filters maps 'gender'
+    # and 'eyes' to one of the AVATAR_BASE_FILTERS filters
+    base_filters = base_filters or {}
+    layers_by_part = {part: ('assets/customization_assets/' + path, base_filters.get(part, ''))
+                      for part, path in AVATAR_DEFAULT_LAYERS[gender].items()}
+    for item in items:
+        layers_by_part[AVATAR_PART_BY_PREFIX[item.base_id[0]]] = (item.image_url, item.filter_colour)
+    layers = [layers_by_part[part] for part in AVATAR_LAYER_ORDER if part in layers_by_part]
+
+    outfit_hash = hashlib.sha256(json.dumps([AVATAR_RENDER_VERSION, layers]).encode()).hexdigest()
+    cache_path = os.path.join(app.config['RENDER_CACHE_FOLDER'], outfit_hash)
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            digest = f.read().strip()
+        if os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], digest + '.png')):
+            return digest
+
+    digest = store_image(render_avatar(layers))
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(digest)
+    os.replace(temp_path, cache_path)
+    return digest
+
+def clamp_balance(balance):
+    return db.case((balance < MIN_BALANCE, MIN_BALANCE), (balance > MAX_BALANCE, MAX_BALANCE), else_=balance)
+
+def change_balance(user_id, amount, required_balance=None, conditions=(), values=None):
+    # Applies a credit (or, with a negative amount, a debit) as one conditional
+    # UPDATE clamped to [MIN_BALANCE, MAX_BALANCE], inside the caller's
+    # transaction so it commits together with the dependent insert or delete.
+    # Nothing is changed unless the balance is at least required_balance and
+    # every extra condition holds. Returns the new balance, or None if the
+    # update did not apply.
+    statement = db.update(User).where(User.id == user_id, *conditions)
+    if required_balance is not None:
+        statement = statement.where(User.currency_balance >= required_balance)
+    statement = statement.values(
+        currency_balance=clamp_balance(User.currency_balance + amount),
+        **(values or {}),
+    ).returning(User.currency_balance, *[getattr(User, name) for name in (values or {})])
+    row = db.session.execute(statement, execution_options={'synchronize_session': False}).first()
+    if row is None:
+        return None
+    # Keep an already loaded user (usually current_user) in step with the row
+    user = db.session.identity_map.get(identity_key(User, user_id))
+    if user is not None:
+        set_committed_value(user, 'currency_balance', row[0])
+        for name, value in zip(values or {}, row[1:]):
+            set_committed_value(user, name, value)
+    return row[0]
+
+def fingerprint_templates():
+    digest = hashlib.sha256()
+    template_dir = os.path.join(app.root_path, app.template_folder)
+    for root, dirs, files in os.walk(template_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, template_dir).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def fingerprint_page_inputs():
+    # Cached pages embed fingerprinted asset URLs, so a new asset build changes them too
+    return hashlib.sha256(json.dumps([fingerprint_templates(), asset_manifest, sprite_atlas, AVATAR_BASE_FILTERS], sort_keys=True).encode()).hexdigest()
+
+# Set by create_app()
+TEMPLATES_FINGERPRINT = None
+
+class PageCache:
+    # Small LRU of rendered pages keyed by their ETag
+    def __init__(self):
+        self.max_entries = 0
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag):
+        with self._lock:
+            html = self._pages.get(etag)
+            if html is not None:
+                self._pages.move_to_end(etag)
+            return html
+
+    def put(self, etag, html):
+        with self._lock:
+            self._pages[etag] = html
+            self._pages.move_to_end(etag)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+# Sized by create_app()
+page_cache = PageCache()
+
+def render_cached_page(template_name, key=(), context=dict):
+    # Serves a page whose output depends only on the templates, the catalog
+    # and key. key must hold every per-user value the template shows, since
+    # a cached page is shared by everyone with the same ETag. A matching
+    # If-None-Match gets a 304, and a cached page skips the template engine;
+    # context() is only called when the page has to be rendered
+    etag = hashlib.sha256(repr((TEMPLATES_FINGERPRINT, template_name, catalog_cache.get().fingerprint, key)).encode()).hexdigest()[:32]
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        html = page_cache.get(etag)
+        if html is None:
+            html = render_template(template_name, **context())
+            page_cache.put(etag, html)
+        response = app.make_response(html)
+    response.set_etag(etag)
+    # Pages show the user's balance, so browsers may keep them but must revalidate
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
+
+def balance_key():
+    return (current_user.currency_balance,) if current_user.is_authenticated else ()
+
 @app.route('/')
 def home():
-    return render_template('home.html')
+    return render_cached_page('home.html', balance_key())
 
 @app.route('/login', methods=['GET', 'POST'])
+@retry_on_database_lock
 def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data).first()
         if user:
-            if bcrypt.check_password_hash(user.password, form.password.data):
+            if user.check_password(form.password.data):
+                if password_hasher.needs_rehash(user.password):
+                    # Upgrade hashes made at an old cost while we have the password
+                    user.set_password(form.password.data)
+                    db.session.commit()
                 login_user(user)
                 return redirect(url_for('home'))
             else:
@@ -194,6 +1011,7 @@ def login():
 
 @app.route('/change_password', methods=['GET', 'POST'])
 @login_required
+@retry_on_database_lock
 def change_password():
     form = ChangePasswordForm()
     message = None
@@ -213,11 +1031,7 @@ def change_password():
 @app.route('/profile')
 @login_required
 def profile():
-    avatar_data = current_user.avatar
-    if avatar_data:
-        avatar_url = f"data:image/png;base64,{avatar_data}"
-    else:
-        avatar_url = None
+    avatar_url = image_url(current_user.avatar_hash)
 
     adopted_pets = db.session.query(AdoptedPet, Pet).join(Pet, AdoptedPet.species == Pet.species).filter(AdoptedPet.user_id == current_user.id).all()
     inventory_items = db.session.query(Inventory, Item).join(Item, Inventory.item_id == Item.id).filter(Inventory.user_id == current_user.id).all()
@@ -227,47 +1041,88 @@ def profile():
 @app.route('/custom')
 @login_required
 def custom():
-    user_inventory = [item.item_id for item in Inventory.query.filter_by(user_id=current_user.id).all()]
-    grouped_items = Item.get_items_grouped_by_base_id()
-    user_grouped_items = {base_id: [item for item in items if item.id in user_inventory] 
-                          for base_id, items in grouped_items.items() if any(item.id in user_inventory for item in items)}
-    
-    return render_template('custom.html', grouped_items=user_grouped_items)
+    user_inventory = Inventory.get_owned_item_ids(current_user.id)
+
+    def context():
+        grouped_items = catalog_cache.get().grouped_items
+        user_grouped_items = {base_id: [item for item in items if item.id in user_inventory]
+                              for base_id, items in grouped_items.items() if any(item.id in user_inventory for item in items)}
+        return {'grouped_items': user_grouped_items}
+
+    owned_hash = hashlib.sha256(','.join(sorted(user_inventory)).encode()).hexdigest()
+    return render_cached_page('custom.html', (owned_hash,), context)
+
+def set_user_image(column, digest):
+    setattr(current_user, column, digest)
+    db.session.commit()
 
+# The upload body can only be read once, so only the update is retried on a lock
 @app.route('/save-avatar', methods=['POST'])
 @login_required
 def save_avatar():
-    data = request.get_json()
-    image_data = data['image'].split(',')[1]
-    current_user.avatar = image_data
+    try:
+        digest = store_uploaded_image('image', AVATAR_CANVAS_SIZE)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    run_with_lock_retry(set_user_image, 'avatar_hash', digest)
+    return jsonify({'success': True, 'avatar_url': image_url(current_user.avatar_hash)})
+
+@app.route('/save-avatar-outfit', methods=['POST'])
+@login_required
+@retry_on_database_lock
+def save_avatar_outfit():
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'error': 'Invalid outfit'}), 400
+    gender = data.get('gender')
+    item_ids = data.get('items') or []
+    base_filters = data.get('filters') or {}
+    if not isinstance(gender, str) or gender not in AVATAR_DEFAULT_LAYERS or not isinstance(base_filters, dict):
+        return jsonify({'success': False, 'error': 'Invalid outfit'}), 400
+    if not isinstance(item_ids, list) or not all(isinstance(item_id, str) for item_id in item_ids):
+        return jsonify({'success': False, 'error': 'Invalid outfit'}), 400
+    base_filters = {part: base_filters.get(part) or '' for part in AVATAR_BASE_FILTERS}
+    if any(not isinstance(base_filters[part], str) or base_filters[part] not in {f for f, _ in choices}
+           for part, choices in AVATAR_BASE_FILTERS.items()):
+        return jsonify({'success': False, 'error': 'Invalid outfit'}), 400
+
+    items_by_id = catalog_cache.get().items_by_id
+    items = [items_by_id.get(item_id) for item_id in set(item_ids)]
+    if not all(items) or len({item.base_id[0] for item in items}) != len(items):
+        return jsonify({'success': False, 'error': 'Invalid outfit'}), 400
+    if any(item.gender != gender or item.base_id[0] not in AVATAR_PART_BY_PREFIX for item in items):
+        return jsonify({'success': False, 'error': 'Invalid outfit'}), 400
+
+    owned_item_ids = {item_id for item_id, in db.session.query(Inventory.item_id).filter(
+        Inventory.user_id == current_user.id, Inventory.item_id.in_([item.id for item in items]))}
+    if len(owned_item_ids) < len(items):
+        return jsonify({'success': False, 'error': 'You do not own all of these items'}), 403
+
+    current_user.avatar_hash = get_rendered_avatar(gender, items, base_filters)
     db.session.commit()
-    return jsonify({'success': True, 'avatar_url': url_for('static', filename='avatars/avatar.png')})
+    return jsonify({'success': True, 'avatar_url': image_url(current_user.avatar_hash)})
 
 @app.route('/crop-avatar')
 @login_required
 def crop_avatar():
-    avatar_data = current_user.avatar
-    if avatar_data:
-        avatar_url = f"data:image/png;base64,{avatar_data}"
-    else:
-        avatar_url = None
+    avatar_url = image_url(current_user.avatar_hash)
     return render_template('crop_avatar.html', avatar_url=avatar_url)
 
 @app.route('/save-avatar-cropped', methods=['POST'])
 @login_required
 def save_avatar_cropped():
-    data = request.get_json()
-    cropped_image_data = data['croppedImage']
-    current_user.profile_pic = cropped_image_data
-    db.session.commit()
-    print(f"Saved profile_pic for user {current_user.username}: {current_user.profile_pic[:50]}...") 
-    return jsonify({'success': True})
+    try:
+        digest = store_uploaded_image('croppedImage', PROFILE_PIC_SIZE)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    run_with_lock_retry(set_user_image, 'profile_pic_hash', digest)
+    app.logger.info("Saved profile_pic for user %s: %s", current_user.username, current_user.profile_pic_hash)
+    return jsonify({'success': True, 'profile_pic_url': image_url(current_user.profile_pic_hash)})
 
 @app.route('/store')
 @login_required
 def store():
-    grouped_items = Item.get_items_grouped_by_base_id()
-    return render_template('store.html', grouped_items=grouped_items)
+    return render_cached_page('store.html', balance_key(), lambda: {'grouped_items': catalog_cache.get().grouped_items})
 
 @app.route('/check_inventory/<string:item_id>', methods=['POST'])
 def check_inventory(item_id):
@@ -277,64 +1132,76 @@ def check_inventory(item_id):
     if not item_id:
         return jsonify({'error': 'itemId must be provided.'}), 400
 
-    user_inventory = Inventory.query.filter_by(user_id=current_user.id).all()
-
-    owned = any(entry.item_id == str(item_id) for entry in user_inventory)
+    owned = Inventory.is_owned(current_user.id, item_id)
 
     return jsonify({'owned': owned}), 200
 
+@app.route('/owned_items')
+@login_required
+def owned_items():
+    return jsonify({'owned': sorted(Inventory.get_owned_item_ids(current_user.id))}), 200
+
 @app.route('/purchase_item/<string:item_id>', methods=['POST'])
 @login_required
+@retry_on_database_lock
 def purchase_item(item_id):
     try:
-        item = Item.query.filter_by(id=item_id).first()
+        item = catalog_cache.get().items_by_id.get(item_id)
         if not item:
             return jsonify({'error': 'Item not found'}), 404
 
-        if current_user.currency_balance < item.price:
-            return jsonify({'error': 'Insufficient balance'}), 400
+        if Inventory.is_owned(current_user.id, item.id):
+            return jsonify({'error': 'You already own this item'}), 400
 
-        current_user.currency_balance -= item.price
-        db.session.commit()
+        if change_balance(current_user.id, -item.price, required_balance=item.price) is None:
+            db.session.rollback()
+            return jsonify({'error': 'Insufficient balance'}), 400
 
         inventory = Inventory(user_id=current_user.id, item_id=item.id)
         db.session.add(inventory)
         db.session.commit()
 
         return jsonify({'success': True}), 200
-    except Exception as e:
-        # Log the exception details
-        print(f'Error purchasing item: {e}')
+    except IntegrityError:
+        # A concurrent request bought the same item first
+        db.session.rollback()
+        return jsonify({'error': 'You already own this item'}), 400
+    except OperationalError:
+        raise
+    except Exception:
+        app.logger.exception('Error purchasing item')
+        db.session.rollback()
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/delete_item/<item_id>', methods=['DELETE'])
+@retry_on_database_lock
 def delete_item(item_id):
     if not current_user.is_authenticated:
         return jsonify({'message': 'Unauthorized'}), 401
     
     try:
-        inventory_item = Inventory.query.filter_by(user_id=current_user.id, item_id=item_id).first()
-        if inventory_item:
-            item = inventory_item.item
+        deleted = Inventory.query.filter_by(user_id=current_user.id, item_id=item_id).delete(synchronize_session=False)
+        if deleted:
+            item = catalog_cache.get().items_by_id[item_id]
             refund_amount = item.price // 2
 
-            db.session.delete(inventory_item)
-
-            current_user.currency_balance += refund_amount
+            change_balance(current_user.id, refund_amount)
             db.session.commit()
             
             return jsonify({'message': 'Item deleted successfully.', 'refund': refund_amount}), 200
         else:
             return jsonify({'message': 'Item not found in user inventory.'}), 404
-    except Exception as e:
-        print(e)
+    except OperationalError:
+        raise
+    except Exception:
+        app.logger.exception('Error deleting item')
         db.session.rollback()
         return jsonify({'message': 'Failed to delete item.'}), 500
 
 @app.route('/minigames')
 @login_required
 def minigames():
-    return render_template('minigames.html')
+    return render_cached_page('minigames.html', balance_key())
 
 @app.route('/minigames-feeding-time', methods=['GET', 'POST'])
 @login_required
@@ -349,11 +1216,11 @@ def minigamesjumpjumpjackaloaf():
 @app.route('/adopt', methods=['GET', 'POST'])
 @login_required
 def adopt():
-    pets = Pet.query.all()
-    return render_template('adopt.html', pets=pets)
+    return render_cached_page('adopt.html', balance_key(), lambda: {'pets': catalog_cache.get().pets})
 
 @app.route('/adopt_pet/<string:pet_species>', methods=['POST'])
 @login_required
+@retry_on_database_lock
 def adopt_pet(pet_species):
     data = request.get_json()
     pet_name = data.get('pet_name')
@@ -361,30 +1228,31 @@ def adopt_pet(pet_species):
     if not (4 <= len(pet_name) <= 20):
         return jsonify(success=False, message="Pet name must be between 4 and 20 characters."), 400
 
-    pet = Pet.query.filter_by(species=pet_species).first()
+    pet = catalog_cache.get().pets_by_species.get(pet_species)
 
     if pet:
-        if current_user.currency_balance >= pet.price:
-            current_user.currency_balance -= pet.price
-            db.session.commit()
-            
-            adopted_pet = AdoptedPet(species=pet_species, user_id=current_user.id, adopt_name=pet_name)
-            db.session.add(adopted_pet)
-            db.session.commit()
-            return jsonify({'success': True})
+        if change_balance(current_user.id, -pet.price, required_balance=pet.price) is None:
+            db.session.rollback()
+            return jsonify(success=False, message="Insufficient balance."), 400
+
+        adopted_pet = AdoptedPet(species=pet_species, user_id=current_user.id, adopt_name=pet_name)
+        db.session.add(adopted_pet)
+        db.session.commit()
+        return jsonify({'success': True})
     else:
         abort(404) 
 
 @app.route('/release_pet/<adopt_id>', methods=['DELETE'])
+@retry_on_database_lock
 def release_pet(adopt_id):
     adopted_pet = AdoptedPet.query.filter_by(adopt_id=adopt_id, user_id=current_user.id).first()
     if adopted_pet:
-        pet = adopted_pet.pet
+        pet = catalog_cache.get().pets_by_species[adopted_pet.species]
         deduct_amount = pet.price // 2
 
         db.session.delete(adopted_pet)
 
-        current_user.currency_balance -= deduct_amount
+        change_balance(current_user.id, -deduct_amount)
         db.session.commit()
         return jsonify({'message': 'Pet released successfully.'}), 200
     else:
@@ -392,6 +1260,7 @@ def release_pet(adopt_id):
 
 @app.route('/forums', methods=['GET', 'POST'])
 @login_required
+@retry_on_database_lock
 def forums():
     error = None
     if request.method == "POST":
@@ -409,15 +1278,45 @@ def forums():
                 db.session.add(topic)
                 db.session.commit()
 
-    topics = Topic.query.order_by(Topic.id.desc()).all()
-    profile_pics = {topic.username: (User.query.filter_by(username=topic.username).first().profile_pic or '') for topic in topics}
-    return render_template('forums.html', topics=topics, profile_pics=profile_pics, error=error)
+    query = request.args.get('q', '').strip()
+    if query:
+        page = max(request.args.get('page', 1, type=int), 1)
+        results, has_more = search_forum(query, page)
+        profile_pics = get_profile_pics(result['username'] for result in results)
+        return render_template('forums.html', query=query, results=results, page=page, has_more=has_more, profile_pics=profile_pics, error=error)
+
+    topics, next_before = Topic.get_page(request.args.get('before'), FORUM_PAGE_SIZE)
+    profile_pics = get_profile_pics(topic.username for topic in topics)
+    return render_template('forums.html', topics=topics, next_before=next_before, profile_pics=profile_pics, error=error)
+
+@app.route('/forums/topics')
+@login_required
+def forum_topics_page():
+    topics, next_before = Topic.get_page(request.args.get('before'), FORUM_PAGE_SIZE)
+    profile_pics = get_profile_pics(topic.username for topic in topics)
+    return jsonify({
+        'topics': [{
+            'id': topic.id,
+            'title': topic.title,
+            'description': topic.description,
+            'username': topic.username,
+            'comment_count': topic.comment_count,
+            'last_comment_at': topic.last_comment_at.isoformat() if topic.last_comment_at else None,
+            'profile_pic': image_url(profile_pics.get(topic.username)),
+            'url': url_for('topic', id=topic.id),
+            'delete_url': url_for('delete_topic', id=topic.id) if topic.username == current_user.username or current_user.moderator == 'yes' else None,
+        } for topic in topics],
+        'next_before': next_before,
+    })
 
 
 #Limit nested comments
 MAX_NESTING_LEVEL = 2
+FORUM_PAGE_SIZE = 20
+COMMENT_PAGE_SIZE = 20
 
 @app.route("/topic/<int:id>", methods=["GET", "POST"])
+@retry_on_database_lock
 def topic(id):
     topic = db.session.get(Topic, id)
     if not topic:
@@ -431,27 +1330,123 @@ def topic(id):
 
         if text:
             parent_comment = db.session.get(Comment, parent_id) if parent_id else None
-            if parent_comment and parent_comment.get_nesting_level() >= MAX_NESTING_LEVEL:
+            if parent_comment and parent_comment.depth >= MAX_NESTING_LEVEL:
                 error = f"Maximum nesting level of {MAX_NESTING_LEVEL} reached. Cannot add more replies."
             else:
-                comment = Comment(text=text, topicId=id, username=current_user.username, parent=parent_comment)
+                depth = parent_comment.depth + 1 if parent_comment else 0
+                comment = Comment(text=text, topicId=id, username=current_user.username, parent=parent_comment, depth=depth, created_at=datetime.now())
                 db.session.add(comment)
+                record_comment_created(comment)
                 db.session.commit()
-
-    comments = Comment.query.filter_by(topicId=id, parent=None).all()
-    profile_pics = {comment.username: (User.query.filter_by(username=comment.username).first().profile_pic or '') for comment in comments}
-    profile_pics[topic.username] = User.query.filter_by(username=topic.username).first().profile_pic or ''
-
-    return render_template("topic.html", topic=topic, comments=comments, profile_pics=profile_pics, error=error, MAX_NESTING_LEVEL=MAX_NESTING_LEVEL)
+                # Pages start after a top-level comment id, so open the page
+                # that starts with the new comment's thread
+                root = comment
+                while root.parent_id is not None:
+                    root = db.session.get(Comment, root.parent_id)
+                return redirect(url_for('topic', id=id, after=root.id - 1, _anchor=f'comment-{comment.id}'))
+
+    comments, all_comments, next_after = Comment.get_topic_comment_page(id, request.args.get('after', type=int), COMMENT_PAGE_SIZE)
+    profile_pics = get_profile_pics([topic.username] + [comment.username for comment in all_comments])
+
+    return render_template("topic.html", topic=topic, comments=comments, next_after=next_after,
+                           profile_pics=profile_pics, error=error, MAX_NESTING_LEVEL=MAX_NESTING_LEVEL)
+
+@app.route('/topic/<int:id>/comments')
+def topic_comments_page(id):
+    if not db.session.get(Topic, id):
+        abort(404)
+    comments, all_comments, next_after = Comment.get_topic_comment_page(id, request.args.get('after', type=int), COMMENT_PAGE_SIZE)
+    profile_pics = get_profile_pics(comment.username for comment in all_comments)
+
+    def serialise(comment):
+        can_delete = current_user.is_authenticated and (comment.username == current_user.username or current_user.moderator == 'yes')
+        return {
+            'id': comment.id,
+            'text': comment.text,
+            'username': comment.username,
+            'depth': comment.depth,
+            'reply_count': comment.reply_count,
+            'profile_pic': image_url(profile_pics.get(comment.username)),
+            'delete_url': url_for('delete_comment', id=comment.id) if can_delete else None,
+            'replies': [serialise(reply) for reply in comment.replies],
+        }
+
+    return jsonify({'comments': [serialise(comment) for comment in comments], 'next_after': next_after})
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_TERMS = 10
+
+def build_search_match(query):
+    # Turns free text into an FTS5 query: every word must match, the last one
+    # as a prefix. Quoting each word keeps FTS5 syntax out of user input
+    terms = re.findall(r'\w+', query)[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"' for term in terms) + '*'
+
+def highlight_snippet(snippet):
+    return Markup(str(escape(snippet)).replace('\x02', '<mark>').replace('\x03', '</mark>'))
+
+def search_forum(query, page=1, per_page=SEARCH_PAGE_SIZE):
+    # Ranked topic and comment matches for one page, plus whether another page follows
+    offset = (page - 1) * per_page
+    if db.engine.dialect.name == 'sqlite':
+        match = build_search_match(query)
+        if match is None:
+            return [], False
+        # Topic titles weigh ten times as much as bodies. Topics are indexed
+        # under rowid id * 2 and comments under id * 2 + 1
+        rows = db.session.execute(text(
+            "SELECT forum_search.rowid % 2 AS is_comment, forum_search.rowid / 2 AS id, forum_search.topic_id AS topic_id, "
+            "topic.title AS topic_title, coalesce(comment.username, topic.username) AS username, "
+            "snippet(forum_search, 1, char(2), char(3), '...', 16) AS snippet "
+            "FROM forum_search JOIN topic ON topic.id = forum_search.topic_id "
+            "LEFT JOIN comment ON forum_search.rowid % 2 = 1 AND comment.id = forum_search.rowid / 2 "
+            "WHERE forum_search MATCH :match ORDER BY bm25(forum_search, 10.0, 1.0) LIMIT :limit OFFSET :offset"
+        ), {'match': match, 'limit': per_page + 1, 'offset': offset}).all()
+    else:
+        pattern = f'%{query.strip()}%'
+        topics = db.select(db.literal(0).label('is_comment'), Topic.id, Topic.id.label('topic_id'), Topic.title.label('topic_title'),
+                           Topic.username, db.func.coalesce(Topic.description, '').label('snippet')
+                           ).where(db.or_(Topic.title.ilike(pattern), Topic.description.ilike(pattern)))
+        comments = db.select(db.literal(1).label('is_comment'), Comment.id, Comment.topicId, Topic.title, Comment.username, Comment.text
+                             ).join(Topic, Topic.id == Comment.topicId).where(Comment.text.ilike(pattern))
+        union = db.union_all(topics, comments).subquery()
+        rows = db.session.execute(db.select(union).order_by(union.c.topic_id.desc(), union.c.is_comment, union.c.id)
+                                  .limit(per_page + 1).offset(offset)).all()
+    results = [{
+        'kind': 'comment' if row.is_comment else 'topic',
+        'id': row.id,
+        'topic_id': row.topic_id,
+        'topic_title': row.topic_title,
+        'username': row.username,
+        'snippet': highlight_snippet(row.snippet),
+    } for row in rows[:per_page]]
+    return results, len(rows) > per_page
+
+@app.route('/search')
+@login_required
+def search():
+    query = request.args.get('q', '')
+    page = max(request.args.get('page', 1, type=int), 1)
+    results, has_more = search_forum(query, page)
+    return jsonify({
+        'query': query,
+        'page': page,
+        'has_more': has_more,
+        'results': [dict(result, snippet=str(result['snippet']), url=url_for('topic', id=result['topic_id'])) for result in results],
+    })
 
 @app.route('/delete/topic/<int:id>', methods=['POST'])
 @login_required
+@retry_on_database_lock
 def delete_topic(id):
-    topic = Topic.query.get(id)
+    topic = db.session.get(Topic, id)
     if topic:
-        print(f"Current user: {current_user.username}, Moderator: {current_user.moderator}")
+        app.logger.debug("Current user: %s, Moderator: %s", current_user.username, current_user.moderator)
         if topic.username == current_user.username or current_user.moderator == 'yes':
-            db.session.delete(topic)
+            Comment.query.filter_by(topicId=id).delete(synchronize_session=False)
+            Topic.query.filter_by(id=id).delete(synchronize_session=False)
             db.session.commit()
             return redirect(url_for('forums'))
         else:
@@ -461,35 +1456,101 @@ def delete_topic(id):
 
 @app.route('/delete/comment/<int:id>', methods=['POST'])
 @login_required
+@retry_on_database_lock
 def delete_comment(id):
-    comment = Comment.query.get(id)
+    comment = db.session.get(Comment, id)
     if comment:
-        print(f"Current user: {current_user.username}, Moderator: {current_user.moderator}")
+        app.logger.debug("Current user: %s, Moderator: %s", current_user.username, current_user.moderator)
         if comment.username == current_user.username or current_user.moderator == 'yes':
-            delete_comment_replies(comment)
-            db.session.delete(comment)
+            topic_id = comment.topicId
+            delete_comment_subtrees(db.select(Comment.id).where(Comment.id == id))
             db.session.commit()
-            return redirect(url_for('topic', id=comment.topicId))
+            return redirect(url_for('topic', id=topic_id))
         else:
             abort(403)
     else:
         abort(404)
 
-def delete_comment_replies(comment):
-    for reply in comment.replies:
-        delete_comment_replies(reply)
-        db.session.delete(reply)
+# Sorts topics that predate activity tracking after every tracked one
+ACTIVITY_EPOCH = datetime(1970, 1, 1)
+
+def record_comment_created(comment):
+    # Bumps the topic's counters and the parent's reply_count in the same
+    # transaction as the new comment
+    db.session.execute(db.update(Topic).where(Topic.id == comment.topicId).values(
+        comment_count=Topic.comment_count + 1, last_comment_at=comment.created_at, last_activity_at=comment.created_at))
+    if comment.parent_id is not None or comment.parent is not None:
+        parent_id = comment.parent_id if comment.parent_id is not None else comment.parent.id
+        db.session.execute(db.update(Comment).where(Comment.id == parent_id).values(reply_count=Comment.reply_count + 1))
+
+def refresh_topic_activity(topic_ids=None):
+    # Recomputes comment_count, last_comment_at and last_activity_at from the
+    # comment rows, for the given topics or for every topic
+    last_comment = db.select(db.func.max(Comment.created_at)).where(Comment.topicId == Topic.id).scalar_subquery()
+    update = db.update(Topic).values(
+        comment_count=db.select(db.func.count()).where(Comment.topicId == Topic.id).scalar_subquery(),
+        last_comment_at=last_comment,
+        last_activity_at=db.func.coalesce(last_comment, Topic.created_at, ACTIVITY_EPOCH),
+    ).execution_options(synchronize_session=False)
+    if topic_ids is None:
+        db.session.execute(update)
+        return
+    topic_ids = list(topic_ids)
+    for start in range(0, len(topic_ids), IN_QUERY_CHUNK_SIZE):
+        db.session.execute(update.where(Topic.id.in_(topic_ids[start:start + IN_QUERY_CHUNK_SIZE])))
+
+def refresh_reply_counts(comment_ids=None):
+    # Recomputes reply_count for the given comments or for every comment
+    reply = db.aliased(Comment)
+    update = db.update(Comment).values(
+        reply_count=db.select(db.func.count()).select_from(reply).where(reply.parent_id == Comment.id).scalar_subquery(),
+    ).execution_options(synchronize_session=False)
+    if comment_ids is None:
+        db.session.execute(update)
+        return
+    comment_ids = list(comment_ids)
+    for start in range(0, len(comment_ids), IN_QUERY_CHUNK_SIZE):
+        db.session.execute(update.where(Comment.id.in_(comment_ids[start:start + IN_QUERY_CHUNK_SIZE])))
+
+def delete_comment_subtrees(root_ids):
+    # Deletes the comments selected by root_ids and all of their nested
+    # replies with a single DELETE over a recursive CTE, then recounts the
+    # topics and surviving parents they belonged to
+    subtree = root_ids.cte('subtree', recursive=True)
+    subtree = subtree.union_all(db.select(Comment.id).join(subtree, Comment.parent_id == subtree.c.id))
+    in_subtree = Comment.id.in_(db.select(subtree.c.id))
+    topic_ids = db.session.scalars(db.select(Comment.topicId).where(in_subtree).distinct()).all()
+    parent_ids = db.session.scalars(db.select(Comment.parent_id).where(in_subtree, Comment.parent_id.isnot(None)).distinct()).all()
+    db.session.execute(db.delete(Comment).where(in_subtree), execution_options={'synchronize_session': False})
+    refresh_topic_activity(topic_ids)
+    refresh_reply_counts(parent_ids)
+
+@app.cli.command('repair-forum-counters')
+def repair_forum_counters_command():
+    db.create_all()
+    add_missing_columns()
+    add_missing_indexes()
+    run_with_lock_retry(repair_forum_counters)
+    print("Recomputed topic activity and reply counts")
+
+def repair_forum_counters():
+    refresh_topic_activity()
+    refresh_reply_counts()
+    db.session.commit()
 
 @app.route('/delete_account', methods=['POST'])
 @login_required
+@retry_on_database_lock
 def delete_account():
     # Delete user's related data
     Inventory.query.filter_by(user_id=current_user.id).delete()
     AdoptedPet.query.filter_by(user_id=current_user.id).delete()
-    Comment.query.filter_by(username=current_user.username).delete()
-    Topic.query.filter_by(username=current_user.username).delete()
+    user_topic_ids = db.select(Topic.id).where(Topic.username == current_user.username)
+    Comment.query.filter(Comment.topicId.in_(user_topic_ids)).delete(synchronize_session=False)
+    delete_comment_subtrees(db.select(Comment.id).where(Comment.username == current_user.username))
+    Topic.query.filter_by(username=current_user.username).delete(synchronize_session=False)
     # Delete the user
-    user = User.query.get(current_user.id)
+    user = db.session.get(User, current_user.id)
     db.session.delete(user)
     db.session.commit()
     logout_user()
@@ -499,8 +1560,7 @@ def delete_account():
 @login_required
 def photobooth():
     user_id = current_user.id
-    avatar_data = current_user.avatar
-    avatar_url = f"data:image/png;base64,{avatar_data}" if avatar_data else None
+    avatar_url = image_url(current_user.avatar_hash)
     adopted_pets = db.session.query(AdoptedPet, Pet).join(Pet, AdoptedPet.species == Pet.species).filter(AdoptedPet.user_id == user_id).all()
     return render_template('photobooth.html', avatar_url=avatar_url, adopted_pets=adopted_pets)
 
@@ -510,26 +1570,73 @@ def logout():
     logout_user()
     return redirect(url_for('login'))
 
+@app.route('/metrics')
+def metrics():
+    token = app.config['METRICS_TOKEN']
+    authorization = request.headers.get('Authorization', '')
+    token_ok = bool(token) and hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode())
+    if not token_ok and not (current_user.is_authenticated and current_user.moderator == 'yes'):
+        abort(403)
+    return request_metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+STARTER_ITEMS = ["H02BLACK-F", "H03BLACK-F", "H01BLACK-F", "H04BLACK-M", "H02BLACK-M", "H01BLACK-M", "U05PURPLE-F", "U02GREEN-F", "U01BLUE-F", "U04PURPLE-M", "U02GREEN-M", "U01BLUE-M", "L03GREY-F", "L02GREEN-F", "L01BLUE-F", "L03GREY-M", "L02GREY-M", "L01BLUE-M"]
+
+@lru_cache(maxsize=None)
+def get_starter_avatar_hash():
+    return store_image(STARTER_AVATAR_PNG)
+
+def provision_user(username, password_hash):
+    # Creates the user and their starter inventory in one transaction. Starter
+    # items are resolved from the catalog cache rather than queried.
+    user = User(username=username, password=password_hash, avatar_hash=get_starter_avatar_hash())
+    db.session.add(user)
+    db.session.flush()
+    items_by_id = catalog_cache.get().items_by_id
+    db.session.execute(db.insert(Inventory), [{'user_id': user.id, 'item_id': item_id} for item_id in STARTER_ITEMS if item_id in items_by_id])
+    db.session.commit()
+    return user
+
+def provision_users_bulk(users, batch_size=500):
+    # Bulk-import path for (username, password_hash) pairs: each batch is one
+    # multi-row user INSERT and one inventory INSERT, committed once at the end
+    items_by_id = catalog_cache.get().items_by_id
+    starter_items = [item_id for item_id in STARTER_ITEMS if item_id in items_by_id]
+    avatar_hash = get_starter_avatar_hash()
+    created = 0
+    for start in range(0, len(users), batch_size):
+        rows = [{'username': username, 'password': password_hash, 'currency_balance': 1000, 'avatar_hash': avatar_hash}
+                for username, password_hash in users[start:start + batch_size]]
+        user_ids = db.session.scalars(db.insert(User).returning(User.id, sort_by_parameter_order=True), rows).all()
+        db.session.execute(db.insert(Inventory), [{'user_id': user_id, 'item_id': item_id} for user_id in user_ids for item_id in starter_items])
+        created += len(user_ids)
+    db.session.commit()
+    return created
+
+@app.cli.command('create-test-users')
+@click.argument('count', type=int)
+@click.option('--prefix', default='testuser', help='Usernames are <prefix><n>.')
+@click.option('--password', default='password', help='Password shared by every created user.')
+def create_test_users_command(count, prefix, password):
+    # The password is hashed once and shared, so this is limited by the inserts
+    password_hash = password_hasher.hash(password)
+    users = [(f'{prefix}{n}', password_hash) for n in range(1, count + 1)]
+    print(f"Created {run_with_lock_retry(provision_users_bulk, users)} users")
+
 @app.route('/register', methods=['GET', 'POST'])
+@retry_on_database_lock
 def register():
     form = RegisterForm()
     if form.validate_on_submit():
-        hashed_password = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
-        new_user = User(username=form.username.data, password=hashed_password, avatar="iVBORw0KGgoAAAANSUhEUgAAAaMAAAH9CAYAAAC3ERNzAAAAAXNSR0IArs4c6QAAIABJREFUeF7sXQeYFEXTfkmS05Ezghw5KkFAUBAQRZAoSA6Skwr8YkBFECUoKBkByUgSRDKIKPgpKElyzjmnI/Nf9e3sze7t3s7sTt6q5/GR2+1Q/VbPvNvd1VUJwMIIMAKMACPACJiMQAKT++fuGQFGgBFgBBgBMBnxJGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHGAEGAFGgBEwHQEmI9NNwAowAowAI8AIMBnxHNALgXcBFNSw8ScAOmvYHjfFCDACFkKAychCxrCRKhUBFJPp+xKApibq38mr71sAZpuoD3fNCDACKhFgMlIJWBgWTx39Yo8EUCB6pTMnvvGnSJEiztc5c+ZEmjRpgobt0aNH2L9/v8/69N29e/eUtF0JgFTwCoCjSipxGUaAETAOASYj47C2W0+NAMyPT+ns2bOD/rOKREVFYffu3WrV4WdALWJcnhHQAQF+EHUA1cZNrgdAKyHagksqH0fSpEmRP39+JEiQAMmTJ7fNEO/cuePW9cCBA3j48KE/3WnltMv15RgAU20zSFaUEXAAAkxGDjCiBkOYBKCDvB3acsuUKROeeuoppE2bVoMurNXExYsXhUL379/H2bNn41NuBoAoVwHvsylrDYq1YQRsjACTkY2NF6LqVQE8B2C4vB0ioBw5ciBx4sQhNm+/6pcvX8atW+T7AEhk5WcUEilNtN8oWWNGwJoIMBlZ0y56a9UweitugbyT3LlzI3PmzHr3a8v29+zZI/SWb/l5DYScImoC+NeWA2SlGQELIMBkZAEjGKzCEgB1pT7J2y1r1qwGq2Dv7mj1tG/fvvgGkR7ANXuPkrVnBIxFgMnIWLzN7o3eoO6LqEWLFrWVM4LZ4Hn3/+TJE5AHHzlFkHOEDyGHCHKMaAUgZnnFwggwAj4RYDIKj4lREsBKAGIJlCRJEhQsWBDJkiULj9EbOEo6azp58iQeP37s3euZ6DO6X6IdRU4B+NxAlbgrRsAWCDAZ2cJMISnZGMA8qQW6gBoZSXdYWfRG4PTp07h9+zZu3LjhqytygtgEQPXFKL315vYZATMQYDIyA3Xj+swAYAuAp6nLjBkzIm/evMb1zj25ESDnh2PHjvlzgiCvvC4A4iynGEJGIFwQYDJytqUpuKiQQoUKIVWqVM4erU1Gd+TIEVy5Qg54ceQ7AD1tMgxWkxHQFAEmI03htFRjawC8TBoRCdHWXMKECS2lYLgrQxdu6T8vz7xcrnOlcIeHxx9mCDAZOdPgNQCQC7eI2/Pcc3S3lcWqCNAW3t69e0HeeQCYjKxqKNZLVwSYjHSF17TGKcApBTpFsWLF2GvONDMo73jr1q2SBx6TkXLYuKSDEGAycpAxZUMRP7HZYcE+xmUyso+tWFN9EGAy0gdXM1ulsNSJeHvOTBOo75vJSD1mXMNZCDAZOcueNBomIxvalMnIhkZjlTVFgMlIUzgt0Zggo1KlSoVl5G1LWCAIJWRkRLX5uQwCQ65ibwR40tvbfr60ZzKyqU3/+ecfSXN+Lm1qQ1Y7eAR40gePnRVrDo7OF/cBKcYrIyuaJ36dZGSUD8BR+42ANWYEgkeAySh47KxYk8nIilZRqJOMjGYBaKGwGhdjBByBAJORI8zoHoQgI8rSWrx4cSRKJJzqWGyCwKlTp3Du3DnSlsnIJjZjNbVDgMlIOyyt0BKvjKxghSB1uHDhAk6cOEG1DwF4icMCBQkkV7MlAkxGtjRbvEqzA4NNbSojIxpBKQA7bDoUVpsRUI0Ak5FqyCxfgcnI8ibyr+COHTvw4MEDKtAsOtj6XBsPhVVnBFQhwGSkCi5bFOZLr7Ywk28lZWREBfj5tLEtWXV1CPBkV4eXHUozGdnBSvHoKPOqGw2gh82Hw+ozAooQYDJSBJPtColAqU8//TQyZKBkryx2QkBGRisB1LaT7qwrIxAsAkxGwSJn7Xoctdva9olXO8oCS9lgXVIdwK82Hg6rzggoQoDJSBFMtivUB8Aw0przGdnOdrh+/ToOHz4s5TfqDGCC/UbBGjMC6hBgMlKHl11Ku8mIFOZMr3YxW6yeu3fvRlRUlPQBP6f2MyFrrBIBnuQqAbNR8fMAMpO+WbJkQa5clECUxS4I3L17F7t27ZLUnQGglV10Zz0ZgWAQYDIKBjXr16kBYAmA5KRqunTp8Mwzz1hfa9bQAwGZI8MWAOUYHkbAyQgwGTnTuvMBNKKhpU+fHvnz53fmKB0+qhs3buDAgQPSKBtHHwEucPiQeXhhjACTkTONz950DrHr/v37cfPmTWk0/Lw6xK48jLgI8OR23qzgS68OsqkXGZG/Ny9zHWRfHkosAkxGzpsNgowiIyORJk0aR42OQuWQq7pZqTGuXbsGSvNAOoQqDx8+BG3DRUREBGxKdnZ0D8BbABYFrMQFGAGbIcBkZDODBVDX0Skk6KVcunRp08jo/v37oJXKo0ePULBgQSRPLvxDVAm1cfbsWVy8eBG5c+dG5szC4TFeuXPnDvbs2SOV+SP6EmyVQHX4e0bAbggwGdnNYvHrK8iIXpKFCxdGwoQJdR0dvSTppZonTx5d+5Eal1YIZt+bOn78uFBJ7bjpMuvBgwc9sFI6FroEe/XqValum+hoT9MMAZ07YQQMQoDJyCCgDepGkFHWrFmRM2dOXbu8deuW2GbKnj27rv3IG7cKGcl1OnbsmKLVjWxlg6eeegq0QiJRSkZUVrZdRx4NkQBEWlgWRsAJCDAZOcGKsWMwhIwoG+mlS5dQpkwZQ9GTXsaZMmVSvSrRU1EZSQTsRiKfYIj13r17+O+//6Q+PgTwRcAOuQAjYBMEmIxsYiiFaupORnTwTpEByEEiRYoUCtXSpphVyYhGRwnxXEnx/A42WbJk7q3TYMjoyZMnIoCqbLsuMYBH2qDLrTAC5iLAZGQu/lr3rjsZ0cuQokqr2V7SapB08H/69GnRXPHixZE0aVKtmja8nWDIiJSk7dF9+/bJ9eVn2HDrcYd6IMATWQ9UzWtTdzIih4XUqVODfuUbLeQAcOjQIdAKgcQMQtRqzMGSEfV/9OhRXL58WVJlNYA3ALijqmqlI7fDCBiJAJORkWjr35cgI0qoR4n1tBZpVaTUJVnr/qk9+SVQukdFMff09hrUYxyhkNHjx4/F2ZFsW5BiEa7VQ09ukxEwCgEmI6OQNqYfXe8ZWYGMCEa5w0CRIkUMP7vSwpShkJHUv5fjBD/LWhiG2zANAZ7ApkGvS8c5AJwAkJDuGhUtWlTTTqxCRuREQfl+pJWB1bzrlICuBRl5XYalfbuytIunpH8uwwhYDQEmI6tZJHR9dItNJ5FRqlSpUKhQodA1DbEF+cogbdq0KFCgQIgtGlddCzIibc+dOydCFMmEn2njzMg9aYgAT1wNwbRQU7pE7aa7RXTJkyRv3rzImDGjqUOmlQGlWKCVEgldJqUwPVb3spNInXTWwgnj5MmTOH+ecikK2QGgFgD3B6YaiTtnBBQiwGSkECibFTsJQIRgoFxGlNNIK5F+0SdIkAAlSpRAkiRJtGo6qHa8MqKKNugciYgpcWK6hmMtIecDCu1DnoGkI2GohezcudMd1cHVHi1d92vRNrfBCBiBAJORESgb30cfAMOkbrX49S21Rec0FD1bEorCYJY3G13+pBe7P9Fy3FqZMCoqSpx3kWjtlUiXkYmcZVIPwM9a6c7tMAJ6IsBkpCe65rZNP7kFa1DKBTrjCSbKtPcQ6I4P3XOhi696kJ1SyOi+EaV0kGTYF/1R7rmSGPTVaKxZt9H9OUWJoKCxtJIzWyiM0oULF4QatGqjVBRar95ou4627WRC2WEpSywLI2BpBMx/Qi0Nj+2Vaxv9A3yKNAp68QWb+sAbCXqp0suVhC7A0kVYtVGsg0HX63xENPHN0I+x47+97uYOHDyCo8dO4uy5i+7PjNTR17go0jdtzUkBUvPly6col1EwGBFJE1nLZAOAF4Npi+swAkYhwGRkFNLm9fMZgPKuQ22hBZ3zULRt2l6jC7JKhdJf0zYQrYpkqbDd1VOmTCmcGsjVWku5ffs2yFlBSt0gtf3x+z0wbdZCnDh5RlV3NHbSlTzw9BYiHwrfI5EQ/SAgrz/qX0+hoKp0QVjqFwA/63oCzm2HjABP0JAhtE0DkwFUAlDQl8ZEIr4SvREReJOAVD9rlkyg/y5euoLTZzyzGdAqiV645NmmNjMrvUgpgd2ZM2c8tuKkfgf074natV7E8y82UAU+EYHkeSdVpBUTrVJoG0+LbUypXSJPyl0kD55KWFBMPSNF5v5O+4NZjOyb+2IE1CDAZKQGLeeULQzAnTpU7bCGDn4fndpT9usYmTB5Nvp9+GXAZuJzKAiUhoEI7crpbaKPqdPno3e/zwP256tA+bKl8PeW7fHWzZEjB7JlyxZU+/7GQduYtEVqpHidqzEZGQk+96UaASYj1ZA5qoK4j0Su0CS0nUSuxyQbVs/1GGjy5MlQsEA+n4NPmzXGPblG9cqgVQu1UadBe9y8dTsksN7v0wW1a1ZF9mxZkDlTzHYitfvHn1tCardQZH6sXTYDh4+ewL79h9GpB6UG8i+0oiI3bG+hcXp5r8UpQ9jKU0eEpLiKyuS1R/akFaZL+FlXgR8XNR4BnqDGY26lHgUZSeF0KBI0ecqRNGnwGiaNHRJQ1z79v8CkqXPx2cfvoHc38pcAGjXv6uHRJjWSOHEitG/zJooUfMZvu21aNvL73ZpfN+KtNr1w//4Dd5n3enXAvXv3MXr8dPdntN1Ws2ZNlC1L0XGAf//9Fz/99JNHuzmyZ8XieRMQ+UxsQNk//96KAweOuMv9uuF/WPLLmoAY0Nlbrly53OVoy9Ns7z3Zquisy3nhQMCBcAFGwEQEmIxMBN8CXcfkYpBFApC2mWg1sndb4Bdx1rxlkTdPTqz8eRrSpU2DStUbY9fumLuWtN3VpUsXzJs3D3QpU5Irp7cjUaKEqob/6NFjROQo5a7T8I1X8ELFsmjbqjE+/HS4m4zo/Kddu3Y+2161ahX++OMP93fdO7fC4E/pSlZg+WLYWHw1Yry7IEULT5cuXeCKJpTw8qYjN8OYpS8LI2BhBJiMLGwcA1TLLIWNkc5zKF+R5LAw7tvP8VYTujfpX4iMWjVvCDpHmrdwGd7u1l8UptVB79693RU3bNiANWtiye36uVhyUjJOaSuweLFCqP96TdCKiOSlV97C1u27xL8pmkGTJk3ibY7CB82ZM8ftWLBl4xKP1VF8lTf99S8aN++G27fviGJ0T8iMvE6B8KLtOUrC5xJ+xgMBxt9bAgGeqJYwg2lKxEtGpFUg0iAyOncs5gxHIgz6N61OaJUiFzpfGTRokPgoULvyeh99NgLfjZsmCIjOpCShLbRWHd5z/y21rQTNjz76yF1s+vcjUK8OpQRSJtI4iYiIkKwmMjLiCAxWMw7r4xcBJqPwnhxxyIjgoMRt5F5NUigyH/7+fbFflHyREd2jad26dZw6dOC/ePFibN26FT27tsHnA95VhD6RUeMGr6JkcXICjJWS5V/FseMxEaupPzVRu2l8U6ZMEWnMaZtxx9/LFelChWbM+Qnd3/lElLdCwFi54l5bdExGiq3KBc1GgMnIbAuY279PMiKVpLOjRAkTYsaUb/DaKy/51JRezC2b1RffSSuGQCuUAQMGCI+7Q7t+Q6aMEfEiEHX3Ho4cOY6iRSLjlJP6i++cKBC80grJe9UVX70LFy+jftPO7rMxK8XAk5ERBe2rDuB4IAz4e0bACggwGVnBCubpEMeBQVJFHoS0eNGC2LhufkAtlZIRNSSRgJrtOrkCCxevRLvO/cRHgcgvPsVpZTRu3DhkiEiPFUum+nVf926DPAjJk5CEUryriWQREMgQCsjIaFN0KvLKITTFVRkBQxFgMjIUbst1JsiIIiVQMFFv2bNnjwjDQzJvxmjUqlEl3gGoIaONGzdi5cqV+G/LSuTOlV01MPItulDIiDomhwaKpD1y6MfCO0+pSOOle0ilSsV6+imtr0c5JiM9UOU2jUCAycgIlK3ZBwVQFReDlERGSJYsKc67HBX8DUcNGVEbQ4YMQf3Xa2DMyIGqEdKSjGpXfw7PPv+KajLaf/AIyr3whtA9Z86cyJo1q+pxaF2ByUhrRLk9oxBgMjIKaWv1Qzc9yQVOhDWIj4zkrt60Arh8aqvfkUhk5M+BwbsipcwuUyISDeuqDyitNRndunkNuXJmR4YI5XeHmIysNalZG3sjwGRkb/tJ2tNtzE6uP74H8HaAYc2Tctwo+UVPd3Nu3LghmnyuTHGsWz7LZ/M93v0U02cvEtGw27ZtqygteZHI3KheJbgtLon8ateujUqVKAaseqHzop8XTMYzT6vfKqTeuvUegJlzF/PKSD30XIMR8ECAycgZE0JORjSi1QAWApjoNTyK2rwKQEn6XM1Zhzzd+KypI31618kvvRI5EEkEEi3IKFhvOkqxsPu/bVi/cnYgNf1+L5FRoBVm0B2orMjbdCoB4+KWQYDJyDKmCEkRbzLybowu9Hwt/5ACf1LEAqUiT5dNF0TpoqgvIQ838nQjoZQUjRo1ErmTfEko23TUnvzSa506dVChQgWlwxHpKZYsWYIXKpbBhO8Gi3qnTp/FpctXkS1rZmTJnFFRW1+OGIchw8a5y5rt5s1kpMhsXMiCCDAZWdAoQaokPOPoZRgoHUMwkQOUkhHpII/EII2lXr167sCl9Jnk2t2i6RtBOTBI7crDAZEDQffu3QPCN3r0aBARkshdyyktBaWnIFETP08+XguREQ2DL70GnA1cwCoIMBlZxRLK9aDoywVcxckPeYHr33HuDElu2VLTFF062FhqEhlRG3/9thAFI/P71fjmzVsiPUPVmk3jHdWSeRPxYhXlqxlfjR04dBRlK8fGz0ufPj3eey82RJBUh6JKUJBUWhFJsnTB96hSuZz7bzkZlSxRGL+v/lGRVZiMFMHEhRiBeBFgMrLfBHGTjkt1yYa9AIykz/Lnzw96KWsp7ogMsiR3Str/7fe/3CF75OXjSxWhpF15mbPnLqL+mx2xdz8FHYgVeQoJKU8Tfdvv3U4o91xJ1KjmeSdUTkZUrliRSKz6eRpSpfKfInz2vJ/RpWdsnDuzV0akN8emUzuDuLwVEGAysoIV1OngTUaXANBtVMpbc5WaSpMmDSjFAa1itJDr16+LFNok8XnTadFXKG306htzX+mHGdJi0bO1Jg1fQ9YsGfH5gLgrJyrpTUZS7VHDBqB+3VpImza1R4PXr99E4xbdPDLHWoyMSF9+xkOZVFzXMAR4ohoGtWYdubOzUoQEmZAt6ST+A/osMjJSkJIWInftDjZ8jxZ6hNrG7r0HUfGlhpgyfigoH5K3SGREjheUguHBgwfuVBNUtlKFZ/HFwL6i2gcDhoFSSkiSJEkSlCwpnBRNl2PHjuHSJfqNIoTCiu82XSlWgBEIgACTkf2miNtR4fDhw6AYci65BoD25h4CSESfafUrXSKjDm3exIgv40/RbWU4C5eugTNnzwsVX65WCQtnx3rB0WfylZGE3fbt2/HwIUHqX9S4yBuFj8yJhZPrGQU69xMSAkxGIcFnSmU3GVHvXikDTgOgENqb6Tt6SRYpUgTkxh2s3Lx5E3Qfh8RJZETjeSZ/HjxXpoTbtZs+8+eMQLmY5OdOEp6ELeFsNaGVEa2QANylLPIAllpNR9aHEZAjwGRkv/ngQUakPm0p0aG1LyFHBnJoCFYkMkqUKBF+mjseVV8oH2xTpteTr4zkypBHH3n2kYybNAvvf/yV+De5ilOECjuK15ygPOxT7TgO1jl8EGAysp+tBRmRg0K6dLFx1OhXOxGStzs3lU2ePDkKFiwY1C94iYyUBErVG8r/du3Dv9t2ITIyHyqWLxNUd9LKhzK00oqPzoUkebNRHZCzQo3XW4H6IsmVKxeyZKHAFfYSJiN72Yu1ZU8bO84BQUYpUqQQW3DesnfvXty/f9/jJSuVIVKi3DtUV6mYTUbbd+7B2Ikz8eOCXzxUpsyslKFVrUhkJJ0JkRMIZX199OiR36aI9Gl1mSCBfX67MRmpnRlc3mwE7PN0mY2UdfonN7AV/shIrqa/SAxqHBvMIiN5RGx/0Afj2edNRlLbgaJWUDk1uJk9XbzGw9t0ZhuE+w+IAJNRQIgsV0CQEd0hoq26QO7b8oN3yRVczUtVaweGgUO+xYhRFFg85lKp9+E/rYSUSihkRO7buXPn9uiKVpS0SpIcNrz1oHOzQoUKiW1PK4uXazd701nZWKybGwEmI/tNBkFGpLYekRa84aAzFXo5E6lp4U23dfsuVH+1hU/PNH+mqFe6NF4sWND99Ttz54p/h0JGROJ0F8ufkDcaXfaVuc6LokRGqVKlsvSskUVgID35Gbe0tVg5CQGeqPacC+sAVMuUKRPy5Mmj+wj0uPTqK5iqfCBpkydHvTJl8E3TuPHtMvToETQZSWkuKEYfOXXQZVUnyYkTJ3DhwgVpSBwo1UnGdfhYmIzsaWBBRqS6mi23YIcqf8HNmPw16r72crBNuevNnb8U3d4ZgIcP4zoOPJ0xI/755BOffew6fRpVv/wyZDKiBoiMUqf2DPET8sBMbIBWr7t27ZI02ATAM/ieibpx14xAIASYjAIhZN3vhVdd0qRJUbx4cd21DDZQaiDFfK2QZnXsiFf8jClfv364HhUVNBlRxUrVG2PX7piLvEaQeSAMtPhedslVao6fbS2A5TYMQ4AnrGFQa96RICNyN6ZMp1pH6fbW9sqVKzhy5Ij4OL7kempHOWT4OHw5PDYsT/l8+bD8nXf8NiOR0Zxp3+LVWi+q7U6Ul5NRhgwZhLu73WXnzp3Cpd8l7QFMsfuYWP/wQoDJyL72LiuF/aFzIzo/0lMoPhtF7r59+7bopkjhAvjfespsHrqUe+ENkCs3SXxk9M3q1Ri0NCaqTbD3jCRtpRUZefORI4Oau1ehj1i7Fm7cuIFDhw7JHULIwYVSy7MwArZCgMnIVuaKoyylJW1Enxq13SS/v1K54nNYtkibH+ANmnXBuvV0zAG0f+EFDG1C4dRi5cmTJ2j9/fdYtnMnChbIhxVLfkCGiNgIFGrNuHb9JjRs1kVUM8oRRK2Ogcr72Jqj+eAJXKBG+HtGwCIIMBlZxBAhqCG26+gOTOnSpUNoRllVWiHRIbkUyXrk0I/RthUlnA1NKB1D4+bdcPv2HdHQpg8+QKFs2dyNbjt+HC8PHy7+pv6o31BFHqWbvOqKFi0aVMikUPUIpr7XXSJq4tPoXdvPgmmL6zACVkCAycgKVghNB3eyvRw5ciCb7AUeWrPx15avkOjy6qZffSe0U6uD3KHhu+bN8VaFCvj4p58w9tdf3U0Fc7/Inx7eDhRGrTDV4iIv7yNaBAXPc/tzh9I212UEzEKAycgs5LXrN2l0Lr3ZABpQk0a9TL0jhSdLmhTnj28JeVR/bd6GWnVbu9spmiMHdp+mzBgxsmzRZFSuSMdlwUm2p8uJineiKLOCb8mbNy8yZswYXAc61tq9ezeiXJ6Esm5yRWf3OKVjt9w0I2AIAkxGhsCseycvRN87+l3qxYjIDOKFfucOKDArneeQJEmSGKt+no5nS1Ny0eBl3fo/0aBZZ48GKPzRuuUzUaaU8rbvREWhas1mop0DLgcJb63ebFhHfFQwMh8oVJEkREZESlaQ48ePi2gQMm852susBGC7FfRjHRgBLRBgMtICRWu08QMAsaSgUDcUt45e4EaIV/gZ0Au+W+eWKFm8sBHdu/vo2E1kXMePCz0jfMuViCyQT/y55Y/FcXSjyOAdu8e0IYmZKSQuXryI8+fPi1BMMvkDQBVDgeXOGAEDEGAyMgBkA7voBuA7KR5ZiRIlQsryqkZvcvumLSTZr3fMnzkGNV+mRZv28suKX3H7zh30eOdT3Iu9X+PRUYrkycTfB3b+itSplcWTk50h0XLP/XzQapPcv+mSsZ5CGFL23tOyrUlXf+T7HnyWRD2V5rYZAQ0QYDLSAESLNfGQnOsknSiJHMVhM0p8nWto6XCQLltJ97agrzGFEsy1d9+BmDrD7YhBucQJyziix7nc1q1b4wsey8+pUROY+zENAZ7kpkGva8ffAOgt9UCZSmm7ySihsyRyPZZnnaVVytmjmxWr8Odf/7rvAd29d9/vi7pty8Z4vkJpvFCxLLJnCy0jqw8yosB5JVzOIXGC5VH0CymdBGFM0RyUCK166AyIxFdmXlcbdNj1D4BDStrkMoyA3RFgMrK7Bf3r3xLAdOlrylZKqQ9kORiyAAAgAElEQVSyZs1q2IjppXv27FmP/ujM5n/rF3jc53m1fltcvHRVlPPnaCBvhMIAUTggrUVGRh8C+MJH+xQivZZru6yfxv13B0A50GcBiAlzwcIIhBECTEbONnZFl1NDR2mYlFSOIlXrHctODivFtKPYdiqFksKR0ItZ8uUm74LBbVs2wshhA1Q2F7i4AjLy1Qg5jRDOauUagP9TW4nLMwJORYDJyKmW9RwXeV99DeBZ+cdFihQRDg7e2Vb1gmTPnj1P7ty5ExNy27e0AUAhbfyJUWT0lUuPf/XCgttlBBgBTwSYjMJrRtDdlI2+hqzHobx3P//880+o880oMvJWfSqAduE1VXi0jICxCIT6cjBWW+5NKwRohUQH8q97NyhFr6a7Sjlz5lTV3549e0R5+aE8uUSnS5eOQiiU+vfffy+pajBuYUFG9HGoUbt96XHy1FkUe46OhPwKba0dpkAXAcaxHkCgrH2B2ggRKq7OCNgLASYje9lLD20rACgJYHx8jftKUUHpJOLxBqPmOhEZHT58eKJGipeiGKoAUuhBRqSjdM+obt26IlcUCWW63bZtm68h0LimAfgPAEVxdZ/NqRgvtUG3dGNyY7AwAmGKAJNRmBo+nmHT+VJz2fdKXrC7XSQhVeukI6zkdpdObzIaOHCgzwgWf/zxByg8D0Wd8CdvvVkXTyV5CgP690CGDOk9ivXqM1D8/cNMn4FlaRv1Tx2x46YZAcsiwGRkWdOwYj4QIL/0A7QFZhYZSTrNnDnTTUjkAEKRyzesnqvKaKPGTMWCxSuw8784xEYxi46qaowLMwI2R4DJyOYGdLj6lLmvrWuMdAHVHVlCKzLaun0XXnrlrTgw+lsZyQt+9NFH4s9MGSNwaNdvIZkiS96yuHv3nrwN2pLcEVKjXJkRsBECTEY2MlaYqEpRBygGm980rrv+WYVcOWMT7wWDy+Z/dqB+0864dcv3/VKjyYjGsH3nHjR6qysuXnLfyRoNoEcw4+M6jIDdEGAyspvFnKkvZSgt74pu4HeENapVxuwfRuGpp5KEjILkqJA7V3a817MD2rQU2dvdDgxKyIiiao8aNUrU+3zAu+jZla5JhS7d3/0EM2b/JDVUPTpKd2xmwdCb5xYYAUsiwGRkSbOEhVIU843uPHm4QFPIosKFC2PLlthEfalSpsDpw39pBkql6o2xa/d+1KpRBfNm0OIjViSSUkJGN2/exOTJk3Hp0iV89H4P9O39tmY6Dv16AgYPHSO1R4kT3eykWSfcECNgIQSYjCxkjDBQhc58arpcmd3JlihEETkBNGjQABEREZg+fboItEryYpUKWDJPK8/wGISJjLJmzoiFc8bFgVwNGVHlRYsWgSJuk2gZnZzaW7t+kxQsli5wVQYQE8CPhRFwIAJMRg40qgWHFJMK1ocMGjTI41O60zNxYiz5aP2CD4SNWjKi9iRHBj10fb1RB/y+0R3tnJ/XQAbk722LAE9u25rO0oqTEwKJRyw8SePOnTuLbLT0n7dIL/Y8uXPgt1VzEJHerx+DLgCEQkaJEiXCldM+L8cGreuhI8fxbEV3oIyfAdQLujGuyAhYGAEmIwsbx0aqvQSgqb8IBKOGDcC8hcuw6a+YuKPxXShdtWqVKDNt0nC88Trt6Bknjx8/QfrsFIzCv46+tNm0aRNWrFgBPchI6DLkW4wY9T3984YrhNPvxqHCPTECxiDAZGQMzk7thVY+9N8E+QDbtIjxTBs1PDbNQ+9+n2Pq9PmoUaMGqlat6hMP2p6jbbrqL1XCIh/nOXqDKOmolowoLNKQIUOEeu/16oAB/XtqqqrXXajO3nhr2hk3xgiYhACTkUnAO6BbyuFDceKEFC1cAK/WegkfvU854uKKGjKixHmUQM9okXSk7cO+ffu6Y9MF0iMqKkq4eN+6dUsXMqL+W3V4D0t+WSOpws9tIKPw97ZDgCe17UxmGYXdTgmd2jfD0MH941XM6mT05MkTUNy4abMWxrt68zfIlStXYuPGjbqREfUrnWcB4OfWMo8BK6IVAjyptUIyvNqhnN8iMsDqpdNRvixFrvEvx46fQsnyr4oCSrbpzFgZnTl7HhWrNcLVq9dDIiMa44n9m5A2baAMEuonjIyMKJWFZwRW9c1xDUbAUggwGVnKHLZQhpIcnSRNX6lZFbOnjhQH90rIKEmSJOjYsSOyZfMdykc6MzKDjJQSpr9xnjx5EhMmxByd6UVGMh3vR0cPeiM6asUKW8wYVpIRUIAAk5ECkLiIBwJie44IaNbUkahd07czgryG9BJNliyZ+06OL0zNJKM9+w7j+RfrI5CO8c0FyS3dADIiNT4E8AXPTUbAKQgwGTnFksaM4+nos/Qj1BVtzdEWnRKRtpcCvejNJCOlOppJRtR3774DMXWGOxdSYgAUzZyFEbA9AkxGtjehoQOYKSXeUxNtQOmLXiIjGpGa9rVAQNLROyKEmrallZGe+jMZqbEIl7UTAkxGntZ6HsB3ro/+D8A6OxnTAF0FGfXq1hYDP35HcXdKX/QUcHTkyJGiXSPJSO42HQoZnTp1CuPHx2Rv11N/mSMDdcXPsOKZyAWtjABP5FjrfEyX3b2MRVtSlFuHBaDQBNsJCHLjJndupaKUjKg9PeO8+dJXfqG0ZMmSaNy4sdJhxSn3+PFjDBgQc9FXTzIaN2km3v94qNQ/P8NBW4wrWgkBnsgx1mgOgH71C6lTuxp+WeFOIWPGjfeOLlUo0+lDi0wYQUYpUiTHjzO+Q5VK5QKqdeDgUVSp+SYozE6JEiVQr17gsGoSGRkRDmjV2t/RpEXsJV3Sr2zZsgHH5a+AUWR0/fpN5C5YSVJjOIC+QSvNFRkBiyDAZBRjCOEhliZ1KiyZPwkpkidDrbqtce06hQITUlpaFehst9oAlnv18SNdwAdA7rxmCsWem5M9Wxbs3eaOBBCvPr37fo6pM+ZDzdaX/NxlzMiBaNGUPJi1l4lT5qDvBzEhfEgKFSqEFi1ahNSRnIx2/7sKOXOElo3WnzKUnbZMxddx/sIlKjIj2pu8nYV+tISEIVcOXwSYjGRk9PJLldw5brzCrxhxydDtHOBjOuYCcMrkaSoIWykZ5SlUGdeu3UCzZs1QtGhRxarrnUKCAra+3c0zWoRaHf0NRk5GbVs1xsihtPOrj8iCp1IHWQBc0KcnbpURMAYBJqOYlQitSOLs8y9f9RuatXYHvTwNIDeAxzqYZjeAIlK7f6yZh8yZM6BEudq4d8+9IDLbVoKMlJyFZMxVBg8ePAQlzXv77beRPHlyVZDNnDkT+/btE3USJ06EsSM/x5uN6qhqw7tw1ZpNsWffQdy//8Djq2B19KWMkWR09twFFClTE9QngJ3RmWBjwo2zMAI2RcDsF5wVYKNoAhRVIM6L9uat2+JM4U9X6oPochTHX7vc0rGjFy/6dGnTYOXPP6BwwWfENzPm/ITu73wilTLTVsTIo5SQUZa8ZXH37j2hs5rtOe+JsH79eqxbF+vMmCBBArRu0VAUo5QU8UmvvjF+KI8ePhIY+hIioTZt2vjMqRTspDSSjEjHiByl8OiR+7eRmfMjWMi4HiPgRoAncExom5yb1s1HsaIFfU6NLr0+wuwfKa+ZkNWuUCxRGs0j9zmRr1WHzI13FoDQDjWCV5jCzrwSiIyerfQ6Dh0+Lnpp164d8uXLF3yP0Vnktm3bhsOHD2P7duHEF7KQt9xTTz0l2lHiTKG2Q6PJiPSTzQ8Kc75Brc5cnhGwCgJMRi4ymjL+KzR8Q+zWxRGvA2Ppe4pGcEwDQ8b7op8weQ76fSgO2k0no0ljhqBJw9d8DvnnZWvRsv274rsCBQqgdevWGkAT28TYsWPdf9y5cwfXrtExnn9JmzYtUqZM6S7QtWtXTfXx1ZgZZFS4dA1QkFcAU12ODLqPkztgBPRAgMnIRUYEbqDzEK9tEapC5zx7QzSMICN/L3q7kFFEjtJ49CgmMk0o23MhYmlqdTkZFYzMh82/L9Zdn+/GTcNHn42Q+tFiPuquM3fACPhCgMkIKO46AA5IRgRg/wFDMXai+0oSffRNdDromCVBcKKUjK4AqBB9J+pgcN2EVCteHeWeh02aNBF3isJRmIzC0eo8Zq0QYDKKQVI4EMhdu+MDeO78pejUg4Imu4UOlALf6PTdqFIyotqUOGiHVsZX2E41KSySv9WbdG6RM2dOtGrVCilSpFDYtLOKmUFGhOAzxV7ExUv0W0UIP9POmlZhMxqeuDGmpnALL9E/li74HlUqB44u8PeW7WjcohvoNrxLDlOknOirOBNVzp54yYjakp0LmEZGEenTYv6ssXiuDC0kY0UeJ61+/fp49tlnVQ7fOcXlZERziOaSEfLhpyMwevw0qStyNFllRL/cByOgJQJMRjFokufCQgDJvxn6Mdq1Uh6frFSF13D0mMg1J8lRABRT5rJCQ6khIwoIN1dhu1oVEysj8jQkj0O5vNagHTb++Y/4KEuWLOjRQyR/DVsxw4FBAlv2oyCUVXrY2o4Hbj4CTEaxNiD/YXFxsEypoli/co4q63hFUqa6dCOebsYHEjVkRG0ZbTOfZHT12g3kLVTZPbZ+/fppemcnEGhW/N6DjFo2wsgA96G0HMOsuYvRtbf7/hUZZpOW7XNbjIDeCBj9YtN7PKG2L86OKBjo3GnfouoL5RW3d/v2HRw8fAx0099LtkTHm4tv3y/gHZ7dew+i4ksxFz6tSEYVKlRAnTqhRUhQDLSFC5q5Mrpy5RpefKUZjp+gQCHYT+H2LAwVq8YIxEGAycgTEtpvJ3IQEsjV29d8un79Bn76eTWkKACyMrSpv1YeHdz1XbyXXqX6spVXr+jL998aOJd9rozkK8FwdeX2toGcjFYs+QEVy5cx0ExAuRfewP6DIhGvGT9aDB0rd+Y8BJxMRtkpG4SXyWjrguLAxSfkpi0ubmTIkB4rFk9FwQLqIwlQKKGPPh2BH2a6U0TL+9wKYILM2SFg3DfZy3+lFEvPoOkodJOfGVWq1gi79hwQ3ZPDAjkusEDEiTMin1F8WMvmCc312H1UNhAjYHEEnExG4iXqQyhwGiWD2RZP0FNyQNgs1d24bj6K+wkVpMS+M+csxqSpc3H5ylWcPHXWVxVyTJgT30rMK9p0dZcHoJLuQy0jcKToFBSlgkQio9SpU+O9995D4sSJQ+3DEfWNSDseCCiZQw1dAahKC/xAdfh7RsAKCDiejOgXfZGCz2DeomW+8KYU4+6w3F4FyHWskfTZgP498V6vDprYzIezg2hXBRlRcaNs57Fqk2dGrVatGug/lhgErEBGXpHm6e6bO6gi24kRsDICRr3QzMAgztbXqdPnUPTZmr50+Tf60JdWJ97RDepGJ9ZbIlUoWaIwfl9Nue60ke0794gEb5v/ibnHGuiMqlL1xti1m86mhVBSNUq6p7cwGSlE2ApkdP3GTbxav518njj5GVdoGS5mBwScPFH9nsMQCWzfsceXkwHZjJZQ5JJEZzp0tvMCgN8lYxYtEomyZUpg1PD40xgoNX7DZl2wdn2MF24gMqIyslXVRVckbdJRT/FJRkmSJMEnn7jTW+jZv23alsjo0K7fkCljhGl6e62OKJ8GG8o0a3DHShFwPBn5uqzpDU6vPgPx87I1uHLV5/Y6BaKjm50j5fXKly2Ft5rURZuW7p08pZh7lJPIKL6I2PIKRFxURyZ6X4RlMlJg2ZUrV2Ljxo2i5In9m5A2bWoFtfQrIvvRQoeUlF4ixuOEhRGwKAJOJiPaz4ok3D96vzv69u6oyATv9PscW7fvxrHjp3Dt+o2AdU4c2OSOwPB03lxIm0bdS0giI7U6TpnuEQ3hCwAewfICKq68AJORAqwkMkqZIjkO7PwVqVLFpq9QUF3zIn9t3oZadd1pPNq5Ukxo3g83yAhohYCTycgd4JPAyp4tC/ZuW6MVbu52vLZE3J8r2XKjwmq36aQO5I4EskERIRExaSlMRgrQlMiIVsyrl05XUEP/Ik1b98SKVb9JHTn5WdcfTO5BdwScPkEpf7dwSqAzjqKFC2DDam1Du/k4MPYwWqJECXHltP9MpYePnkCZ52OuQyklMKkDWr2VLP+q9yShMyQto5UyGQV4DKOiojBq1CjcunVL9Y8RPZ9wLzKiC9c19OyP22YEQkHA6WRE2GRwOSWI2D6JEiXCrKkjUbsmXcHQXn6Y4XnJNUHCBGjd3B3Kx2eH0v5+KKu3cZNm4v2PKWi4EK3sSnet6M6VmyjZtTuuCW/fvo0hQ0Q2Xre0NTg2nb+ZLDs7inKlOdF+e0D7x4hbDEMEtHpp2QE6ckRoLleUtlNoW8VsIXdtctsmkV8uVavXwCHfYsSo73H53I7nM2Qt+Zfa+j7KCzJaOGecyPVEcvzkaZStXA/37t1HoUKF8NZbbyFhwoQadGXfJrzI6BClGKLRaHk3LVh0KDwQhQlyCf1SUh6SPthOuR4jEAQC4URGBE9f132i0nKspK27UiUoa7PxcvjIcVR/tQWuXovx5vtjzTyUKB5cnEtKjX71zI4ZqTMXa5cgQYKHIY4mDhlRe/JwQB07dkTu3LlD7Mbe1eX3i1yr0qvR3pfpaFT16tTA9O/dacFNGShF86ao3i6hLVy9rwOYMk7u1N4IhBsZSdb6NL67F2rPbrSaAvLIDO/36YL+fTxcuFV3kzZriVDt65OMSBEOlBprDh9kRF+6w1GtXzkbZUoVU20/LSvI7PUIAMdv0hJcbksTBEJ9WWmihImNZAaQy3WPKF41smXNjCyZM4oyi+dNQPp0aTVXe826jWjUvKu7XVodJUyQEAtmj0GmjHT0pU4SAFPTZC1Bbr3Bil8ymjp9Pnr3+1y0G+4pJGRkJH+eOgEYLwFPCRspcaNZsv73v/BGE/f1Bj2vApg1RO7X5giEOxl5m4+IiVI6eEty70uvvuw+Z9q3eLUW3S8MXiidec3XPaP8kEs6OTeoFWqrZYd3558/f4m2jci7gVKjqxG/ZERnRsWeq4ULF2MS2pYsWRKNG4fncYQfMiJYKLmVyNJIP2Z++nE8ChcUx0mGy92799CsdU/8uuF/Ut+U0qSN4Ypwh4yAHwSYjAJPDY9wQG1a+I+48HbbN0WqBauIV/ZPIqP/U6mbXzKidgZ9NQbDvqGoSTHSrl075MunPt2GSp0sVXzRokXYutV9BOPreaKkRpT2IxMpPn3y16j32sumjGHJL2vQqsN78r6r0BGlKcpwp4yAFwJMRr6nBF2fJw8CCgPkFq0DpRoxG70SrqlNKxAvGUn6R+QojUeP6CgCaNKkCUqUKGHE0CzRh4yMfgHwuh+l6BZsS/ouf748WLd8pi7bvEoAqVLzTezYuVdeNH90wF13Rj4lbXAZRkAPBJiMPFH1yPQq/8oKbrrBTgAfKSuU2l0RGdGvbfrVLUmBAgXQurU7FE2watuinkIyorF4RAQxy0mGFCH3f7oGIBOl88EWNmEl7YlAuE5COsmVB6vzGbEge7bMoHMgs1y+tZpSPqJE3HVlvH0uQB+KyIja+HnZWrRsT0lyYyRjxozo3bu3VkOwbDsqyIjGQCnt6QePiAgycfRgNKgn/jRcckdWAs0Ll9CZImWF3WO4ItwhI+BCwKlk9EF0YMg8rjGSG1r8IRBcBUcNi0kLkTFjBOrUdl7SOIoOMemHudi12x3AOdCtfMVkRLh5r8BSpkwpVkjZs1MGeGeKSjIiECilg3CrMzuOXcdu/fHjQnfSyZ8ANHCmlXhUdkDAiWTkM914ihTJ0aTBax42qVK5rIh4EG7SpmMf/PTzavmw3wbwvQ8cVJFRnoKVfUY6J1Lq0KEDMmUSZ/iOkiDIiMbvjgaSJElirF0207TVN8U2pBiHLtkHgLJPnnSUkXgwtkDAsWREIfx/mjse5Z4raaghyIV234HDSJw4MYoVERksLClfjhiPIcPGynWbGu3xNSb6EJ6y3pKkB0AJeorIwwHFN5j33h+M73+IyYRLnnVLly7FxYuUAxCoV68eypYVYe4cJUGSEWGwE0Bx+gflxPrmq49MC6vkRUg9ojcHRjvKSDwYWyDgWDIi9JW+RNVY6rtx0/DRZ7HhXeQH0fIoyZTpkzJ+WlkuXrqCZ4rFuRdFvtqdAZAPu0iapAbHLHnLggiZZNCgQVYevia6hUBG1D95EdDLX4iZTg0vvdJM5PFyCXldmh+0URMLcSN2QcCJZNQPwFeSAcj5gBLX1ahG57PBSdWadHcR2PHfHjzxuQkYt11aGY0dORBvNopJD2Fl8ZEbaVd0jLXPiIzKlCqKJfMnIU3qVIqGwGSkCCZ5IfeMorPKv35bGFS0DdW9+qjgFeGbzlnJ4YKFETAEASeSEQFXH8AiOYLyM6NXalb1m0Ji9PjpOHjomKj6w0zPdBCy9voAcLsieVkqq+tFLj42OwyM0lm0c9c+EfkhKooc7WKlSuVyWLrA13GS/5all1qOHDnQpUto8fWU6m9WuRBXRqQ2xYmjuSruKDVu8Cq+H/ulKcP5feNmvN6og9T3epc7uim6cKfhh4BTyUiyZE8AdMtckTddPOaf6PqO3qyPFUwTumTzg1SOVmXknUdnA1aXXn0GYuHiFbh567ZQtcAzT2PJvAnIkZ04VpnkL1oVly5fRbp06dC+fXukT0/HT84UDchIAobOabrRH8+VKY75s8YiIr328Q8DWUGeediVcmV2oDr8PSOgBQJOJyNvjCiFxJsKgaPQOesUlvVVLMJ1b8MdVK7uay9j8rgv8dRTT4XQbEzVO3eicODQUUhbiFqfN3gdaosMuXly51AUOWDYyIkY9GXMGXizZs1QtGjRkMdr1QY0JCMa4glX4F4xXK1tqhRD2XYdudlRvEYWRkB3BMKNjHQH1EcHiQB45BUKNccNbaXQlopc9HhxeR1qq3pB5ilUGdeu3WAyUj/jyK06J1WjhIbkPGK0yJM9AqDdhe+M1oH7Cz8EmIyMsTntcdFN09RSd5EFnkbl559TnFZAWgFt3+l5SV7vKBG3bt1G/aadsfkfcrCKiRxQtHABsVKKTyQyojJO9qrTeGUkQfohwUZ/PJMvD/79c6kxs9TVC5ORoXBzZy4EmIyMnQqFow+Ff6cgD/JuKRJ4y7fqi7MCkgcPHqBP/yHi3/E4UVBOmg9Sp0qJeTNHo2IFnxGNNBsdRW+YMecn/LP1P9FmokSJMGvqSL+OIHSHie4yMRkFZQLKM0EOBGKFJEWKp3M8Os+TS48urTHok9hI3LTFRmlMypcrjd7d2gbVOVV6u2t/zFvkjs7A74mgkeSKShHgSaYUKW3LUVoBSr4mj48XqAfJiYLqkeSNds74FcDTI4cNQFuDnCM6dH0f8xctd+s6fMgHKFGskAht4y3S2UNERATefTc2bl2ggdrpe51WRgQBOd34dOd86qkkeKtJPQFTtRefF6nNtZYZsxeh+7uUEFlIewBTtO6D22ME5AgwGZk/H2g//vl41IgvmCldShUuenqcGfnTadSYqViweAV2/kfRY2JkwayxqFHd8y7X7HlL0KXnx0iTJg26desGCgvkNNGBjGh5XFfapiO86FpC5DNPB9wa1Rpbr3tHKbRun9tjBJiMnDUHxKVJI8lIgm/I8HH4cnjsATvF/ps0NmZ7kUQiI/p3GIQDomGG+uOOojF45HagO15018sMOXP2PAqXFqsuCqjLZGSGEcKoz1AfnjCCyrJDFWSUNk1qnDiwyXAlaXX0Qo0mHv12bNcMw77oj0uXruC5ynVx9doNx5LRtWvXMHz4cGn8oTxPZLyKUkNTxn+FUiWLIv/TuQ23qdShjIzobh3dsZO2ik3TiTt2LgKhPDzORcVeI6N0GYPpHGH21FFxtsqMGgoddtOhtyS1alTBvBmjxS9reqmROM2rbsmSJTh69CguXbokDZtcHYO5VEWHM59IjZi5GpLPFxkZ0ccUHsp9iGTUvOJ+wgcBJiP72zpfdErrwzQMs7PRkqdd4+ZdceXqdYFq7lzZRfK4kaNjzr6dQkZbtmzB33//jXPnzrlnT/LkyaRQSuTu9ka0p+N9hVOLoi6IG8KFCz6DlT//gHRp0yisqn+xfh8OwYTJc5iM9Ic67HtgMnLGFCAfauFld+X0NuF2baaUfr4OjhylYAIgT7tvd+7aRxcnkSxZMnz00UdmqhZ03xcuXMDBgwexYoWnazUR7n9bVop2vZILUnLHGBD8C0U3cJcZ+PE76BWCO3bQg/NTka4YdOz+IRYtEePjlZHWAHN7HggwGTljQliKjAhSX1Ei7EhGQ4YMwe3bMXH6vMXbaeTRo0eIyFFaXiw/gCN+phjdIXInsTt3bAuSJ0tqqdnI23SWMofjlWEyco6J3akIzPCs8wWjdxpyO5DRvXv3MHnyZDGcM2fOeAyrUoVn8cXAvkiZMgUK5KdrXnFlxKjvMXCIh0Ocv2fMnVzv/T5d0L+P9aKby8iIElQ9Hb36Puucx4VHYjUEmIysZpHg9ekFYCRVn/79CF0uQqpVjSJ3N2zWGdt37nVXzZkzJ7Jlyya866wg5A23YcMGEAnt3En84CkU3YCiXNSvWwtp07qjOcWr+uwfl6BLr4+lMkddqRhi8pLECF0iFXk5kiVLivPHtlgBijg68D0jS5rFsUoxGTnHtOkAXKXheIeIMXuI3iskSZ/atWu7I5gbkZJ8x44duH8/xq+APOF8iYhu8GYMUY4aNiBo6KbOWIDefQfK61OWRYqvk8H1//L0pVVWsXJFyQGFHFGk0E8a3J8KGkeuGD4IMBk5y9aDKV4dDYlSnlPqcyvIseOnQCkpSLJlzYwsmTPCO+CrXE8iqaefpl2hWMmePXu8Q7l8+bJY3cjl4cOHmDgx/qsxlAmYRAo4qyVezVr3xPJVHqnn6VLrH9Hedtupn6GD+6NT+2ZadqlJWxT/rl1nyqAihKN2a4IqNxIIASajQAjZ63tLkhFBSKsEWi14u5/7WzXpCbQLLhwAACAASURBVPumdfNRrGhBPbtwt73klzVo1SE2kKn0RfZsWbB32xpDdFDTiVdyPc5npAY8LhsSAkxGIcFnycqUO0n4dltpC8gfGckRPHj4GG7fvuMBqpQ6QynSH7/fAy9XqxSnuLQCUtqOluUOHDyKsi94npFZkYy80o4TBPx+0HIicFvxIsCTzXkTpAOASTSscaM+d59/mD1MJWRkto569n/23AXUf7Mz9u4/JLqh4Kc/zvgOVSqZE3fOe6xeXoC0InqJdnv1xITbZgTkCDAZOXM+/A9ABUrrMH/maKS1wI3+cCcjaZq1bP8ufl621j3rRn/zGVo2q2/qLOzd73NMnU4B4N3C7wVTLRKenfOkc6bd+wAYRkOzgps3ebC17/K+eAnrFbLo8NETuHnzlrCmmVtySqbToC9HY9jIWMeK11+tjh8mDkPixImVVNeszOXLV1H55cY4c/aC1OZNALWi/6MfMyyMgKEIMBkZCrehnVF00szUo9lnR3JvOr3IyOvg3bKeatIM8IpuID422k4+nEf4fWDoI8qd8XI8POZACQA7aKi1a72IudM8ogIYisDzLzbAnn2HkCpVSmz9c6lw7dZaaGVU5nm6yhMrtE25eul0rbvSpL2Ll66gXJU3cOXKNXd7CRMmxP9+W4hCkRRFSD+ZOWcxevb5DBS+yCXrKOUUAN9xj/RThVtmBNwI8C8hZ0+GHwC0piG+WutFzDGJkKRf4EbkXPL2CLNiqJ3psxehR2xK7zgzsPmbdTF21CBdZqaP+HkfAvhCl864UUZABQJMRirAsmFRStZGt/4pOoMgIyIlI4Xu2NBdGxKjtqEoZcUng0RkJFiJjNb8uhGN3urqAX/58uXx+uuvY+nSpSIthSQVK5TBisX0W0I72fLvTrz8Wgt5gy0BzNSuB26JEQgeASaj4LGzU013EFUjCWnr9l146ZW3BE65cmbDrn9W6YpZVNRdkLcavfRJrBL37cCho9j05z8grzVJIiMj0apVKw88/vvvPyxYsMC9fUbbmv9u+hlZs2QKGbf1v/+FN5p0lNqhREyRAMhhgYURsAQCTEaWMIPuStSlcGxSL0atUORkNHLYALRt2UjXgXofyBs1zvgG5SsCQ+PGjVGyZEm/1bxzPoU6jq69B2DW3MXy/mhbjrbnWBgByyDAZGQZU+iuCMW/2SdWDEmTCldicmzQUyRyyJsnJ3b8vVzPriD3pqOYfH/9tggZTYzNR5Ej9u47hHuuwKw0+Dp16qBChQoBcYiKisL48eNB8fYk+XzAu+jZtU3Aut4Fyletj337RSJgEtq7fEd1I1yBETAAASYjA0C2WBd0j0Sk7uzeuTUGfxo3bpoW+sqT64X6y16JPmvWbcTpMzFpwNvovALzp8/jx4/xzv8NAqWQuH//gbtY1apVkTt3bhQsqC4e3rJly/C//8Ve+VHjHXj02EmR4PDkKXcKItqSqwwgbp4MJQBzGUZAZwSYjHQG2KLNZ4vW69Po/HEd69WpgeovVUTr5g01U3Xt+k1ipULyYpUKWDIv/sjZmnVsUkM/zFiAJcvW4tff/vTQoESJEmjSpElIWm3atMkj1Xme3Dmwc7Nn6nN5BydPncG69X+il2f6ig1kipAU4cqMgM4IMBnpDLCVm79+8s+I4WPm7Fm6fF2WFs3ewNttm2qirrQ9R5ld5834DlVfEKl7HCMUzJWCup44eUY4TMglderUoP+6dvX0mgtl8BcuXMCkSZNA23ckCRIkAEUeL1qEfBA8xevcjPbntgFoHEr/XJcRMAIBJiMjULZ4H9fP7XR724Wqapa8ZXH3rmdeISO26ULVW2n9WnVb46/N9H6PK4MG6XM3SOrJ27Hh4ol/QckA5SIjo02ubTmlQ+NyjICpCDAZmQq/dTq/dWFX1kePHx/4edna1BTBmWTCd4NRqKDyaABDv56AwUPH+B2UFDNu/crZoGgDdhFyRiAngLteyfvSp0+PZs2aIVDiP63GSckC58+fj927d7ubrFO7GmZNjblTRfIkQYJn0mUp7vZY0KpvbocR0BsBJiO9EbZf+50AjJerXaNaZeTInlV8NGq4ZyruPv2/wIMHlEIJ+GHmAne1du3aub3B/KX4psKSs0GxIpGabROGArl01jJt5kI8eRJ3wfjCCy8gIiICBQoUQLp04i6x4fLnn39i+fJY70SXt+Kfj5M+ei19+tKx8YUM14w7ZASCR4DJKHjsnFyTMsZSADnKbaD6xiW9qFu3FlGIPEROSlu2bIkXv1HDPEmPVlKtmjcIGXNyNpDLiVNnIK0EfTVeqlQpJEmSBNWqVRNnQVaRPXv24ODBg/DCcT2AalbRkfVgBNQgwGSkBq3wLvtPPMPPF71oSi99r+bsZN++ffj111/dTZ85c8YUlBMlSoQsWbKIvukuUJkyZUzRQ22n27dvx6JFi0Bu5S4hMiJSYmEEbIUAk5GtzGVZZSkzmwiv0L17d2TNGrOlp4Xcvn0bQ4YM0aIpjzbUEKbmnevQoJdzA/nVe2y16tAlN8kIaIoAk5GmcIZtY+JwheKt0YE+bWuxGIsArS7lK0zyADdWA+6NEQgNAZ6woeHHtWNu9BcnIMhpIV8+2rFjMQOBXbt2Ye7cuVLXtG9HF8c88omboRf3yQgoQYDJSAlKXMYfApSPYAZ9SYE/KQAoi7kITJs2TTg2uOQ/AJRkkYURsDwCTEaWN5FlFUzsinNWOGXKlOjRowdSpUplWWXDSbGJEyfixIkT0pDpBnKycBo/j9WeCDAZ2dNuVtA6AoAIK03eZxSRmsU6CHg5NEwB0N462rEmjEBcBJiMeFYEi4D7RqjTPNOCBcRK9WhlRCskmfCzbiUDsS5xEOAJypMiGAS20zERVaSU2ZQ6m8V6CNDZEZ0huYQcGhJZT0vWiBGIQYDJiGeCWgTKAthMlSgmW6dOnUAXRlmsiQB515GXnUtOUQZ4a2rKWoU7AkxG4T4D1I9fbM9RGoO6deuibFniJhYrI0ARGrZu3Sqp2Dz6SthsK+vLuoUnAkxG4Wn3UEYtyIgutn7yySehtMN1DUTAy6GBn3sDseeulCHAk1IZTlwqBoGj0cG589I/2GnBXlPi8OHDmDp1qqQ0paStZK8RsLZOR4DJyOkW1nZ8TEba4mlYaw8ePMCsWbNw6NAhqU/KefSMYQpwR4xAAASYjHiKKEUgwzP58+w7dPh4RrpTRHeLWOyHgNd2XffoFCH+syHab3issY0RYDKysfEMVp1cubeT51yjRo1QvLgIR8diMwQo1cSAAe5cUZSvozCAGzYbBqvrQASYjBxoVD2G1L1Lm8ajx/0wL02aNOjXr58eXXCbBiGwYcMGrFmzRurtRQAbDOqau2EE/CLAZMSTQykCwouOyUgpXNYtd/PmTYwcORL37lHYOiH8HrCuucJGM56EYWPqkAcqyIgic1OEbhZ7I7Bt2zYsXLhQGgRfhrW3OR2hPZORI8yo+yBqA1hOvVjRpVs6lE+bNq3IqZQhQwbdAXFCB5MmTcLx48elobQB4I4d5ITx8RjshQCTkb3sZZa2KwC8YlUyoi2nS5cuubGhdBZZsmQxCyvb9Lt7927MmzcPjx49Ip0nAOhsG+VZUcchwGTkOJPqMiBBRlbeovNKKidSWrD7eeC58PXXX+PKlStSQX4fBIaMS+iEAE8+nYB1UrMpUyS/ePtOVEYrkxHhvXPnTvFLX5LcuXOjY8eOTjKF5mM5f/48vvvuO6ndqwAoTxULI2A4AkxGhkNuuw7fAzCctLY6GZGOR44cwZQplEsuRjiyeOD5tmTJEmzZsoUK0n5dQwBLAtfiEoyAtggwGWmLpxNbsxUZkQGioqJAh/MXLlxw24NWSLRSYomLAJ0dzZkzR/piB4BSjBMjYDQCTEZGI26//gQZZc2aFd27U/QY+8iYMWNw9uxZt8KtWrVCpkyZkD59+ngHcePGDQwbNgxPnjxB//79kTJlSvsMOkhNx40bh9OnT0u1+b0QJI5cLXgEeNIFj1241BT3i+xIRpKBPvvsM1CgUEmIVGk8vuTu3bse7uvhQkaEhSxuHb8XwuXpttA4edJZyBgWVcX2ZES4rlq1Cn/88YcbYvK0I487uXiFyUGpUqXQoEEDJEyY0KKm0VYtGRlFAUihbevcGiMQPwJMRjxDAiEgyMiKl10DKe79/Y4dOzB//nz3xwULFkTLli3F3+SFR954klAW23LlyqntwtblV6xYgU2bNtEYyOYdAMR6gth6ZKy8HRBgMrKDlczV0TFkRDCeOnUK06dPx507dwSq6dKlQ4oUKXDmDAWwBigqefPmzREZGWku6ib07uWJOBZANxPU4C7DFAEmozA1vIphO4qMpHGPHUvvWrhJSCKmPn36qIDGeUVll4eZjJxnXkuPiMnI0uaxhHKOJCMJWemcJCIiAu+++64lADdTCa9IFvx+MNMYYdY3T7YwM3gQww0LMnLCmVgQto1ThclICxS5jWAQYDIKBrXwqXMLgLhk49SXNa+M4k5mdvEOnwfcSiNlMrKSNayniyAjOsynC6NOlNmzZ2PPnj3iYmuHDh3EpdhwFxkZjQFgr5vO4W48G4+fycjGxjNAdUFGrVu3RoECBQzozvguKOoARR8gqVevHsqWLWu8EhbrUUZGFKsuscXUY3UcigCTkUMNq9GwHE9GhBPFZaP4bE7ejlQzH86dO4fRo0dTFSYjNcBx2ZAQYDIKCT7HV2YycryJ4w6QySgMjW6BITMZWcAIFlYhLMiI8Je2ppIlSyaP0WZh0+inGpORfthyy/4RYDLi2REfAmFDRlI4oCRJkoiEfNmyZQvbmcFkFLamN3XgTEamwm/5zh3v2i1ZgFJvUwpukho1aqBq1aqWN45eCjIZ6YUstxsfAkxGPD8CroyogFPvGckHL8t4ioEDB4ZNtG7vCcBkxC8FMxBgMjIDdXv16egIDHJTXLt2DcOHiwzrIl15165d7WUpjbRlMtIISG5GFQJMRqrgCsvCYUNGZF3ZHZuwWA36mtFMRmH5nJs+aCYj001geQXCiozkmV4rV66MV155xfIG0lpBJiOtEeX2lCDAZKQEpfAuE1ZkdO/ePYwcORI3b94UVg+ntOM03suXL+Obb76RZjxfeg3vZ9/Q0TMZGQq3LTsLKzKSr4zCjYy8kuvR8JmMbPnI2lNpJiN72s1IrcOKjMaMGYOzZ8+68c2aNSu6d3d2rNDDhw9j1apVHokGXQCcApDLyMnGfYUvAkxG4Wt7pSMPGzLavn07FixYEAcXJ7u1r1mzBhs2bPAYc793OmHoNxPoMyYjpU8JlwsZASajkCF0fANhQUZ0VjRjxgwcO3ZMMmjS6COje/RHmTJl0KBBA0cZetu2bTh06BB27NjhHtfgT/uge+dW2LV7PypVb8xk5CiLW38wTEbWt5HZGoYFGe3btw8zZ86UsF4DoGa0p/dDAIkKFSqEpk2bInFi+2dTOHPmDP7991/8/fff7nlVqkQRTBg9GIUi84vPmIzMfuTCs38mo/C0u5pRhwUZye4X0XgTugBaCqAO/btXr162T7y3cuVKbNy40cP2O/5ejrx5cnp8xmSk5vHgslohwGSkFZLObUeQUYkSJdCkSRNHjlKezwhAUwA/ugZaDMBOAAkyZ86Mnj172m78V69eFfmaaEUkl2WLJgsSypkjbkBYJiPbmdkRCjMZOcKMug5CkJFTvcooBNDkyZNBL20ARwHk80KT3JvFSslOjgwUZ+/gwYOg8cnluxGfolXz+M+/mIx0fZ64cT8IMBnx1AiEgCCjtGnTol27dsiQIUOg8rb6XuZNRuPsBeA7HwMQGNDZUYsWLSw7vl27duHo0aMe50GkbOXnn0PpUkUx6JP3FOnOZKQIJi6kMQJMRhoD6sDm6A0WEz0UEMFDiZhSpkxp+6FeunRJRFtwyQMAT/kZFH2XOG/evGjVqhWeespfMeMhkbbfxo4d69F5ypQpUCB/XmxYPVe1UkxGqiHjChogwGSkAYgOb6IagHXeY7TTlpU/+0yZMgUUdcAl8T0LkwG0o3KUeC937tymm9zX/SBJqVU/T0OFcqWD1pHJKGjouGIICDAZhQBemFQVZFSkcCRyZM+MNetivLESJEggsqHSy9mOLs90njJt2jTJhMsBvBaPPQsA2EOro4wZM6J3796Gm54iJFCkhOvXr+P27dtx+pdWQOSmHaqUq/IG9h8QJM2XXkMFk+srRoDJSDFUYVtQkFGxogWxad18/DBjARYuXonfN212A0KeZm+//TaSJ09uG5CmT5+OAwcOkL50l6g6gN8DKE9pYN+hMkasCtevX48bN25g//794v/eUqd2NdSoVhlFi0Si7LMlNMU9bVZ3e0xGmiLLjcWHAJMRz49ACHiQkVS4V9+B2L5jD7bvpAVDjOTMmRPPPvusOFOKjIwM1K5p3+/evVu4O7uElhmpFCojHBlom45WhFrI48ePxSVUEnI+2LmTPMnjyotVKghX7CYNX0OlCs9q0bXfNmRkxO8HXZHmxuUI8GTj+RAIAZ9kJK9UtWZT7Nl3EPfv0zl/rJCzQ/r06S23Yho9ejQoZ49L1DwDgwB8SG7uHTp0QLJkyQJh5/5efs9n7dq10qrMZ/306dIiT+4c4rtvhn6EMqXoupNxwmRkHNbcUywCah5Exi08EXA7MEwaM0T8Mvcn8xYuw9vd+vv8ul69eihbtqzpCFIstvnz50t69AEwQoVSgoyoPLl4k6u3P5FnjFXa/vVzvldFSutrVY7JSCskuR01CDAZqUErPMsqJiMJHmnrjlZM3pImTRqkSpUKpUqVQsWKFQ1HdMSIEdIFV+pbLRlROoX9AJJHRESIlRFdKr1z547icchdrXNkz4pMGSMU1zWqIJORUUhzP3IEmIx4PihBYAWAVwKtjHw19Nvvf+HY8VOgVdOmv2LORrylWLFi7q08WkHpKbIVyyUAmYLoy706ktetV6cGqlV9Pk5zbVo2CqILc6swGZmLf7j2zmQUrpZXN+6gyci7m19W/Io1v8a4h/84fymi7oosDX7FHzlRrLykSSnLgzLZsmULVq9ejaioKKlCKHNfODJkiEiPI3s8cwEp08a6pch1v1HzrlpgZN1BsmaWRCCUB9KSA2KldEFAMzLyp533lp7cS0+HEVHEV/fBURDtVwKwkZwMfls5BxER6YJowppVGjbrgrXrNzEZWdM8jtaKycjR5tVscLqTkVJNcxeshOvXbyot7q9cKQCxWeXUtybIiKqNHTkQzZu+ob4Fi9aQkREF4ZtlUTVZLQciwGTkQKPqMCTLkFGwY5Odg9ALVotop0sA1M2dKzv+27IyWLUsV4/JyHImCRuFmIzCxtQhDdTWZJQlb1ncjT2b0mrO1wIgWKh759YY/KmyiNghWcGAykxGBoDMXfhEQKsHk+F1NgK2JaMhw8fhy+HjJOtotSqS2hOODOSefWjXb46YAUxGjjCjLQfBZGRLsxmutCAj6tUqFzOVIEChdt75v0Einl509osLAIq7/q+kupIyhV0BVEWuoB5dWiupY9kyt27dRv2mnbH5H3GcxmdGlrWUMxVjMnKmXbUelS3JiNzGs+Z1R32gpHla5w13FBn9vnEzXm/UQZo7TEZaP0XcXrwIMBnxBFGKgNiSstPKSOa0QKpTEqKTSgerotwUAG2zZ8uCvdvWqKhmvaIyMqKlEXkcsjAChiHAZGQY1LbvyFZktHDxCrTr/H8S6N2jj3bG6GSBqgDEgVG7Vo3xzdCPdepG/2aZjPTHmHvwjwCTEc8OpQjYhoxu34lC05Y9pJxLFIOI4vR4hhRXOmpl5QQ2iRIlxJXT25XVsGApJiMLGiWMVGIyCiNjhzhU25DRmbPnUbh0DWm4n0X/49MQxx6oemYA56nQe706YEB/rY+mAnWvzfdTps/HO/0+p8Z4m04bSLkVFQgwGakAK8yL2oaMZGdFFIguhQF2cwQZyXBjMjJg0nAXnggwGfGMUIqALcho0JejMWzkRGlMZQBsUzrAEMsNc6WkwIn9m5A2beoQmzO+uoyMigDYa7wG3GM4I8BkFM7WVzd2W5DR2137Y96iZdLIjJzfFQD8jzp+6826GDeKMk3YSzh1hL3s5TRtjXxYnYZduI3H8mS0a/d+VKreWLILHdzQ3SIjRWBEYicXeElnJiMjpwr35Y0AkxHPCaUIiBftn+sXomjhAkrrGFpO9jK9D6AVpUwyVAEgEYCH1Gfblo0wctgAg7sPvruXXmmGrdt3Sw3weyF4KLlmkAjwpAsSuDCsJsjIypc7ZWR0CgClCDdamIyMRpz7cwwCTEaOMaXuA2kKYI5VychCSeE+ADCYrLHj7+XImyen7obRogPZyqi2FI1ci3a5DUZAKQJMRkqR4nIlAWy3Ihl5xVSbDMAdYM0Es1EYHUqVmqLhG7UxZfxXJqigvksmI/WYcQ1tEWAy0hZPJ7dmWTL68NPhGD1+OmF/GcBrAP422RBXAYhc5HZwZFjyyxq06uDOx8QrI5MnT7h2z2QUrpZXP27LkpFFL2uKM7Z6dWpg+vcj1KNtYA0ZGVE+d0oaKFzUWRgBIxFgMjISbXv3ZUkysrAXmB3J6FcA1e09TVl7uyLAZGRXyxmvt+XIaMMff6Np6564c4ei/gix0nzuBGA8KbV+5WyUKVXMeIsp7LFk+Vdx7Dg5IILJSCFmXEx7BKz08Go/Om5RSwQsR0YWP+ugxHu/A8hYp3Y1zJo6UktbaNqWbJuTyUhTZLkxNQgwGalBK7zLWo6MbPASJRdvcvXGvBmjUatGFUvOII68YEmzhJ1STEZhZ/KgB2wpMtqz7xCef7GBNJgJADoHPTJ9K4qzoyqVy2Hpgu/17SnI1pmMggSOq2mKAJORpnA6ujFLkZHsnINAt/I8bgRgPim5cM44vPxSJctNEiYjy5kkLBWy8kMclgax8KAFGSVJkgQTRw9Gg3qvmKbqz8vWon2X93H/PoWgEzHoZpimTOCOLU9G23fuwcJFK1t9O/4HK+MYGGkuYWsEmIxsbT5Dlc8AgHIzlB86uD86tW9maOfyzqbOWIDefQdKH5WLvui6xTRllHW8ORq7slTUspdgnzwqlzZbaavjqAxtLmVLBJiMbGk205SeCaC52WQk21ZaAMCdM8I0VAJ37I5XN33y16j32suBaxhUYuHiFWjX+f+k3vh9YBDu3E1cBHjy8axQg4DpZPTf7v2oHJuzaCgA95tUzUBMKCscGYoVLYhN68QRkiXERmdvlsCLldAPASYj/bB1Ysumk1HuyEq4foOi1gix0/ytBmAdKT1pzBA0aUgh9MwXGRnZYbvTfMBYA90QsNPDrBsI3LBiBJiMFEMVpyCTUfDYcc0wQIDJKAyMrOEQTSej2T8uQZdeH0tDOhod5YBe8sc0HKOeTa0AINwQreLIwCsjPc3NbatBgMlIDVpc1nQyIhN4edN9AeBDm5imJ4BRYqtu7BA0aWDuVp0NvRJtYmZWMxgEmIyCQS1861iCjAj+Zq17Yvmq3yRL2CmmmmXSt8vIiPIvVQawJ3ynNo/cbASYjMy2gL36twwZEWwyF2/60y5J4cTlYVLYbBd5GRnZxUXeXk8La6sKASYjVXCFfWFLkZFX1O6DACJtYCEmIxsYiVU0HgEmI+Mxt3OPliIjAtIrud4AAJ/bAGCBY/mypbB6qUiXborIVkZ2cwQxBS/uVF8EmIz0xddprVuOjLy26yhD3EsADlkceIEj6WimV52NHUEsbl5WLxgEmIyCQS1861iSjH7fuBmvN+ogWeUjAJRHyOoiHBmSJUuK88fMCwnnFYGBFKFYRTesDh7r5zwEmIycZ1M9R2RJMqIBN2zWBWvXb5LGbod5bQky8lpZ2gk/Pec5t20CAnZ4aE2Ahbv0g4Altpd86Xb46AmUeb6O9BVt1+WyuBVzAjhp9sqIMLp2/QZqvd4a+w4cliCLIn6PjtBOl3RZGAFDEGAyMgRmx3RC5zF0p8fUsw5/aA4eOgZDv6akr7gN4HUA662M/PVz/30LPOlhFR0//HQ4Ro/3cKiwUyBaq8DIegSJAJNRkMCFcTWxvWTmwbs/7Hft3o9KsRG959LdWKvb6fq5nQJPq8j472fh/z76Sq6OLXC0Cn6sR/AIMBkFj1241rQsGZFB3u7aH/MWUQ5AIZaf39fP7tyKBChtpcl0+MhxVH+1Ba5euy6pdQ/A0wDOWklP1sVZCFj+YXUW3I4YjaXJiBCWRWags48UVkb95Mk/k6dJkuqOFXX0inBhG4K3IpasU2AEmIwCY8QlPBFgMtJwRliZjGiYp06fQ9Fna8pHfAFAcQD0fxZGQDMEmIw0gzJsGrI8GZ05ex6FS9eQDPJZ9D8+tbB1JlR+/rlnF8+b8GySJEksqeajR4/wVtveWLl6g1w/utg12ZIKs1K2RIDJyJZmM1Vpy5MRodPvwyGYMHmOBBRt1dGWnRXF7cBgRacQOWB9+n+BSVPJn0HI3wCmAJhoRVBZJ/shwGRkP5uZrbEtyGjUmKkY8Pk3diCjrUCMA4PVyYh0XLRkJTp2/xAPHjyQsC1gg/BLZj8z3L8CBJiMFIDERTwQsAUZkcZeB/BWnevJoxdywoGhU/tmIq2EHcQL2+rS/TM76M46WhMBqz6g1kSLtSIEmIy0nQcJAYwD0DFjxgj89dtCZMqYQdsedGiN3L7J/ZvcwF0yA0ArHbriJsMEASajMDG0hsO0DRlF3b2HrHnLSkOnC7DuAw8N8dCiKXKw+IQa2rttDbJny6JFm7q3sWTZWrRq/668n7UA3J4juivAHTgKASYjR5nTkMHYhozoXOPl11pi+06RTfs7AD0NQSi4TmirjrbsbHF2JA1x7/5DqP9mZ5w95/b0vhS9ZVeFeDU4GLhWuCLAZBSulg9+3LYhIxrikOHj8OVw2gWzPBlRyPGKpOjOzSuQJ3eO4C1kQs2yL9TDgYOUo0/IDPy34QAAG7VJREFUFwA+NEEN7tLGCDAZ2dh4JqluVzIiuCiSN0X0tqoIbJs0eA2Txg6xqo5+9WrV4T1QKniXXAOQ3naDYIVNQ4DJyDTobdsxk5F+pqMo2X3Tp0uLdctnIn++PPr1pEPLx46fAiXrkwmtjmiVxMIIBESAySggRFzACwFbkRHpniVvWdy9S7E+Lb8yonQS35Kim9bNR7GiBW03+W7euo0mLbrjz7/+lXT/nuLX2m4grLDhCDAZGQ657TtkMtLXhCcBUOI9WzkyyCH5ceEv6NjtA/lHzwP4S1/YuHW7I8BkZHcLGq8/k5G+mC+PDrVTm7rY+r9fkP/p3Pr2plPr16/fRO6ClaTW6Q5SOwAPdeqOm3UAAkxGDjCiwUNgMtIfcIHxyy9VwsI5whPQljJwyLcYMYp26YTQ5SmO9G1LSxqjNJORMTg7qRcmI/2tSQf/g9KkToUl8yehTKmi+veoQw9096hImZp4/Pix1Dq/b3TA2SlN8uRwiiWNGweTkf5YNwcwk7pZuuB7VKlcTv8edexBFsduqmu7TsfeuGm7IsBkZFfLmac3k5Ex2G8HUJK6skM07/gg+W7cNHz02QipSBGOzmDMBLJbL0xGdrOY+fraioxkERgIOatfepVbl5IxNXUCGf244Bd07T0ADx8K/4VG0ZliF5o/jVkDqyHAZGQ1i1hfHyYj42wksKYzo/Ur3YkCjetdw56eKfYiLl66IrXI7x0NsXVKUzwpnGJJ48ZhVzKyeqBUXxbsTjH1nEBGu/YcQKVqtCgSQlkPPcJ9Gzd9uSerIsBkZFXLWFcv25CRzaJ2+7L4KwBW0BfTvx+BenXsnZ1B5sjwM4B61p3irJkZCDAZmYG6vfu0DRl55TOy48qIfLpXA8jetlVjjBz6sa1nzqy5i8XZEYAdAGoBOG/rAbHymiLAZKQpnGHRmF3JyK5zfR2AajSz7O5VJyMjGk5lCsEXFk8MD1IRAnZ9QBUNjgvpgoBtyEi2LURA2Hmu2wbzQDOu3AtvYP/BI0xGgYAKw+/t/ICGobksMWTbvBidRkZ58+TEjr8pdJ19hcnIvrbTW3MmI70Rdl77tiCjhYtXoF3n/5PQTwEgysamGAzgg9SpUmLezNGoWOFZ2w5FRkZ2X63a1gZWVZzJyKqWsa5etiCjfh8OwYTJ4m4OJdahFAYPrAtpQM3KAthMpUYOG4C2Ld0u0gErWq3AF8PG4qsR4yW1+P1jNQOZqA9PBhPBt2HXFC+N4qZZ+jD9zNnzKFza7Qb9WbS+n9oQa2+V51P0gvd6dcCA/j1tPRzZ9im/f2xtSW2V58mgLZ5Ob43JyDwLCzKy+g8BJfAwGSlBKfzKMBmFn81DGbEgo6GD+6NT+2ahtKNrXdnLjs6J6LzICZIPwGEaSOWKz2HZoim2HROTkW1Np6viTEa6wuu4xi1PRjNmL0L3d927cu0B2PetHXf6iPO6tGlS48QB+17RYTJy3HtBkwExGWkCY9g0YmkyunL1Oho374p/tv4nGcRp81usjpInT4bVS6ejRLFCtpx4TEa2NJvuSjvtYdUdsDDvwNJktGv3flSq3lgyEZ3yUwggJ4l7q46cGMiZwY4iIyNa3lEkBhZGwNa30tl8xiNgaTKSveROuXIXGY+Q/j2SX3QnJiP9geYejEWAV0bG4m333ixLRn0/GIKJU9w5fxxPRjSRrpzehkSJEtluTi1f9RuatRbu6bwysp319FOYyUg/bJ3YsmXJqGGzLli73n2o7/R5LRwZWjdviG9HfGK7ecZkZDuTGaKw0x9aQ0AMo04sSUa/b9yM1xu5z09aAJjlcJsIMiKxYyTvPv2/wKSpc3ll5PBJqnZ4TEZqEQvv8pYkI697RQ2lhHQONlU6AFdpfHu3rUH2bFlsNVR2YLCVuQxTlsnIMKht31FJANtpFFa79Cp7uVHStlK2RzrwANxk1KNLawz65L3ANSxUgl27LWQMC6nCZGQhY1hcFUFGmTJG4K/fFiFjxghLqPvSK82wdftuSZdwms8iknfmTBmw+Y/FSJ8urSXsoUQJJiMlKIVfmXB6eMPPutqOWJARbQnR1pAVZMkva9Cqg3tVUBvASivoZZAOgoyor0O7fgP9SLCLMBnZxVLG6slkZCzedu7NcmQke6mdAVATgHuJZGegVej+EECiQZ++hx6dW6uoZm5RJiNz8bdq70xGVrWM9fSyFBmVLP8qjh2n60RCJgDobD3IdNdIkBH1YievOiYj3eeFLTtgMrKl2UxR2jJkNHXGAvTuO1AOQjjPY+Hm3bzpGxg70gMTUyaJkk6ZjJSgFH5lwvkhDj9rhzZiy5BRsedq4eSps9JoygHYEtrQbF2bycjW5mPlJQSYjHguKEVgAYCGZjswvP/xUIybRNedhJBO7sioSgfisHJ9AAx7Jn9eLP9pCrJkzmj54fHKyPImMkVBJiNTYLdlp+IXuJlktHPXPtR8vRWiou7yj6nYKUT51ZcASE4u3gULUGBv68pPP69Gm47En0L4/WNdUxmuGU8GwyG3bYeCjMw6KH/y5AkoGKorjAypkh/AEduiqa3i5wFkNtM+SodT7oU3sP+gMNt+APZMyKR0sFxOFQJMRqrgCuvCppLRo0ePEJGjtGSAcPWe8zcB7UhGlMfIvulqw/pVoM/gmYz0wdWJrZpKRrJzBsI2D4ATTgQ5hDEJ+3Tr1BJffNY3hGb0rSpbGTEZ6Qu17VpnMvr/9s4FTKdqjeN/Q0zPqahcijg56QjTmJI4KkzuRIrJkGspoVxyeZIijigRI0YpuV8alMroglBUdDkq1SHnHDl1Shcnpwul0fne7du7PTOf+fb3fXvt2/dfz9PzVLP2+77r9+7Z/9lrr/Uu36XMtYBdE6N7JkzHI3MX6QMfBiDHNQredbxQTpVo16Y5Vi6a5dkoKUaeTY3rgVGMXE+BLwKQUjvr3fgm8fU3h1ArrbkOSQq1XgHgJ19QczbIfgCeFJcvPbcIjS83pjSdjSKKN4qRp9LhqWAoRp5Kh2eDeQFAWzfEyDQ9J29mdwCY41lK7gbWEUAegFSvitGylWsxaNg4nRKn6dy9XzznnWLkuZR4MiBNjB6fMwU3dOngWIDy4JIHWLgVACjjmHN/OvoIQB03/miwgsskRs8BuNbKNeyTPAQoRsmT60RG6rgYfXrgczRv2x2HDn2nx817NXoGKUbRGbGHRwnwF9yjifFYWI6LkWyMlA2S4SbLw6Z5jIlXw9EWmky4dziGDZbPSN5pfDPyTi68GAnFyItZ8VZMVwPYJCE5NU23acvruD7bKML9FQB/navtbv7kTKc2jRtm4KXnF7sbSRHvpu9/nKbzVGa8EQzFyBt58HIUmhidmpqKJU8+jFZXy3dnde3NnX9Dm07G2Tz7AdRU5y2QljuFywNhxaJZaN/GWIno+mBNYjQDwJ2uB8QAPEWAYuSpdHgyGE2M0urVxvZNq5QHWGRz602hDa4LlDsNlgM/iBGfO8G652wZDW8KWzAG2ohjYjR4+HgsXfGMDvPj0FLluoEmq25w22Q/Vs3zq2PXm/nqvMRomdW6YwSWZN0pRkmW8DiGuy50XlAH1W9Guz/cg+uyb8NXX3+rh8h7M45khS/RxEj+3a3CtkVDl43LsoE53Jjb+HMb2Ct5UwQ2tbYNTFudpVqMRo6ZbK7ILXtQ5CM3W/wEtLwtnDcN13VqHb8Vm640iZHM9d5gk1maCRABilGAkqlgKFLiX6bLlP6FbSoRI66kkrPaVRIKQHnQpCZGcr6RnHPkdjOJkUy9avcUGwmYCVCMeD+cjEBXANqKhTUr5qJlpjbrY3srUiJG7POetIeyJGybF8RIitxKsdtwoxjZk9/AWeEvfuBSasuA5ORQWZWlNQfFiPXKbEmfZkQTo9Ry5bBw3kOQat5uNYqRW+T95Zdi5K98qY52JoChZid5S2ajTaumyvyaVli9J5s1AchBcWyJE5CNwi8BqJ87cyJuzO6cuMU4LZjESJbpy3J9NhIoRoBixJtCCNwKQI6JMJ5YfXt2xYih/VGjelVlhIqssLqdFbltR6294fbo1glzcybZbtyqQdMfHBQjq9CSsB/FKAmTbhpyy9B0zgYzgoz0utrO/arnVlZKhlM3SvHqxo3pVjeXeJvE6D4pm+fIyOnEdwQoRr5LmS0ByzEDUuG5UDuwZzvKlz/dFgfRjBSptMCP2tGAxf9z107o1UPmZtf4k5dMV1KMkinbQH0A8wE0MA9768tPISNdOwbHkZbZtgfe3bVb98WpG7XUNTHKbNoYa/PmqfUUwfpZ1TJQUHBc/wmfN45nwD8OeXP4J1eJRPpYeHXcOboR+Y7Q7MpGyM6SA0Kda+teeAU9bxqO337TnpHSZJnXVuciSDpPGuhKFc/Cvt1bHB+8SYxkQYVUYGcjgYgEKEbBvTF6AWgBwCiBLUNt0bwJLmuQjrtHDXJl5BOnzML0nCd033xAqc+CNiXrhhgx1+qTGyQPFKPgZLM0gIzwcN42D6v8GadDimZufXmlq6M9fPh71KhtbJ6Vw/Lk0Dw2tQSM74OTxo/AHQML/W2izHNBQQGGjJyApSu06g/MtTLSwTFMMQpGLh8FMCDSUKQUjOzC90KjGLmWhScB9HNSjJhr13LtW8cUI9+mDvL2IypzZtEhyBtQWt0/o0yZMp4aXZEVdLz3nMuOJkbizqkl3le2yMIHH+7RR1gdwGfODZee/EiADwT/ZE0WIUiTDaqFWrcuHdCkcQNcekka0tOktqn32lNr1uHWwXfrgYlKFngvysBG1Cy0UERbvXBT7yzMmHqv8oHyDw/liAPngGLkzZTKw1ovm6KLUKFIpUKCtJxp47w5giJRDRs1EQuWrJb/+xaAxgCM9b6+GID/g1wMoFfp0ik49Pku5aMZOPQeLH/KOAWEzxnlxP3vgDeJN3J4avhUUyl7sD5SSFIZQZrbixDiwbX/089Qv1F7/dKxACbHY4fXJERAW+LtlBgV+WbE50xCqUuOi3mTuJtn7UjvkkJwao5fJQaKkUq6lmwb34woRpZ4sZMLBChGzkK/HoB8OClUAUEPQfaCrF6ei5RSKUi/2JvffuLBZfp+8F2kBRfx2OQ1lgnUDE+Nni1XOPXHDd+MLOeHHcMEKEbO3ApSEVs2XJQ1u8t56MT3nr69Tnz/CWoziVFfAIuCOk6PjisPQJbExqXdHs0Qw9IIUIzU3wiy/0f2AWmtS+d2uKrJZejXW3s+BL717j8Cz64zCoPzfnMu48Z5RuLy9tv64P77Rjjm/ciRo2jdsTfe3/138clNr46R968jPhzU584owubUFIn6IVnz8NNPR5DdZwi2vrZDLjgA4I/WrmQvGwgY952cSfXBWy/aYDI2E6ZyQBSj2NAlZW+Kkfq0aw8FJ49nUD8kax6kMrdU6A632wBEXKZuzRp7xUBgW/jYca36hlThcKOxNp0b1P3rk2KkPneaGF1crza2bVql3puHPDS86lrs/eRfEtHn4bp533govKCGsg/ABTK4yRNGYfAAqZfrTvviy69Q99LWOH5c21LGorjupME3XilG6lMV9zTdyDGTcezYr8h7Oh8y5bV90yqk1autPmKbPJgWLvxTf0DaZJpmihNoAiAfQAX5kZzW276NnM7hbjMdIbEEQG93o6F3LxOgGKnPjlTT/lXc9OvVFTPDK+giuV14okIBho6aWOjHWde3xxO5D6iP1EYPHbv2x6vbduoWeZ/ZyLaIqfRwRQttCrT6eefi+dVPaFXavdB4uJ4XsuCPGPiQUJ+nlPDH+2qdOrTE/LkPoGzZQiu8tQhuGTRGewPS2zlVKkH+8WPFhY2bt6NL94H6UPhWpO4euxTAO7r5i2pfgB1bn1HnLU7Lpjdk2fO0P04zvCzgBChGziRYNrreL67e27Ee5//xvGJezWLk91V3RYpkyhr2E698bHYSkPvJqDx7Y3Zn5M4s/EZtp7NEbJnuBx4xnwjIgF9LMXImwXLc914Ap9e9qBbe2PL0ScVo6v1jMODm7s5EpcDLFS2ysPv3owOkKOrlCtwks0kRIBF4/SBFrM2bh8ymUnvWm23MuKnInbdUgqMYeTNFnoiKYuRcGv6rf1yeOfXeYpte9TcjP4tRke9EDwNwbpelc3l009MKANnmADbmL0XDBvLZyLvtkbmLcM+E6RKgHHCUGToI8gvvRsvI3CJAMXKWvLayLiO9DtaseBQVz/79XDw/T9N9vGcf2nbqi+8O/0+n+W8ArUMPTm37PVvCBApNyZUtewqWL8hBqxZXJmzYCQMmMRJ3Un7+Yyf80oe/CFCMnM2XURrosUfuR3ZWR8P7pAdm46GZ87T/9ss3oy8Pfo30y9vh559/MVP8CEA9Z7EG1psU1J0bWrLdUEYoC19kmtePi1pqpTXH198ckmFIIcY1gc0YBxY3AYpR3OjivvAf4ePCNQNrVsxFy8wrtH/XP/SmppbDwf3yucWbbfTYKXhsvswYFWvLAPT0ZtS+i0pOwKtvjtovf6REIm0SI/kxnzu+ux3VB8ybQj3jSB5GA3jwZK5TUkohPa1OiZHtel9eQOxrVSpXxLnnyNl+kduRo0exZ6+s0o7YLgvVgP0gtLqr0CuSfdEllSU5XFGqvBtN3oRkBWaF8mf4FsTuj/biiquN6vR87vg2k+oC502hjm00y9cBqGTqJMeMN4p2UYSfy9Rfoi2WmnGyEOOusEPZ42Lsc0k0iCS/fjaAwWYGcsRIm1ZNS/wjwU/MTEu8+dzxU+IcipU3hUOg6YYETkJABEiEyGh9e3bF6DsHoFpVKecWnEYxCk4uVYyEYqSCKm2SQMkEpBKBHOUrU3JGy0ivi9XL56BSRe1Q1sA1ilHgUmrrgChGtuKkMRKISsAonKv3vGvkQIwZaZRPimrArx0oRn7NnDNxU4yc4UwvJPA2gAsBGKsQhg7uh66d2yH9YnlJCnbjarpg59eO0VGM7KBIGyQQmYBsVpVySC31H8t3oNHDB6BvL2NlWeDZvbL1DXTvMwRHj/4sYx0PwJtF9AKfCW8PkGLk7fwwOn8RkN+nW8IhF1qhKMvm27Rsipxp4/w1IhuiNU3PsRyQDTyDaoJiFNTMclxOEpBKCUMBFDpWVaolSNUEqbYhxzskWyty0qsM/77QhtcJycaB47VGgGJkjRN7kUAkAsUWI+id/FwtwY5UHz78PWrUPlFZJNx47LgdYANsg2IU4ORyaEoIzAcgT9li579LpYRolSyUROQxo9NzHsfEKY+Yo5Ijx2VTt3biMRsJRCJAMeJ9QQLRCTQB0AfArYX+1K9cEXePGpRUixFKQrVg8Sq89vrbWLP2BXO32wDEUuEjejbYI5AEKEaBTCsHZRMBOShomxyKaLYnFRJu6dcNafWKvRzZ5NZ/ZiZOmYXpOU+YA5cS9GtDJa4KKZP/RsaInSJAMXKKNP34iUC10LTSgdAS5BQ9aFmA0KJ5E0yeMMpP41AaqxTOvbxp56I+ZP12DwDFjzNWGg2N+50AxcjvGWT8KggUOszuxuzOyJ2Z2NYYWd5sPi5ERdBO2sxbk49bBo+J5JLPFCcTESBfvHEClEwOxRYCFULLtKUyObp1vUYToTJlysRs+Ln8jdq0lfmoj6CIUdceg7DhFZm9LNTkGBE5Y0Rjx0YCsRKgGMVKjP2DTsBYrh3r8uzjx49j+OhJWJ73LH755ZjGSY6Y79crKzCLHFp37I0db8m5f0Zrz+9CQf+VcGZ8FCNnONOLfwjELEYLl6zGs+s2QMreSOvRrROaN22Mbl2uiXvUz+ZvxLUdjCpCcdux60J5w2vZoSeOHTNWZ+8DkAngM7t80E5yE6AYJXf+OfriBCyLkQhQ7/4jNAtVz62Cc6pUwuYXlyfE9MOPP8H6lzZj1dPrsfNVWYxmrYlYSCzXtLva9kUW8iYkb0SmJqf6ykpDNhKwjQDFyDaUNBQQAsY3ozsG9sGk8SfEJlLTa65VqngW9u3ekvDwH5u/AqPHTsEN13fA47lTLNvTK2LvfG0tal/4J8vXWeko8Uhcpia7WYdYuZZ9SCAWAhSjWGixbzIQMMSocqWzIQ/4MyuUL1GMYv22FMmY/i1m9bJctGpxpSXOmW174N1du7E2bx4uqFkDNapXtXSd1U5NMrtA3tRMTSpPvG71evYjgVgIUIxiocW+yUKgIYA39X1Gssn17tGDtFI/5qa/GSUiRseOHUPLDr20VXcvP78YjRpmRGU8cOg9WP7Uc1q/jflL0bCBvTNmvW6+E7Ia0NRkNcZfALwTNTh2IIE4CVCM4gTHywJP4FEAA8yjzHloHNq3zYS8MUnTxUiqcmdndYwZiP4tRo4b35i/BKecckqJNr7/4Ufc0PN2vP7mO7g0Iw2b1i9FSoqxLzdm/0UvGHvfNMx+dLH5f/8YEiAZ2OaEjdMACUQhQDHiLUICJRPYYD4cT7pKGaA5MyagWets7cp4vhn954uDqHNJK6SklMLDD96LfhYO29v/6Weo36g9SpcujVnTxqNn92LVD+LKZc6cBRj31xnma48A+AiA7B1iIwFHCFCMHMFMJwEgIA/nOpHGkYgYpaaWw8H9b1nCo4tR+TNOx4G92y1dU1KnBUtWY9ioiJUl+FxImC4NxEqAN12sxNg/mQnISoZaAN6OBEGm26TlPz0fp532hxI56W9GTouRbMyVhQ8ffLgHBQUF5hhl7faO0DapvcmcYI7dPQIUI/fY07P/CehHSpz0iITza1RD86by7f9E048d18VIptyWLZiJdq2bRaWhvxlJx3FjhmDE0P5Rrzn41TeYPDUXR48excrV6yL1Hwtgp6yFiGqMHUhAIQGKkUK4NJ10BMyiJFN6V1kh0LZ1M7RrFV2Mvj30HeSoBmmyuXXpkzNQqtSJX+FlK9di0LBxVtzJpt7HAQwH8JOVC9iHBJwgQDFygjJ9kEDkqb3qAConAEcquOpzbbLqLQ9AatjeDwD2mGxLAdNWCfjipSSglADFSCleGicBEiABErBCgGJkhRL7kAAJkAAJKCVAMVKKl8ZJgARIgASsEKAYWaHEPiRAAiRAAkoJUIyU4qVxEiABEiABKwQoRlYosQ8JkAAJkIBSAhQjpXhpnARIgARIwAoBipEVSuxDAiRAAiSglADFSCleGicBEiABErBCgGJkhRL7kAAJkAAJKCVAMVKKl8ZJgARIgASsEKAYWaHEPiRAAiRAAkoJUIyU4qVxEiABEiABKwQoRlYosQ8JkAAJkIBSAhQjpXhpnARIgARIwAoBipEVSuxDAiRAAiSglADFSCleGicBEiABErBCgGJkhRL7kAAJkAAJKCVAMVKKl8ZJgARIgASsEKAYWaHEPiRAAiRAAkoJUIyU4qVxEiABEiABKwQoRlYosQ8JkAAJkIBSAhQjpXhpnARIgARIwAoBipEVSuxDAiRAAiSglADFSCleGicBEiABErBCgGJkhRL7kAAJkAAJKCVAMVKKl8ZJgARIgASsEPg/LwC+Gq4/exUAAAAASUVORK5CYII=")
-        db.session.add(new_user)
+        hashed_password = password_hasher.hash(form.password.data)
         try:
-            commit_with_retry(db.session)
-
-            default_items = ["H02BLACK-F", "H03BLACK-F", "H01BLACK-F", "H04BLACK-M", "H02BLACK-M", "H01BLACK-M", "U05PURPLE-F", "U02GREEN-F", "U01BLUE-F", "U04PURPLE-M", "U02GREEN-M", "U01BLUE-M", "L03GREY-F", "L02GREEN-F", "L01BLUE-F", "L03GREY-M", "L02GREY-M", "L01BLUE-M"]
-            for item_id in default_items:
-                item = Item.query.filter_by(id=item_id).first()
-                if item:
-                    inventory = Inventory(user_id=new_user.id, item_id=item.id)
-                    db.session.add(inventory)
-            
-            commit_with_retry(db.session)
-
+            provision_user(form.username.data, hashed_password)
             return redirect(url_for('login'))
+        except IntegrityError:
+            # Someone registered the same username at the same moment
+            db.session.rollback()
+            return render_template('register.html', form=form, error_message="That username already exists. Please choose a different one.")
+        except OperationalError:
+            raise
         except Exception as e:
             db.session.rollback()
             return str(e), 500
@@ -540,6 +1647,7 @@ def register():
 
 @app.route('/gifting', methods=['GET', 'POST'])
 @login_required
+@retry_on_database_lock
 def gifting():
     form = GiftingForm()
     if form.validate_on_submit():
@@ -566,306 +1674,641 @@ def gifting():
         if last_gift_time and datetime.utcnow() - last_gift_time < timedelta(hours=6):
             return jsonify({'status': 'error', 'message': 'You can only gift once every 6 hours.'})
 
-        current_user.currency_balance -= gifted_money
-        user.currency_balance += gifted_money
-        current_user.last_gift_time = datetime.utcnow()
+        if change_balance(current_user.id, -gifted_money, required_balance=gifted_money, values={'last_gift_time': datetime.utcnow()}) is None:
+            db.session.rollback()
+            return jsonify({'status': 'error', 'message': 'You do not have enough balance to gift that amount.'})
+        change_balance(user.id, gifted_money)
         db.session.commit()
         
         return jsonify({'status': 'success', 'message': f'You have successfully gifted {gifted_money} Lamocoins to {user.username}.'})
     
     return render_template('gifting.html', form=form)
 
-def commit_with_retry(session, retries=5, delay=1):
-    for attempt in range(retries):
-        try:
-            session.commit()
-            return
-        except OperationalError as e:
-            if "database is locked" in str(e):
-                time.sleep(delay)
-            else:
-                raise
-    raise Exception("Could not commit after several retries due to database being locked")
-
-def add_items_data():
-    items_data = [
-
-        {"id": "H01BLACK-M", "base_id": "H01-M", "gender": "Male", "price": 20, "colour": "#353535", "filter_colour": "grayscale(50%) brightness(40%) saturate(400%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair4.png", "image_url": 'assets/customization_assets/hair/m-hair4.png'},
-        {"id": "H01BROWN-M", "base_id": "H01-M", "gender": "Male", "price": 30, "colour": "#7F654A", "filter_colour": "sepia(95%) hue-rotate(350deg) brightness(0.7) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair4.png", "image_url": 'assets/customization_assets/hair/m-hair4.png'},
-        {"id": "H01BLONDE-M", "base_id": "H01-M", "gender": "Male", "price": 50, "colour": "#E8CEA1", "filter_colour": "sepia(100%) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair4.png", "image_url": 'assets/customization_assets/hair/m-hair4.png'},
-        
-        {"id": "H02BLACK-M", "base_id": "H02-M", "gender": "Male", "price": 100, "colour": "#353535", "filter_colour": "grayscale(50%) brightness(40%) saturate(400%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair2.png", "image_url": 'assets/customization_assets/hair/m-hair2.png'},
-        {"id": "H02BROWN-M", "base_id": "H02-M", "gender": "Male", "price": 110, "colour": "#7F654A", "filter_colour": "sepia(95%) hue-rotate(350deg) brightness(0.7) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair2.png", "image_url": 'assets/customization_assets/hair/m-hair2.png'},
-        {"id": "H02BLONDE-M", "base_id": "H02-M", "gender": "Male", "price": 130, "colour": "#E8CEA1", "filter_colour": "sepia(100%) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair2.png", "image_url": 'assets/customization_assets/hair/m-hair2.png'},
-
-        {"id": "H03BLACK-M", "base_id": "H03-M", "gender": "Male", "price": 150, "colour": "#353535", "filter_colour": "grayscale(50%) brightness(40%) saturate(400%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair3.png", "image_url": 'assets/customization_assets/hair/m-hair3.png'},
-        {"id": "H03BROWN-M", "base_id": "H03-M", "gender": "Male", "price": 160, "colour": "#7F654A", "filter_colour": "sepia(95%) hue-rotate(350deg) brightness(0.7) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair3.png", "image_url": 'assets/customization_assets/hair/m-hair3.png'},
-        {"id": "H03BLONDE-M", "base_id": "H03-M", "gender": "Male", "price": 180, "colour": "#E8CEA1", "filter_colour": "sepia(100%) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair3.png", "image_url": 'assets/customization_assets/hair/m-hair3.png'},
-
-        {"id": "H04BLACK-M", "base_id": "H04-M", "gender": "Male", "price": 200, "colour": "#353535", "filter_colour": "grayscale(50%) brightness(40%) saturate(400%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair1.png", "image_url": 'assets/customization_assets/hair/m-hair1.png'},
-        {"id": "H04BROWN-M", "base_id": "H04-M", "gender": "Male", "price": 210, "colour": "#7F654A", "filter_colour": "sepia(95%) hue-rotate(350deg) brightness(0.7) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair1.png", "image_url": 'assets/customization_assets/hair/m-hair1.png'},
-        {"id": "H04BLONDE-M", "base_id": "H04-M", "gender": "Male", "price": 230, "colour": "#E8CEA1", "filter_colour": "sepia(100%) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/m-hair1.png", "image_url": 'assets/customization_assets/hair/m-hair1.png'},
-
-        {"id": "H01BLACK-F", "base_id": "H01-F", "gender": "Female", "price": 20, "colour": "#353535", "filter_colour": "grayscale(50%) brightness(40%) saturate(400%)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair4.png", "image_url": 'assets/customization_assets/hair/f-hair4.png'},
-        {"id": "H01BROWN-F", "base_id": "H01-F", "gender": "Female", "price": 30, "colour": "#7F654A", "filter_colour": "sepia(95%) hue-rotate(350deg) brightness(0.7) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair4.png", "image_url": 'assets/customization_assets/hair/f-hair4.png'},
-        {"id": "H01BLONDE-F", "base_id": "H01-F", "gender": "Female", "price": 50, "colour": "#E8CEA1", "filter_colour": "sepia(100%) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair4.png", "image_url": 'assets/customization_assets/hair/f-hair4.png'},
-
-        {"id": "H02BLACK-F", "base_id": "H02-F", "gender": "Female", "price": 100, "colour": "#353535", "filter_colour": "grayscale(50%) brightness(40%) saturate(400%)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair1.png", "image_url": 'assets/customization_assets/hair/f-hair1.png'},
-        {"id": "H02BROWN-F", "base_id": "H02-F", "gender": "Female", "price": 110, "colour": "#7F654A", "filter_colour": "sepia(95%) hue-rotate(350deg) brightness(0.7) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair1.png", "image_url": 'assets/customization_assets/hair/f-hair1.png'},
-        {"id": "H02BLONDE-F", "base_id": "H02-F", "gender": "Female", "price": 130, "colour": "#E8CEA1", "filter_colour": "sepia(100%) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair1.png", "image_url": 'assets/customization_assets/hair/f-hair1.png'},
-        
-        {"id": "H03BLACK-F", "base_id": "H03-F", "gender": "Female", "price": 150, "colour": "#353535", "filter_colour": "grayscale(50%) brightness(40%) saturate(400%)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair3.png", "image_url": 'assets/customization_assets/hair/f-hair3.png'},
-        {"id": "H03BROWN-F", "base_id": "H03-F", "gender": "Female", "price": 160, "colour": "#7F654A", "filter_colour": "sepia(95%) hue-rotate(350deg) brightness(0.7) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair3.png", "image_url": 'assets/customization_assets/hair/f-hair3.png'},
-        {"id": "H03BLONDE-F", "base_id": "H03-F", "gender": "Female", "price": 180, "colour": "#E8CEA1", "filter_colour": "sepia(100%) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair3.png", "image_url": 'assets/customization_assets/hair/f-hair3.png'},
-
-        {"id": "H04GREY-F", "base_id": "H04-F", "gender": "Female", "price": 50, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair6.png", "image_url": 'assets/customization_assets/hair/f-hair6.png'},
-        {"id": "H04GREEN-F", "base_id": "H04-F", "gender": "Female", "price": 100, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair6.png", "image_url": 'assets/customization_assets/hair/f-hair6.png'},
-        {"id": "H04BLUE-F", "base_id": "H04-F", "gender": "Female", "price": 150, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair6.png", "image_url": 'assets/customization_assets/hair/f-hair6.png'},
-        {"id": "H04PURPLE-F", "base_id": "H04-F", "gender": "Female", "price": 200, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair6.png", "image_url": 'assets/customization_assets/hair/f-hair6.png'},
-
-        {"id": "H05GREY-F", "base_id": "H05-F", "gender": "Female", "price": 200, "colour": "#545454", "filter_colour": "grayscale(100%)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair5.png", "image_url": 'assets/customization_assets/hair/f-hair5.png'},
-        {"id": "H05PINK-F", "base_id": "H05-F", "gender": "Female", "price": 250, "colour": "#E4A7BA", "filter_colour": "sepia(95%) hue-rotate(300deg) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair5.png", "image_url": 'assets/customization_assets/hair/f-hair5.png'},
-        {"id": "H05PURPLE-F", "base_id": "H05-F", "gender": "Female", "price": 300, "colour": "#3F5494", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair5.png", "image_url": 'assets/customization_assets/hair/f-hair5.png'},
-
-        {"id": "H06GREEN-F", "base_id": "H06-F", "gender": "Female", "price": 300, "colour": "#86CA66", "filter_colour": "hue-rotate(300deg)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair2.png", "image_url": 'assets/customization_assets/hair/f-hair2.png'},
-        {"id": "H06PINK-F", "base_id": "H06-F", "gender": "Female", "price": 350, "colour": "#FF9BA3", "filter_colour": "hue-rotate(190deg)", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair2.png", "image_url": 'assets/customization_assets/hair/f-hair2.png'},
-        {"id": "H06BLUE-F", "base_id": "H06-F", "gender": "Female", "price": 400, "colour": "#59CFB5", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/hair/f-hair2.png", "image_url": 'assets/customization_assets/hair/f-hair2.png'},
-
-        {"id": "U01GREEN-M", "base_id": "U01-M", "gender": "Male", "price": 80, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt6.png", "image_url": 'assets/customization_assets/shirt/m-shirt6.png'},
-        {"id": "U01BLUE-M", "base_id": "U01-M", "gender": "Male", "price": 100, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt6.png", "image_url": 'assets/customization_assets/shirt/m-shirt6.png'},
-        {"id": "U01PURPLE-M", "base_id": "U01-M", "gender": "Male", "price": 150, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt6.png", "image_url": 'assets/customization_assets/shirt/m-shirt6.png'},
-
-        {"id": "U02GREEN-M", "base_id": "U02-M", "gender": "Male", "price": 90, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt4.png", "image_url": 'assets/customization_assets/shirt/m-shirt4.png'},
-        {"id": "U02BLUE-M", "base_id": "U02-M", "gender": "Male", "price": 110, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt4.png", "image_url": 'assets/customization_assets/shirt/m-shirt4.png'},
-        {"id": "U02PURPLE-M", "base_id": "U02-M", "gender": "Male", "price": 160, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt4.png", "image_url": 'assets/customization_assets/shirt/m-shirt4.png'},
-
-        {"id": "U03GREEN-M", "base_id": "U03-M", "gender": "Male", "price": 150, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt5.png", "image_url": 'assets/customization_assets/shirt/m-shirt5.png'},
-        {"id": "U03BLUE-M", "base_id": "U03-M", "gender": "Male", "price": 170, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt5.png", "image_url": 'assets/customization_assets/shirt/m-shirt5.png'},
-        {"id": "U03PURPLE-M", "base_id": "U03-M", "gender": "Male", "price": 220, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt5.png", "image_url": 'assets/customization_assets/shirt/m-shirt5.png'},
-
-        {"id": "U04GREEN-M", "base_id": "U04-M", "gender": "Male", "price": 200, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt1.png", "image_url": 'assets/customization_assets/shirt/m-shirt1.png'},
-        {"id": "U04BLUE-M", "base_id": "U04-M", "gender": "Male", "price": 220, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt1.png", "image_url": 'assets/customization_assets/shirt/m-shirt1.png'},
-        {"id": "U04PURPLE-M", "base_id": "U04-M", "gender": "Male", "price": 270, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt1.png", "image_url": 'assets/customization_assets/shirt/m-shirt1.png'},
-
-        {"id": "U05GREEN-M", "base_id": "U05-M", "gender": "Male", "price": 250, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt3.png", "image_url": 'assets/customization_assets/shirt/m-shirt3.png'},
-        {"id": "U05BLUE-M", "base_id": "U05-M", "gender": "Male", "price": 270, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt3.png", "image_url": 'assets/customization_assets/shirt/m-shirt3.png'},
-        {"id": "U05PURPLE-M", "base_id": "U05-M", "gender": "Male", "price": 320, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt3.png", "image_url": 'assets/customization_assets/shirt/m-shirt3.png'},
-
-        {"id": "U06BLUE-M", "base_id": "U06-M", "gender": "Male", "price": 450, "colour": "#3D5591", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt2.png", "image_url": 'assets/customization_assets/shirt/m-shirt2.png'},
-        {"id": "U06BROWN-M", "base_id": "U06-M", "gender": "Male", "price": 500, "colour": "#605714", "filter_colour": "hue-rotate(190deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt2.png", "image_url": 'assets/customization_assets/shirt/m-shirt2.png'},
-        {"id": "U06GREEN-M", "base_id": "U06-M", "gender": "Male", "price": 600, "colour": "#14665F", "filter_colour": "hue-rotate(300deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/m-shirt2.png", "image_url": 'assets/customization_assets/shirt/m-shirt2.png'},
-
-        {"id": "U01GREEN-F", "base_id": "U01-F", "gender": "Female", "price": 80, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt7.png", "image_url": 'assets/customization_assets/shirt/f-shirt7.png'},
-        {"id": "U01BLUE-F", "base_id": "U01-F", "gender": "Female", "price": 100, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt7.png", "image_url": 'assets/customization_assets/shirt/f-shirt7.png'},
-        {"id": "U01PURPLE-F", "base_id": "U01-F", "gender": "Female", "price": 150, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt7.png", "image_url": 'assets/customization_assets/shirt/f-shirt7.png'},
-
-        {"id": "U02GREEN-F", "base_id": "U02-F", "gender": "Female", "price": 90, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt4.png", "image_url": 'assets/customization_assets/shirt/f-shirt4.png'},
-        {"id": "U02BLUE-F", "base_id": "U02-F", "gender": "Female", "price": 110, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt4.png", "image_url": 'assets/customization_assets/shirt/f-shirt4.png'},
-        {"id": "U02PURPLE-F", "base_id": "U02-F", "gender": "Female", "price": 160, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt4.png", "image_url": 'assets/customization_assets/shirt/f-shirt4.png'},
-
-        {"id": "U03GREEN-F", "base_id": "U03-F", "gender": "Female", "price": 100, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt5.png", "image_url": 'assets/customization_assets/shirt/f-shirt5.png'},
-        {"id": "U03BLUE-F", "base_id": "U03-F", "gender": "Female", "price": 120, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt5.png", "image_url": 'assets/customization_assets/shirt/f-shirt5.png'},
-        {"id": "U03PURPLE-F", "base_id": "U03-F", "gender": "Female", "price": 170, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt5.png", "image_url": 'assets/customization_assets/shirt/f-shirt5.png'},
-
-        {"id": "U04GREEN-F", "base_id": "U04-F", "gender": "Female", "price": 150, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt1.png", "image_url": 'assets/customization_assets/shirt/f-shirt1.png'},
-        {"id": "U04BLUE-F", "base_id": "U04-F", "gender": "Female", "price": 170, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt1.png", "image_url": 'assets/customization_assets/shirt/f-shirt1.png'},
-        {"id": "U04PURPLE-F", "base_id": "U04-F", "gender": "Female", "price": 220, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt1.png", "image_url": 'assets/customization_assets/shirt/f-shirt1.png'},
-
-        {"id": "U05GREEN-F", "base_id": "U05-F", "gender": "Female", "price": 200, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt3.png", "image_url": 'assets/customization_assets/shirt/f-shirt3.png'},
-        {"id": "U05BLUE-F", "base_id": "U05-F", "gender": "Female", "price": 220, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt3.png", "image_url": 'assets/customization_assets/shirt/f-shirt3.png'},
-         {"id": "U05PURPLE-F", "base_id": "U05-F", "gender": "Female", "price": 270, "colour": "#b796c2", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(240deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt3.png", "image_url": 'assets/customization_assets/shirt/f-shirt3.png'},
-
-        {"id": "U06GREEN-F", "base_id": "U06-F", "gender": "Female", "price": 300, "colour": "#7de877", "filter_colour": "hue-rotate(300deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt2.png", "image_url": 'assets/customization_assets/shirt/f-shirt2.png'},
-        {"id": "U06PINK-F", "base_id": "U06-F", "gender": "Female", "price": 350, "colour": "#FF9BA3", "filter_colour": "hue-rotate(190deg)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt2.png", "image_url": 'assets/customization_assets/shirt/f-shirt2.png'},
-        {"id": "U06BLUE-F", "base_id": "U06-F", "gender": "Female", "price": 400, "colour": "#59CFB5", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt2.png", "image_url": 'assets/customization_assets/shirt/f-shirt2.png'},
-
-        {"id": "U07GREY-F", "base_id": "U07-F", "gender": "Female", "price": 450, "colour": "#545454", "filter_colour": "grayscale(100%)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt6.png", "image_url": 'assets/customization_assets/shirt/f-shirt6.png'},
-        {"id": "U07PINK-F", "base_id": "U07-F", "gender": "Female", "price": 500, "colour": "#E4A7BA", "filter_colour": "sepia(95%) hue-rotate(300deg) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt6.png", "image_url": 'assets/customization_assets/shirt/f-shirt6.png'},
-        {"id": "U07PURPLE-F", "base_id": "U07-F", "gender": "Female", "price": 600, "colour": "#98547F", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/shirt/f-shirt6.png", "image_url": 'assets/customization_assets/shirt/f-shirt6.png'},
-
-        {"id": "L01GREY-M", "base_id": "L01-M", "gender": "Male", "price": 50, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants5.png", "image_url": 'assets/customization_assets/pants/m-pants5.png'},
-        {"id": "L01GREEN-M", "base_id": "L01-M", "gender": "Male", "price": 70, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants5.png", "image_url": 'assets/customization_assets/pants/m-pants5.png'},
-        {"id": "L01BLUE-M", "base_id": "L01-M", "gender": "Male", "price": 120, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants5.png", "image_url": 'assets/customization_assets/pants/m-pants5.png'},
-
-        {"id": "L02GREY-M", "base_id": "L02-M", "gender": "Male", "price": 60, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants4.png", "image_url": 'assets/customization_assets/pants/m-pants4.png'},
-        {"id": "L02GREEN-M", "base_id": "L02-M", "gender": "Male", "price": 80, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants4.png", "image_url": 'assets/customization_assets/pants/m-pants4.png'},
-        {"id": "L02BLUE-M", "base_id": "L02-M", "gender": "Male", "price": 130, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants4.png", "image_url": 'assets/customization_assets/pants/m-pants4.png'},
-
-        {"id": "L03GREY-M", "base_id": "L03-M", "gender": "Male", "price": 100, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants1.png", "image_url": 'assets/customization_assets/pants/m-pants1.png'},
-        {"id": "L03GREEN-M", "base_id": "L03-M", "gender": "Male", "price": 120, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants1.png", "image_url": 'assets/customization_assets/pants/m-pants1.png'},
-        {"id": "L03BLUE-M", "base_id": "L03-M", "gender": "Male", "price": 170, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants1.png", "image_url": 'assets/customization_assets/pants/m-pants1.png'},
-
-        {"id": "L04GREY-M", "base_id": "L04-M", "gender": "Male", "price": 200, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants2.png", "image_url": 'assets/customization_assets/pants/m-pants2.png'},
-        {"id": "L04GREEN-M", "base_id": "L04-M", "gender": "Male", "price": 220, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants2.png", "image_url": 'assets/customization_assets/pants/m-pants2.png'},
-        {"id": "L04BLUE-M", "base_id": "L04-M", "gender": "Male", "price": 270, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants2.png", "image_url": 'assets/customization_assets/pants/m-pants2.png'},
-
-        {"id": "L05BLUE-M", "base_id": "L05-M", "gender": "Male", "price": 300, "colour": "#3D5591", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants3.png", "image_url": 'assets/customization_assets/pants/m-pants3.png'},
-        {"id": "L05BROWN-M", "base_id": "L05-M", "gender": "Male", "price": 350, "colour": "#605714", "filter_colour": "hue-rotate(190deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants3.png", "image_url": 'assets/customization_assets/pants/m-pants3.png'},
-        {"id": "L05GREEN-M", "base_id": "L05-M", "gender": "Male", "price": 450, "colour": "#14665F", "filter_colour": "hue-rotate(300deg)", "thumbnail_url": "/static/assets/thumbnails/pants/m-pants3.png", "image_url": 'assets/customization_assets/pants/m-pants3.png'},
-    
-        {"id": "L01GREY-F", "base_id": "L01-F", "gender": "Female", "price": 50, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants5.png", "image_url": 'assets/customization_assets/pants/f-pants5.png'},
-        {"id": "L01GREEN-F", "base_id": "L01-F", "gender": "Female", "price": 70, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants5.png", "image_url": 'assets/customization_assets/pants/f-pants5.png'},
-        {"id": "L01BLUE-F", "base_id": "L01-F", "gender": "Female", "price": 120, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants5.png", "image_url": 'assets/customization_assets/pants/f-pants5.png'},
-
-        {"id": "L02GREY-F", "base_id": "L02-F", "gender": "Female", "price": 60, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants3.png", "image_url": 'assets/customization_assets/pants/f-pants3.png'},
-        {"id": "L02GREEN-F", "base_id": "L02-F", "gender": "Female", "price": 80, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants3.png", "image_url": 'assets/customization_assets/pants/f-pants3.png'},
-        {"id": "L02BLUE-F", "base_id": "L02-F", "gender": "Female", "price": 130, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants3.png", "image_url": 'assets/customization_assets/pants/f-pants3.png'},
-
-        {"id": "L03GREY-F", "base_id": "L03-F", "gender": "Female", "price": 100, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants2.png", "image_url": 'assets/customization_assets/pants/f-pants2.png'},
-        {"id": "L03GREEN-F", "base_id": "L03-F", "gender": "Female", "price": 120, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants2.png", "image_url": 'assets/customization_assets/pants/f-pants2.png'},
-        {"id": "L03BLUE-F", "base_id": "L03-F", "gender": "Female", "price": 170, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants2.png", "image_url": 'assets/customization_assets/pants/f-pants2.png'},
-
-        {"id": "L04GREY-F", "base_id": "L04-F", "gender": "Female", "price": 200, "colour": "#545454", "filter_colour": "grayscale(100%)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants4.png", "image_url": 'assets/customization_assets/pants/f-pants4.png'},
-        {"id": "L04PINK-F", "base_id": "L04-F", "gender": "Female", "price": 250, "colour": "#E4A7BA", "filter_colour": "sepia(95%) hue-rotate(300deg) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants4.png", "image_url": 'assets/customization_assets/pants/f-pants4.png'},
-        {"id": "L04PURPLE-F", "base_id": "L04-F", "gender": "Female", "price": 300, "colour": "#98547F", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants4.png", "image_url": 'assets/customization_assets/pants/f-pants4.png'},
-
-        {"id": "L05GREEN-F", "base_id": "L05-F", "gender": "Female", "price": 300, "colour": "#7de877", "filter_colour": "hue-rotate(300deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants1.png", "image_url": 'assets/customization_assets/pants/f-pants1.png'},
-        {"id": "L05PINK-F", "base_id": "L05-F", "gender": "Female", "price": 350, "colour": "#FF9BA3", "filter_colour": "hue-rotate(190deg)", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants1.png", "image_url": 'assets/customization_assets/pants/f-pants1.png'},
-        {"id": "L05BLUE-F", "base_id": "L05-F", "gender": "Female", "price": 400, "colour": "#59CFB5", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/pants/f-pants1.png", "image_url": 'assets/customization_assets/pants/f-pants1.png'},
-
-        {"id": "F01BLACK-M", "base_id": "F01-M", "gender": "Male", "price": 150, "colour": "#494a4c", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/shoes/m-shoes1.png", "image_url": 'assets/customization_assets/shoes/m-shoes1.png'},
-        {"id": "F01BROWN-M", "base_id": "F01-M", "gender": "Male", "price": 250, "colour": "#85775c", "filter_colour": "sepia(105%)", "thumbnail_url": "/static/assets/thumbnails/shoes/m-shoes1.png", "image_url": 'assets/customization_assets/shoes/m-shoes1.png'},
-        {"id": "F01LIGHTBROWN-M", "base_id": "F01-M", "gender": "Male", "price": 350, "colour": "#a27e67", "filter_colour": "sepia(95%) hue-rotate(340deg) brightness(1.1) contrast(140%)", "thumbnail_url": "/static/assets/thumbnails/shoes/m-shoes1.png", "image_url": 'assets/customization_assets/shoes/m-shoes1.png'},
-
-        {"id": "F01GREY-F", "base_id": "F01-F", "gender": "Female", "price": 150, "colour": "#545454", "filter_colour": "grayscale(100%)", "thumbnail_url": "/static/assets/thumbnails/shoes/f-shoes2.png", "image_url": 'assets/customization_assets/shoes/f-shoes2.png'},
-        {"id": "F01PINK-F", "base_id": "F01-F", "gender": "Female", "price": 250, "colour": "#E4A7BA", "filter_colour": "sepia(95%) hue-rotate(300deg) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/shoes/f-shoes2.png", "image_url": 'assets/customization_assets/shoes/f-shoes2.png'},
-        {"id": "F01BLUE-F", "base_id": "F01-F", "gender": "Female", "price": 250, "colour": "#3F5494", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/shoes/f-shoes2.png", "image_url": 'assets/customization_assets/shoes/f-shoes2.png'},
-
-        {"id": "F02GREEN-F", "base_id": "F02-F", "gender": "Female", "price": 250, "colour": "#7de877", "filter_colour": "hue-rotate(300deg)", "thumbnail_url": "/static/assets/thumbnails/shoes/f-shoes1.png", "image_url": 'assets/customization_assets/shoes/f-shoes1.png'},
-        {"id": "F02PINK-F", "base_id": "F02-F", "gender": "Female", "price": 350, "colour": "#FF9BA3", "filter_colour": "hue-rotate(190deg)", "thumbnail_url": "/static/assets/thumbnails/shoes/f-shoes1.png", "image_url": 'assets/customization_assets/shoes/f-shoes1.png'},
-        {"id": "F02BLUE-F", "base_id": "F02-F", "gender": "Female", "price": 450, "colour": "#59CFB5", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/shoes/f-shoes1.png", "image_url": 'assets/customization_assets/sshoes/f-shoes1.png'},
-    
-        {"id": "M01GREY-M", "base_id": "M01-M", "gender": "Male", "price": 10, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc1.png", "image_url": 'assets/customization_assets/misc/m-misc1.png'},
-        {"id": "M01GREEN-M", "base_id": "M01-M", "gender": "Male", "price": 15, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc1.png", "image_url": 'assets/customization_assets/misc/m-misc1.png'},
-        {"id": "M01BLUE-M", "base_id": "M01-M", "gender": "Male", "price": 20, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc1.png", "image_url": 'assets/customization_assets/misc/m-misc1.png'},
-
-        {"id": "M02GREY-M", "base_id": "M02-M", "gender": "Male", "price": 20, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc2.png", "image_url": 'assets/customization_assets/misc/m-misc2.png'},
-        {"id": "M02GREEN-M", "base_id": "M02-M", "gender": "Male", "price": 25, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc2.png", "image_url": 'assets/customization_assets/misc/m-misc2.png'},
-        {"id": "M02BLUE-M", "base_id": "M02-M", "gender": "Male", "price": 30, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc2.png", "image_url": 'assets/customization_assets/misc/m-misc2.png'},
-
-        {"id": "M03GREY-M", "base_id": "M03-M", "gender": "Male", "price": 30, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc3.png", "image_url": 'assets/customization_assets/misc/m-misc3.png'},
-        {"id": "M03GREEN-M", "base_id": "M03-M", "gender": "Male", "price": 35, "colour": "#8aab7f", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(60deg)", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc3.png", "image_url": 'assets/customization_assets/misc/m-misc3.png'},
-        {"id": "M03BLUE-M", "base_id": "M03-M", "gender": "Male", "price": 40, "colour": "#79c7d9", "filter_colour": "saturate(100%) sepia(100%) hue-rotate(150deg)", "thumbnail_url": "/static/assets/thumbnails/misc/m-misc3.png", "image_url": 'assets/customization_assets/misc/m-misc3.png'},
-
-        {"id": "M01GREY-F", "base_id": "M01-F", "gender": "Female", "price": 10, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc2.png", "image_url": 'assets/customization_assets/misc/f-misc2.png'},
-        {"id": "M01WHITE-F", "base_id": "M01-F", "gender": "Female", "price": 20, "colour": "#E7E7E7", "filter_colour": "brightness(1.75)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc2.png", "image_url": 'assets/customization_assets/misc/f-misc2.png'},
-        {"id": "M01PINK-F", "base_id": "M01-F", "gender": "Female", "price": 30, "colour": "#DBA5A2", "filter_colour": "sepia(100%) hue-rotate(315deg) contrast(100%) brightness(1.1)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc2.png", "image_url": 'assets/customization_assets/misc/f-misc2.png'},
-
-        {"id": "M02GREY-F", "base_id": "M02-F", "gender": "Female", "price": 15, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc3.png", "image_url": 'assets/customization_assets/misc/f-misc3.png'},
-        {"id": "M02WHITE-F", "base_id": "M02-F", "gender": "Female", "price": 25, "colour": "#E7E7E7", "filter_colour": "brightness(1.75)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc3.png", "image_url": 'assets/customization_assets/misc/f-misc3.png'},
-        {"id": "M02PINK-F", "base_id": "M02-F", "gender": "Female", "price": 35, "colour": "#DBA5A2", "filter_colour": "sepia(100%) hue-rotate(315deg) contrast(100%) brightness(1.1)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc3.png", "image_url": 'assets/customization_assets/misc/f-misc3.png'},
-
-        {"id": "M03GREY-F", "base_id": "M03-F", "gender": "Female", "price": 20, "colour": "#848484", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc4.png", "image_url": 'assets/customization_assets/misc/f-misc4.png'},
-        {"id": "M03WHITE-F", "base_id": "M03-F", "gender": "Female", "price": 30, "colour": "#E7E7E7", "filter_colour": "brightness(1.75)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc4.png", "image_url": 'assets/customization_assets/misc/f-misc4.png'},
-        {"id": "M03PINK-F", "base_id": "M03-F", "gender": "Female", "price": 40, "colour": "#DBA5A2", "filter_colour": "sepia(100%) hue-rotate(315deg) contrast(100%) brightness(1.1)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc4.png", "image_url": 'assets/customization_assets/misc/f-misc4.png'},
-
-        {"id": "M04GREY-F", "base_id": "M04-F", "gender": "Female", "price": 50, "colour": "#545454", "filter_colour": "grayscale(100%)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc5.png", "image_url": 'assets/customization_assets/misc/f-misc5.png'},
-        {"id": "M04PINK-F", "base_id": "M04-F", "gender": "Female", "price": 70, "colour": "#E4A7BA", "filter_colour": "sepia(95%) hue-rotate(300deg) brightness(1.3)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc5.png", "image_url": 'assets/customization_assets/misc/f-misc5.png'},
-        {"id": "M04PURPLE-F", "base_id": "M04-F", "gender": "Female", "price": 100, "colour": "#625b98", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc5.png", "image_url": 'assets/customization_assets/misc/f-misc5.png'},
-
-        {"id": "M05GREEN-F", "base_id": "M05-F", "gender": "Female", "price": 50, "colour": "#7de877", "filter_colour": "hue-rotate(300deg)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc1.png", "image_url": 'assets/customization_assets/misc/f-misc1.png'},
-        {"id": "M05PINK-F", "base_id": "M05-F", "gender": "Female", "price": 70, "colour": "#FF9BA3", "filter_colour": "hue-rotate(190deg)", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc1.png", "image_url": 'assets/customization_assets/misc/f-misc1.png'},
-        {"id": "M05BLUE-F", "base_id": "M05-F", "gender": "Female", "price": 100, "colour": "#59CFB5", "filter_colour": "", "thumbnail_url": "/static/assets/thumbnails/misc/f-misc1.png", "image_url": 'assets/customization_assets/misc/f-misc1.png'},
-    ]   
-    
-    for item_data in items_data:
-        item = Item.query.filter_by(id=item_data["id"]).first()
-        if not item:
-            new_item = Item(**item_data)
-            db.session.add(new_item)
+CATALOG_SEED_FILES = {Item: os.path.join(basedir, 'data/items.json'), Pet: os.path.join(basedir, 'data/pets.json')}
+
+def upsert_rows(model, rows):
+    # One multi-row INSERT ... ON CONFLICT DO UPDATE keyed on the primary key
+    if not rows:
+        return
+    table = model.__table__
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        for row in rows:
+            db.session.merge(model(**row))
+        return
+    statement = insert(table)
+    primary_key = [column.name for column in table.primary_key]
+    statement = statement.on_conflict_do_update(
+        index_elements=primary_key,
+        set_={column.name: statement.excluded[column.name] for column in table.columns if column.name not in primary_key},
+    )
+    db.session.execute(statement, rows)
+
+def seed_catalog(force=False):
+    # Loads data/items.json and data/pets.json with one bulk upsert per table.
+    # Skipped entirely when the files match the checksum stored by the last run.
+    contents = {}
+    for model, path in CATALOG_SEED_FILES.items():
+        with open(path, 'rb') as f:
+            contents[model] = f.read()
+    checksum = hashlib.sha256(b''.join(contents[model] for model in CATALOG_SEED_FILES)).hexdigest()
+    seed_state = db.session.get(SeedState, 'catalog')
+    if seed_state and seed_state.checksum == checksum and not force:
+        return False
+
+    for model, data in contents.items():
+        upsert_rows(model, json.loads(data))
+    if seed_state:
+        seed_state.checksum = checksum
+    else:
+        db.session.add(SeedState(name='catalog', checksum=checksum))
     db.session.commit()
-
-def add_pets_data():
-    pets_data = [
-        {"species": "A1", "name": "Aquana Blue", "price": 150, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Blue.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Blue.png"},
-        {"species": "A2", "name": "Aquana Pink", "price": 150, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Pink.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Pink.png"},
-        {"species": "A3", "name": "Aquana Yellow", "price": 150, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Yellow.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Yellow.png"},
-        {"species": "A4", "name": "Aquana Albino", "price": 200, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Albino.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Albino.png"},
-        {"species": "A5", "name": "Aquana Melanistic", "price": 200, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Melanistic.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Melanistic.png"},
-        {"species": "A6", "name": "Aquana Leucistic", "price": 250, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Leucistic.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Leucistic.png"},
-        {"species": "A7", "name": "Aquana Dragon Red", "price": 350, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Dragon_Red.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Dragon_Red.png"},
-        {"species": "A8", "name": "Aquana Dragon Green", "price": 350, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Dragon_Green.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Dragon_Green.png"},
-        {"species": "A9", "name": "Aquana Dragon Black", "price": 350, "egg_image_url": "/static/assets/eggs/aquana/Egg_Aquana_Dragon_Black.png", "pet_image_url": "/static/assets/pets/aquana/Aquana_Dragon_Black.png"},
-        {"species": "T1", "name": "Trotter Brown", "price": 200, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Brown.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Brown.png"},
-        {"species": "T2", "name": "Trotter Pink", "price": 200, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Pink.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Pink.png"},
-        {"species": "T3", "name": "Trotter Silver", "price": 200, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Silver.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Silver.png"},
-        {"species": "T4", "name": "Trotter Albino", "price": 250, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Albino.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Albino.png"},
-        {"species": "T5", "name": "Trotter Red", "price": 350, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Red.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Red.png"},
-        {"species": "T6", "name": "Trotter Leucistic", "price": 350, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Leucistic.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Leucistic.png"},
-        {"species": "T7", "name": "Trotter Kitsune Red", "price": 450, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Kitsune_Red.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Kitsune_Red.png"},
-        {"species": "T8", "name": "Trotter Kitsune White", "price": 450, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Kitsune_White.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Kitsune_White.png"},
-        {"species": "T9", "name": "Trotter Kitsune Black", "price": 450, "egg_image_url": "/static/assets/eggs/trotter/Egg_Trotter_Kitsune_Black.png", "pet_image_url": "/static/assets/pets/trotter/Trotter_Kitsune_Black.png"},
-        {"species": "J1", "name": "Jackaloaf Chinese", "price": 250, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Chinese.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Chinese.png"},
-        {"species": "J2", "name": "Jackaloaf Red Brocket", "price": 300, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Brocket.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Brocket.png"},
-        {"species": "J3", "name": "Jackaloaf Pudu", "price": 300, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Pudu.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Pudu.png"},
-        {"species": "J4", "name": "Jackaloaf Roe", "price": 400, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Roe.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Roe.png"},
-        {"species": "J5", "name": "Jackaloaf Taruca", "price": 400, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Taruca.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Taruca.png"},
-        {"species": "J6", "name": "Jackaloaf Eld", "price": 450, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Eld.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Eld.png"},
-        {"species": "J7", "name": "Jackaloaf Sika", "price": 550, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Sika.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Sika.png"},
-        {"species": "J8", "name": "Jackaloaf Elk", "price": 550, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Elk.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Elk.png"},
-        {"species": "J9", "name": "Jackaloaf Reindeer", "price": 600, "egg_image_url": "/static/assets/eggs/jackaloaf/Egg_Jackaloaf_Reindeer.png", "pet_image_url": "/static/assets/pets/jackaloaf/Jackaloaf_Reindeer.png"}
-    ]
-    for pet_data in pets_data:
-        pet = Pet.query.filter_by(species=pet_data["species"]).first()
-        if not pet:
-            new_pet = Pet(**pet_data)
-            db.session.add(new_pet)
+    catalog_cache.bump_version()
+    return True
+
+@app.cli.command('seed')
+@click.option('--force', is_flag=True, help='Seed even if the data files have not changed.')
+def seed_command(force):
+    db.create_all()
+    if run_with_lock_retry(seed_catalog, force=force):
+        print("Seeded the item and pet catalog")
+    else:
+        print("Catalog data unchanged, nothing to seed")
+
+class RewardWriteBehind:
+    # Buffers minigame rewards per (user, game) and writes them as one batched
+    # UPDATE per game every REWARD_FLUSH_INTERVAL seconds, or sooner once
+    # REWARD_FLUSH_SIZE users are pending. The buffer lives in this process,
+    # so pending rewards are only visible to requests served by it.
+    def __init__(self):
+        self._pending = {}
+        # The batch being written: still counted by submit() until it has
+        # committed or been put back, since user rows read meanwhile predate it
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopping = False
+
+    def submit(self, user, game, score):
+        # Returns the projected (balance, daily chances) or None when the user
+        # has no chances left once pending rounds are counted
+        day = current_game_day()
+        key = (user.id, game, day)
+        with self._lock:
+            pending = self._pending.setdefault(key, {'amount': 0, 'chances': 0})
+            in_flight = self._in_flight.get(key, {'amount': 0, 'chances': 0})
+            chances_left = user.get_daily_chances(game, day) - pending['chances'] - in_flight['chances']
+            if chances_left <= 0:
+                if not pending['chances']:
+                    del self._pending[key]
+                return None
+            pending['amount'] += score
+            pending['chances'] += 1
+            projected_balance = min(max(user.currency_balance + pending['amount'] + in_flight['amount'], MIN_BALANCE), MAX_BALANCE)
+            pending_count = len(self._pending)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='reward-write-behind', daemon=True)
+                self._thread.start()
+        if pending_count >= app.config['REWARD_FLUSH_SIZE']:
+            self._wakeup.set()
+        return projected_balance, chances_left - 1
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._in_flight = batch
+        if not batch:
+            return
+        user_table = User.__table__
+        with app.app_context():
+            try:
+                for game in MINIGAMES:
+                    # Oldest day first, so a round from before midnight cannot
+                    # overwrite the new day's bucket
+                    params = [{'user_key': user_id, 'day': day, **pending}
+                              for (user_id, pending_game, day), pending in sorted(batch.items(), key=lambda entry: entry[0][2])
+                              if pending_game == game]
+                    if not params:
+                        continue
+                    last_played_date = user_table.c[f'last_played_date_{game}']
+                    chances = db.case((last_played_date == db.bindparam('day'), user_table.c[f'daily_chances_{game}']), else_=DAILY_CHANCES) - db.bindparam('chances')
+                    statement = db.update(user_table).where(user_table.c.id == db.bindparam('user_key')).values({
+                        'currency_balance': clamp_balance(user_table.c.currency_balance + db.bindparam('amount')),
+                        f'daily_chances_{game}': db.case((chances < 0, 0), else_=chances),
+                        f'last_played_date_{game}': db.bindparam('day'),
+                    })
+                    db.session.execute(statement, params)
+                db.session.commit()
+                with self._lock:
+                    self._in_flight = {}
+            except Exception as e:
+                db.session.rollback()
+                app.logger.warning('Error flushing minigame rewards, will retry: %s', e)
+                self._requeue(batch)
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._in_flight = {}
+            for key, pending in batch.items():
+                current = self._pending.setdefault(key, {'amount': 0, 'chances': 0})
+                current['amount'] += pending['amount']
+                current['chances'] += pending['chances']
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(app.config['REWARD_FLUSH_INTERVAL'])
+            self._wakeup.clear()
+            self.flush()
+
+    def stop(self):
+        # Drains the buffer on shutdown
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+reward_write_behind = RewardWriteBehind()
+atexit.register(reward_write_behind.stop)
+
+def award_minigame_score(game):
+    score = request.get_json(silent=True)
+    if not isinstance(score, int) or isinstance(score, bool) or score < 0:
+        return jsonify({'success': False, 'error': 'Invalid score'}), 400
+
+    if app.config['REWARD_WRITE_BEHIND']:
+        projected = reward_write_behind.submit(current_user, game, score)
+        if projected is None:
+            return jsonify({'success': False, 'error': 'No daily chances left'}), 400
+        new_balance, daily_chances = projected
+        return jsonify({'success': True, 'currency_balance': new_balance, 'daily_chances': daily_chances}), 200
+
+    # A round on a new day starts from the full allowance, so no reset is needed
+    today = current_game_day()
+    daily_chances = getattr(User, f'daily_chances_{game}')
+    last_played_date = getattr(User, f'last_played_date_{game}')
+    played_today = db.and_(last_played_date.isnot(None), last_played_date == today)
+    new_balance = change_balance(current_user.id, score, conditions=[db.or_(db.not_(played_today), daily_chances > 0)], values={
+        f'daily_chances_{game}': db.case((played_today, daily_chances - 1), else_=DAILY_CHANCES - 1),
+        f'last_played_date_{game}': today,
+    })
     db.session.commit()
+    if new_balance is None:
+        return jsonify({'success': False, 'error': 'No daily chances left'}), 400
+    return jsonify({'success': True, 'currency_balance': new_balance, 'daily_chances': current_user.get_daily_chances(game, today)}), 200
 
 @app.route('/gain_currency_ft', methods=['POST'])
 @login_required
+@retry_on_database_lock
 def gain_currency_ft():
-    if current_user.daily_chances_ft > 0:
-        score = request.get_json()
-        current_user.currency_balance += score
-        db.session.commit()
-        current_user.daily_chances_ft -= 1
-        db.session.commit()
-        current_user.last_played_time_ft = datetime.now().strftime("%m/%d/%Y")
-        db.session.commit()
-    elif current_user.daily_chances_ft == 0:
-        current_user.daily_chances_ft = 0
-        db.session.commit()
+    return award_minigame_score('ft')
 
 @app.route('/gain_currency_jjj', methods=['POST'])
 @login_required
+@retry_on_database_lock
 def gain_currency_jjj():
-    if current_user.daily_chances_jjj > 0:
-        score = request.get_json()
-        current_user.currency_balance += score
-        db.session.commit()
-        current_user.daily_chances_jjj -= 1
-        db.session.commit()
-        current_user.last_played_time_jjj = datetime.now().strftime("%m/%d/%Y")
-        db.session.commit()
-    elif current_user.daily_chances_jjj == 0:
-        current_user.daily_chances_jjj = 0
-        db.session.commit()
+    return award_minigame_score('jjj')
+
+def add_missing_columns():
+    # db.create_all() never alters existing tables, so columns added to a
+    # model after its table was created are added here.
+    inspector = db.inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            ddl = f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+            if column.server_default is not None:
+                ddl += f' DEFAULT {column.server_default.arg}'
+            db.session.execute(text(ddl))
+    db.session.commit()
 
-@app.route('/reset_chances_ft', methods=['POST'])
-@login_required
-def reset_chances_ft():
-    temp_date = datetime.now().strftime("%m/%d/%Y")
-    if current_user.last_played_time_ft != temp_date:
-        current_user.daily_chances_ft = 20
-        db.session.commit()
-        current_user.last_played_time_ft = datetime.now().strftime("%m/%d/%Y")
-        db.session.commit()
-    return redirect(url_for('minigamesfeedingtime'))
+def add_missing_indexes():
+    # Like add_missing_columns, for indexes declared on models after their table existed
+    inspector = db.inspect(db.engine)
+    connection = db.session.connection()
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(connection)
+    db.session.commit()
 
-@app.route('/reset_chances_jjj', methods=['POST'])
-@login_required
-def reset_chances_jjj():
-    temp_date = datetime.now().strftime("%m/%d/%Y")
-    if current_user.last_played_time_jjj != temp_date:
-        current_user.daily_chances_jjj = 20
+def migrate_inventory_table():
+    # Rebuilds inventory tables created before the (user_id, item_id) unique
+    # index: fixes the column types and keeps one row per owned item. Extra
+    # copies are refunded at the recycle rate in the same transaction
+    inspector = db.inspect(db.engine)
+    if not inspector.has_table('inventory'):
+        return
+    if any(index['name'] == 'ix_inventory_user_item' for index in inspector.get_indexes('inventory')):
+        return
+    db.session.execute(text('ALTER TABLE inventory RENAME TO inventory_old'))
+    Inventory.__table__.create(db.session.connection())
+    db.session.execute(text(
+        "INSERT INTO inventory (id, user_id, item_id) "
+        "SELECT MIN(id), CAST(user_id AS INTEGER), CAST(item_id AS VARCHAR(20)) FROM inventory_old GROUP BY CAST(user_id AS INTEGER), item_id"
+    ))
+    duplicates = db.session.execute(text(
+        "SELECT CAST(user_id AS INTEGER), COUNT(*) - 1, COALESCE((SELECT price FROM item WHERE item.id = inventory_old.item_id), 0) "
+        "FROM inventory_old GROUP BY CAST(user_id AS INTEGER), item_id HAVING COUNT(*) > 1"
+    )).all()
+    dropped = defaultdict(lambda: [0, 0])
+    for user_id, extra_copies, price in duplicates:
+        dropped[user_id][0] += extra_copies
+        dropped[user_id][1] += extra_copies * (price // 2)
+    for user_id, (rows, refund) in dropped.items():
+        change_balance(user_id, refund)
+        app.logger.warning('Dropped %d duplicate inventory rows for user %s and refunded %d', rows, user_id, refund)
+    db.session.execute(text('DROP TABLE inventory_old'))
+    db.session.commit()
+
+def rollover_daily_chances():
+    # Optional bulk reset of every stale day bucket in one statement. Reads
+    # never depend on it; it only keeps the stored counters tidy.
+    today = current_game_day()
+    values = {}
+    for game in MINIGAMES:
+        last_played_date = getattr(User, f'last_played_date_{game}')
+        stale = db.or_(last_played_date.is_(None), last_played_date != today)
+        values[f'daily_chances_{game}'] = db.case((stale, DAILY_CHANCES), else_=getattr(User, f'daily_chances_{game}'))
+        values[f'last_played_date_{game}'] = today
+    result = db.session.execute(db.update(User).values(values), execution_options={'synchronize_session': False})
+    db.session.commit()
+    return result.rowcount
+
+@app.cli.command('rollover-chances')
+def rollover_chances_command():
+    print(f"Rolled over daily chances for {rollover_daily_chances()} users")
+
+def backfill_last_played_dates():
+    # Copies the legacy "%m/%d/%Y" last_played_time_* strings into the date columns
+    existing_columns = {column['name'] for column in db.inspect(db.engine).get_columns('user')}
+    for game in MINIGAMES:
+        if f'last_played_time_{game}' not in existing_columns:
+            continue
+        db.session.execute(text(
+            f"UPDATE user SET last_played_date_{game} = "
+            f"substr(last_played_time_{game}, 7, 4) || '-' || substr(last_played_time_{game}, 1, 2) || '-' || substr(last_played_time_{game}, 4, 2) "
+            f"WHERE last_played_date_{game} IS NULL AND last_played_time_{game} IS NOT NULL"
+        ))
+    db.session.commit()
+
+def backfill_comment_depths():
+    # Fills Comment.depth for rows created before the column existed, one
+    # nesting level per pass
+    while True:
+        result = db.session.execute(text(
+            "UPDATE comment SET depth = (SELECT parent.depth + 1 FROM comment AS parent WHERE parent.id = comment.parent_id) "
+            "WHERE parent_id IS NOT NULL AND depth != (SELECT parent.depth + 1 FROM comment AS parent WHERE parent.id = comment.parent_id)"
+        ))
         db.session.commit()
-        current_user.last_played_time_jjj = datetime.now().strftime("%m/%d/%Y")
+        if result.rowcount == 0:
+            return
+
+def backfill_topic_activity():
+    # Topics from before activity tracking have no last_activity_at; their
+    # counters are recomputed once from the comment rows
+    if db.session.scalar(db.select(Topic.id).where(Topic.last_activity_at.is_(None)).limit(1)) is not None:
+        repair_forum_counters()
+
+def migrate_images_to_store(batch_size=100):
+    # One-shot move of the legacy base64 avatar/profile_pic columns into the image store
+    migrated = 0
+    while True:
+        users = (User.query.options(db.undefer(User.avatar), db.undefer(User.profile_pic))
+                 .filter(db.or_(User.avatar.isnot(None), User.profile_pic.isnot(None)))
+                 .limit(batch_size).all())
+        if not users:
+            return migrated
+        for user in users:
+            for legacy_column, hash_column in (('avatar', 'avatar_hash'), ('profile_pic', 'profile_pic_hash')):
+                legacy_data = getattr(user, legacy_column)
+                if legacy_data:
+                    try:
+                        setattr(user, hash_column, store_image(decode_image_data(legacy_data)))
+                    except binascii.Error:
+                        app.logger.warning('Dropping undecodable %s for user %s', legacy_column, user.username)
+                setattr(user, legacy_column, None)
+            migrated += 1
         db.session.commit()
 
-if __name__ == '__main__':
+@app.cli.command('migrate-images')
+def migrate_images_command():
+    db.create_all()
+    add_missing_columns()
+    print(f"Moved images of {migrate_images_to_store()} users into the image store")
+
+# The forum search index is an FTS5 table kept in step with topic and comment
+# by triggers, so ORM writes and bulk deletes update it alike
+SEARCH_INDEX_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS forum_search USING fts5("
+    "title, body, topic_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS forum_search_topic_insert AFTER INSERT ON topic BEGIN "
+    "INSERT INTO forum_search (rowid, title, body, topic_id) VALUES (new.id * 2, new.title, coalesce(new.description, ''), new.id); END",
+    "CREATE TRIGGER IF NOT EXISTS forum_search_topic_update AFTER UPDATE OF title, description ON topic BEGIN "
+    "UPDATE forum_search SET title = new.title, body = coalesce(new.description, '') WHERE rowid = old.id * 2; END",
+    "CREATE TRIGGER IF NOT EXISTS forum_search_topic_delete AFTER DELETE ON topic BEGIN "
+    "DELETE FROM forum_search WHERE rowid = old.id * 2; END",
+    "CREATE TRIGGER IF NOT EXISTS forum_search_comment_insert AFTER INSERT ON comment BEGIN "
+    "INSERT INTO forum_search (rowid, title, body, topic_id) VALUES (new.id * 2 + 1, '', new.text, new.topicId); END",
+    "CREATE TRIGGER IF NOT EXISTS forum_search_comment_update AFTER UPDATE OF text, topicId ON comment BEGIN "
+    "UPDATE forum_search SET body = new.text, topic_id = new.topicId WHERE rowid = old.id * 2 + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS forum_search_comment_delete AFTER DELETE ON comment BEGIN "
+    "DELETE FROM forum_search WHERE rowid = old.id * 2 + 1; END",
+)
+
+def populate_search_index():
+    db.session.execute(text("INSERT INTO forum_search (rowid, title, body, topic_id) SELECT id * 2, title, coalesce(description, ''), id FROM topic"))
+    db.session.execute(text("INSERT INTO forum_search (rowid, title, body, topic_id) SELECT id * 2 + 1, '', text, topicId FROM comment"))
+
+def ensure_search_index():
+    # Creates the index and its triggers if missing, filling it from existing rows
+    if db.engine.dialect.name != 'sqlite':
+        return
+    exists = db.session.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'forum_search'")).first()
+    for statement in SEARCH_INDEX_SCHEMA:
+        db.session.execute(text(statement))
+    if not exists:
+        populate_search_index()
+    db.session.commit()
+
+def rebuild_search_index():
+    # Drops the index and triggers and builds them again from topic and comment in one transaction
+    for trigger in ('topic_insert', 'topic_update', 'topic_delete', 'comment_insert', 'comment_update', 'comment_delete'):
+        db.session.execute(text(f"DROP TRIGGER IF EXISTS forum_search_{trigger}"))
+    db.session.execute(text("DROP TABLE IF EXISTS forum_search"))
+    for statement in SEARCH_INDEX_SCHEMA:
+        db.session.execute(text(statement))
+    populate_search_index()
+    db.session.execute(text("INSERT INTO forum_search (forum_search) VALUES ('optimize')"))
+    db.session.commit()
+
+@app.cli.command('rebuild-search')
+def rebuild_search_command():
+    if db.engine.dialect.name != 'sqlite':
+        print("Forum search only keeps an index on SQLite, nothing to rebuild")
+        return
+    db.create_all()
+    run_with_lock_retry(rebuild_search_index)
+    print(f"Rebuilt the forum search index with {db.session.scalar(text('SELECT count(*) FROM forum_search'))} entries")
+
+def write_compressed_siblings(path, data):
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data))
+
+def build_assets(clean=False):
+    # Copies every file under static/ to static/build/ with a content hash in
+    # its name, compresses text assets and writes the manifest. Binary files go
+    # first so CSS and JS can have their /static/ references rewritten to the
+    # fingerprinted names before they are hashed themselves. Old builds are
+    # kept unless clean, so pages from processes still on the old manifest keep working
+    static_folder = app.static_folder
+    build_folder = app.config['ASSET_BUILD_FOLDER']
+    skipped = {os.path.abspath(build_folder), os.path.abspath(app.config['UPLOAD_FOLDER'])}
+    if clean and os.path.exists(build_folder):
+        shutil.rmtree(build_folder)
+    sources = []
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.abspath(os.path.join(root, d)) not in skipped)
+        for name in sorted(files):
+            sources.append(os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, '/'))
+    sources.sort(key=lambda name: os.path.splitext(name)[1] in REWRITTEN_ASSET_EXTENSIONS)
+
+    manifest = {}
+    for logical in sources:
+        with open(os.path.join(static_folder, logical), 'rb') as f:
+            data = f.read()
+        stem, extension = os.path.splitext(logical)
+        if extension in REWRITTEN_ASSET_EXTENSIONS:
+            data = STATIC_REFERENCE_PATTERN.sub(
+                lambda match: '/static/build/' + manifest[match.group(1)] if match.group(1) in manifest else match.group(0),
+                data.decode('utf-8')).encode('utf-8')
+        built = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{extension}'
+        path = os.path.join(build_folder, built)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+            if extension in COMPRESSIBLE_ASSET_EXTENSIONS:
+                write_compressed_siblings(path, data)
+        manifest[logical] = built
+
+    os.makedirs(build_folder, exist_ok=True)
+    manifest_path = os.path.join(build_folder, 'manifest.json')
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+ATLAS_MAX_WIDTH = 2048
+ATLAS_PADDING = 2
+
+def find_static_file(url, lowercase_index):
+    # Catalog URLs are /static/... paths; their case doesn't always match the
+    # files on disk, so fall back to a case-insensitive lookup
+    if not url or not url.startswith('/static/'):
+        return None
+    relative = url[len('/static/'):]
+    path = safe_join(app.static_folder, relative)
+    if path and os.path.isfile(path):
+        return path
+    return lowercase_index.get(relative.lower())
+
+def pack_sprites(sizes):
+    # Shelf packing, tallest first: returns each sprite's position and the sheet size
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], i))
+    positions = [None] * len(sizes)
+    x = y = shelf_height = sheet_width = 0
+    for i in order:
+        width, height = sizes[i]
+        if x and x + width > ATLAS_MAX_WIDTH:
+            x, y, shelf_height = 0, y + shelf_height + ATLAS_PADDING, 0
+        positions[i] = (x, y)
+        x += width + ATLAS_PADDING
+        shelf_height = max(shelf_height, height)
+        sheet_width = max(sheet_width, x - ATLAS_PADDING)
+    return positions, (sheet_width, y + shelf_height)
+
+def percent(value):
+    return f'{round(value, 4):g}%'
+
+def build_sprite_atlas(name, urls, max_size, lowercase_index):
+    # Packs the images behind urls into <name>.png and <name>.webp, each
+    # sprite scaled to fit max_size, and writes the <name>.json map. Returns
+    # the CSS rules for the sheet
+    folder = app.config['ATLAS_FOLDER']
+    sprites = []
+    for url in dict.fromkeys(urls):
+        path = find_static_file(url, lowercase_index)
+        if path is None:
+            continue
+        with Image.open(path) as image:
+            image = image.convert('RGBA')
+        original_size = image.size
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+        sprites.append((url, original_size, image))
+    if not sprites:
+        return ''
+    positions, sheet_size = pack_sprites([image.size for _, _, image in sprites])
+    sheet = Image.new('RGBA', sheet_size, (0, 0, 0, 0))
+    for (url, original_size, image), position in zip(sprites, positions):
+        sheet.paste(image, position)
+    # The art is flat-coloured, so a 256-colour palette keeps it intact and
+    # both files smaller than the separate originals put together
+    sheet = sheet.quantize(256, method=Image.Quantize.FASTOCTREE)
+    sheet.save(os.path.join(folder, f'{name}.png'), optimize=True)
+    sheet.convert('RGBA').save(os.path.join(folder, f'{name}.webp'), lossless=True, method=6)
+
+    css = [f'.sprite-{name} {{ background-image: url("/static/atlases/{name}.png"); '
+           f'background-image: image-set(url("/static/atlases/{name}.webp") type("image/webp"), url("/static/atlases/{name}.png") type("image/png")); '
+           'background-repeat: no-repeat; }']
+    atlas = {'name': name, 'width': sheet_size[0], 'height': sheet_size[1], 'sprites': {}}
+    for index, ((url, original_size, image), (x, y)) in enumerate(zip(sprites, positions)):
+        width, height = image.size
+        # Percentages scale the sprite with whatever size CSS gives the element
+        size_x = sheet_size[0] / width * 100
+        size_y = sheet_size[1] / height * 100
+        position_x = x / (sheet_size[0] - width) * 100 if sheet_size[0] != width else 0
+        position_y = y / (sheet_size[1] - height) * 100 if sheet_size[1] != height else 0
+        css.append(f'.sprite-{name}-{index} {{ background-size: {percent(size_x)} {percent(size_y)}; '
+                   f'background-position: {percent(position_x)} {percent(position_y)}; }}')
+        atlas['sprites'][url] = {'index': index, 'x': x, 'y': y, 'sprite_width': width, 'sprite_height': height,
+                                 'width': original_size[0], 'height': original_size[1]}
+    with open(os.path.join(folder, f'{name}.json'), 'w') as f:
+        json.dump(atlas, f, indent=1)
+    return '\n'.join(css)
+
+def build_sprite_atlases(max_size=256):
+    # One atlas each for pets, eggs and item thumbnails from the catalog.
+    # Colour variants share a thumbnail, so each thumbnail is packed once
+    catalog = catalog_cache.get()
+    folder = app.config['ATLAS_FOLDER']
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+    os.makedirs(folder)
+    lowercase_index = {}
+    for root, dirs, files in os.walk(app.static_folder):
+        for name in files:
+            path = os.path.join(root, name)
+            lowercase_index[os.path.relpath(path, app.static_folder).replace(os.sep, '/').lower()] = path
+    groups = (
+        ('pets', [pet.pet_image_url for pet in catalog.pets]),
+        ('eggs', [pet.egg_image_url for pet in catalog.pets]),
+        ('thumbnails', [item.thumbnail_url for item in catalog.items_by_id.values()]),
+    )
+    css = [build_sprite_atlas(name, urls, max_size, lowercase_index) for name, urls in groups]
+    with open(os.path.join(folder, 'sprites.css'), 'w') as f:
+        f.write('\n'.join(rules for rules in css if rules) + '\n')
+    return load_sprite_atlases()
+
+@app.cli.command('build-atlases')
+@click.option('--max-size', default=256, show_default=True, help='Longest side of each sprite in pixels.')
+def build_atlases_command(max_size):
+    sprites = build_sprite_atlases(max_size)
+    print(f"Packed {len(sprites)} images into {len({atlas for atlas, _, _, _ in sprites.values()})} atlases; run build-assets afterwards to fingerprint them")
+
+@app.cli.command('build-assets')
+@click.option('--clean', is_flag=True, help='Delete earlier builds first.')
+def build_assets_command(clean):
+    manifest = build_assets(clean)
+    print(f"Fingerprinted {len(manifest)} static files{'' if brotli else ' (install brotli for .br files)'}")
+
+@app.cli.command('prepare')
+def prepare_command():
+    prepare_app()
+    print("Database migrated, catalog seeded and caches warmed")
+
+def load_secret_key():
+    # A random key kept in the instance folder, so every worker and restart
+    # signs sessions with the same key. Linking the finished file into place
+    # means concurrent first starts agree on one key
+    path = os.path.join(instance_dir, 'secret_key')
+    if not os.path.exists(path):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(temp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temp_path)
+    with open(path) as f:
+        return f.read().strip()
+
+def create_app(config=None):
+    # Applies the settings and binds the extensions to the app. config is a
+    # mapping or the path of a Python settings file, applied last. Routes live
+    # on the module-level app, so there is one app per process
+    global TEMPLATES_FINGERPRINT
+    if 'sqlalchemy' in app.extensions:
+        raise RuntimeError('create_app() has already been called in this process')
+    app.config.from_envvar('LAMOPETS_SETTINGS', silent=True)
+    if isinstance(config, str):
+        app.config.from_pyfile(config)
+    elif config:
+        app.config.from_mapping(config)
+    if not app.config['SECRET_KEY']:
+        app.config['SECRET_KEY'] = load_secret_key()
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', storage_engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+    for folder in (app.config['UPLOAD_FOLDER'], app.config['RENDER_CACHE_FOLDER']):
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    db.init_app(app)
+    bcrypt.init_app(app)
+    login_manager.init_app(app)
+    password_hasher.start(app.config['PASSWORD_HASH_WORKERS'], app.config['PASSWORD_HASH_MAX_PENDING'])
+    atexit.register(password_hasher.stop)
+    page_cache.max_entries = app.config['PAGE_CACHE_SIZE']
+    asset_manifest.update(load_asset_manifest())
+    sprite_atlas.update(load_sprite_atlases())
+    TEMPLATES_FINGERPRINT = fingerprint_page_inputs()
+    return app
+
+def prepare_app():
+    # One-off start-up work: schema changes, backfills, seeding and cache
+    # warm-up. A prefork server runs it once in the master (see
+    # gunicorn.conf.py), so the workers inherit the warm caches. The pool is
+    # emptied afterwards so no connection is shared across a fork, except for
+    # an in-memory database, whose single connection is the database itself
     with app.app_context():
         db.create_all()
-        add_items_data()
-        add_pets_data()
+        add_missing_columns()
+        migrate_inventory_table()
+        add_missing_indexes()
+        backfill_last_played_dates()
+        backfill_comment_depths()
+        backfill_topic_activity()
+        migrate_images_to_store()
+        run_with_lock_retry(seed_catalog)
+        ensure_search_index()
+        catalog_cache.get()
+        get_starter_avatar_hash()
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+        db.session.remove()
+        engine = db.engine
+    if not isinstance(engine.pool, StaticPool) and engine.url.database not in (None, '', ':memory:'):
+        engine.dispose()
+
+if __name__ == '__main__':
+    create_app()
+    prepare_app()
     app.run(debug=True, threaded=True)
\ No newline at end of file
@@ -0,0 +1,194 @@
+# Seeds a throwaway SQLite database and drives the real routes with concurrent
+# test clients, then prints latency percentiles, throughput and queries per
+# request as JSON. Runs with the same --seed are comparable across commits.
+#   python benchmarks/load.py --users 200 --topics 50 --comments 2000 --workers 8 --requests 4000 --output before.json
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROUTES = ('forums', 'topic', 'store', 'custom', 'profile', 'purchase_item', 'gain_currency_ft', 'gifting')
+
+parser = argparse.ArgumentParser(description='Load test over the Flask app')
+parser.add_argument('--users', type=int, default=200)
+parser.add_argument('--topics', type=int, default=50)
+parser.add_argument('--comments', type=int, default=2000)
+parser.add_argument('--items-per-user', type=int, default=10, help='Purchased items on top of the starter inventory.')
+parser.add_argument('--pets-per-user', type=int, default=2)
+parser.add_argument('--workers', type=int, default=8)
+parser.add_argument('--requests', type=int, default=4000, help='Total requests across all workers.')
+parser.add_argument('--routes', nargs='+', choices=ROUTES, default=list(ROUTES))
+parser.add_argument('--seed', type=int, default=1)
+parser.add_argument('--workdir', help='Directory for the database; a temporary one by default.')
+parser.add_argument('--output', help='Write the JSON report here as well as to stdout.')
+args = parser.parse_args()
+
+workdir = args.workdir or tempfile.mkdtemp(prefix='lamopets-load-')
+database_path = os.path.join(workdir, 'load.db')
+if os.path.exists(database_path):
+    os.remove(database_path)
+os.environ['DATABASE_URL'] = 'sqlite:///' + database_path
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_dir)
+
+from app import (create_app, db, seed_catalog, catalog_cache, provision_users_bulk, password_hasher, request_metrics,
+                 repair_forum_counters, Topic, Comment, Inventory, AdoptedPet, MAX_NESTING_LEVEL)
+
+# Logins only happen during set-up; a cheap cost keeps seeding fast. Images
+# and the secret key stay out of the working tree
+app = create_app({
+    'WTF_CSRF_ENABLED': False,
+    'BCRYPT_LOG_ROUNDS': 4,
+    'SECRET_KEY': 'load-test',
+    'UPLOAD_FOLDER': os.path.join(workdir, 'avatars'),
+    'RENDER_CACHE_FOLDER': os.path.join(workdir, 'avatar_renders'),
+})
+PASSWORD = 'loadtest'
+
+def seed_database(rng):
+    db.create_all()
+    seed_catalog()
+    catalog = catalog_cache.get()
+    usernames = [f'load{n}' for n in range(1, args.users + 1)]
+    password_hash = password_hasher.hash(PASSWORD)
+    provision_users_bulk([(username, password_hash) for username in usernames])
+    user_ids = dict(db.session.execute(db.text('SELECT username, id FROM user')).all())
+
+    owned = {(row.user_id, row.item_id) for row in Inventory.query.all()}
+    item_ids = sorted(catalog.items_by_id)
+    inventory_rows = []
+    for user_id in user_ids.values():
+        for item_id in rng.sample(item_ids, min(args.items_per_user, len(item_ids))):
+            if (user_id, item_id) not in owned:
+                owned.add((user_id, item_id))
+                inventory_rows.append({'user_id': user_id, 'item_id': item_id})
+    if inventory_rows:
+        db.session.execute(db.insert(Inventory), inventory_rows)
+
+    species = [pet.species for pet in catalog.pets]
+    pet_rows = [{'species': rng.choice(species), 'user_id': str(user_id), 'adopt_name': f'Pet{n}'}
+                for user_id in user_ids.values() for n in range(args.pets_per_user)]
+    if pet_rows and species:
+        db.session.execute(db.insert(AdoptedPet), pet_rows)
+
+    topic_rows = [{'id': n, 'title': f'Load topic {n}', 'description': 'Seeded by benchmarks/load.py', 'username': rng.choice(usernames)}
+                  for n in range(1, args.topics + 1)]
+    if topic_rows:
+        db.session.execute(db.insert(Topic), topic_rows)
+    comment_rows = []
+    comments_by_topic = {}
+    for n in range(1, args.comments + 1 if topic_rows else 1):
+        topic_id = rng.randint(1, args.topics)
+        candidates = [c for c in comments_by_topic.get(topic_id, []) if c['depth'] < MAX_NESTING_LEVEL]
+        parent = rng.choice(candidates) if candidates and rng.random() < 0.5 else None
+        row = {'id': n, 'text': f'Comment {n}', 'topicId': topic_id, 'username': rng.choice(usernames),
+               'parent_id': parent['id'] if parent else None, 'depth': parent['depth'] + 1 if parent else 0}
+        comments_by_topic.setdefault(topic_id, []).append(row)
+        comment_rows.append(row)
+    if comment_rows:
+        db.session.execute(db.insert(Comment), comment_rows)
+    repair_forum_counters()
+    return usernames, item_ids
+
+def make_request(client, route, rng, usernames, item_ids):
+    if route == 'forums':
+        return client.get('/forums')
+    if route == 'topic':
+        return client.get(f'/topic/{rng.randint(1, max(args.topics, 1))}')
+    if route == 'store':
+        return client.get('/store')
+    if route == 'custom':
+        return client.get('/custom')
+    if route == 'profile':
+        return client.get('/profile')
+    if route == 'purchase_item':
+        return client.post(f'/purchase_item/{rng.choice(item_ids)}')
+    if route == 'gain_currency_ft':
+        return client.post('/gain_currency_ft', json=rng.randint(0, 50))
+    return client.post('/gifting', data={'username': rng.choice(usernames), 'currency': 1})
+
+def worker(index, count, usernames, item_ids, results, ready):
+    rng = random.Random(args.seed * 1000 + index)
+    client = app.test_client()
+    client.post('/login', data={'username': usernames[index % len(usernames)], 'password': PASSWORD})
+    # Logins are not part of the measurement
+    ready.wait()
+    samples = []
+    for _ in range(count):
+        route = rng.choice(args.routes)
+        started = time.perf_counter()
+        response = make_request(client, route, rng, usernames, item_ids)
+        samples.append((route, time.perf_counter() - started, response.status_code))
+    results[index] = samples
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+def sql_snapshot():
+    with request_metrics._lock:
+        return dict(request_metrics.sql_statements)
+
+def summarise(samples, elapsed, sql_before, sql_after):
+    latencies = sorted(seconds for _, seconds, _ in samples)
+    statuses = {}
+    for _, _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'queries_per_request': round((sql_after - sql_before) / len(samples), 2),
+        'statuses': statuses,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo_dir, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+with app.app_context():
+    usernames, item_ids = seed_database(random.Random(args.seed))
+
+results = [None] * args.workers
+per_worker = [args.requests // args.workers + (1 if i < args.requests % args.workers else 0) for i in range(args.workers)]
+ready = threading.Barrier(args.workers + 1)
+threads = [threading.Thread(target=worker, args=(i, per_worker[i], usernames, item_ids, results, ready)) for i in range(args.workers)]
+for thread in threads:
+    thread.start()
+ready.wait()
+sql_before = sql_snapshot()
+started = time.perf_counter()
+for thread in threads:
+    thread.join()
+elapsed = time.perf_counter() - started
+sql_after = sql_snapshot()
+
+samples = [sample for worker_samples in results for sample in worker_samples]
+routes = {}
+for route in args.routes:
+    route_samples = [sample for sample in samples if sample[0] == route]
+    if route_samples:
+        routes[route] = summarise(route_samples, elapsed, sql_before.get(route, 0), sql_after.get(route, 0))
+report = {
+    'commit': git_commit(),
+    'config': {key: value for key, value in vars(args).items() if key not in ('workdir', 'output')},
+    'elapsed_seconds': round(elapsed, 3),
+    'routes': routes,
+    'total': summarise(samples, elapsed, sum(sql_before.get(r, 0) for r in args.routes), sum(sql_after.get(r, 0) for r in args.routes)),
+}
+output = json.dumps(report, indent=2)
+print(output)
+if args.output:
+    with open(args.output, 'w') as f:
+        f.write(output + '\n')
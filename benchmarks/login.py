@@ -0,0 +1,61 @@
+# Measures login requests/sec at several bcrypt costs against a throwaway database.
+#   python benchmarks/login.py --costs 4 8 10 12 --threads 8 --seconds 5
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser(description='Login throughput at several bcrypt costs')
+parser.add_argument('--costs', type=int, nargs='+', default=[4, 8, 10, 12])
+parser.add_argument('--threads', type=int, default=8)
+parser.add_argument('--seconds', type=float, default=5.0)
+args = parser.parse_args()
+
+workdir = tempfile.mkdtemp(prefix='lamopets-bench-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db, seed_catalog, provision_user, password_hasher
+
+# Images and the secret key stay out of the working tree
+app = create_app({
+    'WTF_CSRF_ENABLED': False,
+    'SECRET_KEY': 'login-benchmark',
+    'UPLOAD_FOLDER': os.path.join(workdir, 'avatars'),
+    'RENDER_CACHE_FOLDER': os.path.join(workdir, 'avatar_renders'),
+})
+
+def worker(username, deadline, results):
+    client = app.test_client()
+    ok = failed = 0
+    while time.perf_counter() < deadline:
+        response = client.post('/login', data={'username': username, 'password': 'benchmark'})
+        if response.status_code == 302:
+            ok += 1
+        else:
+            failed += 1
+    results.append((ok, failed))
+
+with app.app_context():
+    db.create_all()
+    seed_catalog()
+
+print(f"{'cost':>4} {'req/s':>9} {'ok':>7} {'failed':>7}")
+for cost in args.costs:
+    app.config['BCRYPT_LOG_ROUNDS'] = cost
+    username = f'bench{cost}'
+    with app.app_context():
+        provision_user(username, password_hasher.hash('benchmark'))
+    results = []
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(username, start + args.seconds, results)) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    ok = sum(r[0] for r in results)
+    failed = sum(r[1] for r in results)
+    print(f'{cost:>4} {ok / elapsed:>9.1f} {ok:>7} {failed:>7}')
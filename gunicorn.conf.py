@@ -0,0 +1,13 @@
+# gunicorn -c gunicorn.conf.py wsgi:app
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * (os.cpu_count() or 1) + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+# The app is imported once in the master, so prepare_app() below runs before
+# any worker is forked and the workers share its warm caches copy-on-write
+preload_app = True
+
+def on_starting(server):
+    from app import prepare_app
+    prepare_app()
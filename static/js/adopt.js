@@ -44,7 +44,9 @@ document.addEventListener('DOMContentLoaded', () => {
             const petPrice = button.getAttribute('data-price');
             const petImage = button.getAttribute('data-pet-img');
             const petElement = button.closest('.item');
-            const eggImgUrl = petElement.querySelector('img').src;
+            // Atlas sprites keep the real image URL in data-src
+            const eggImg = petElement.querySelector('img');
+            const eggImgUrl = eggImg.dataset.src || eggImg.src;
 
             confirmText.textContent = `Would you like to buy ${petName} for ${petPrice} Lamocoins?`;
             purchaseEggImg.src = eggImgUrl;
@@ -63,7 +65,8 @@ document.addEventListener('DOMContentLoaded', () => {
         namePopup.style.display = 'block';
 
         const activePetElement = document.querySelector('.item.active');
-        const eggImgUrl = activePetElement.querySelector('img').src;
+        const eggImg = activePetElement.querySelector('img');
+        const eggImgUrl = eggImg.dataset.src || eggImg.src;
         nameEggImg.src = eggImgUrl;
     });
 
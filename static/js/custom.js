@@ -1,67 +1,4 @@
 document.getElementById('saveButton').addEventListener('click', function() {
-    var avatarParts = ['gender', 'eyes', 'mouth', 'misc', 'pants', 'shirt', 'hair', 'shoes'];
-    var avatarContainer = document.getElementById('avatar');
-
-    // Create a main canvas
-    var mainCanvas = document.createElement('canvas');
-    mainCanvas.width = avatarContainer.offsetWidth;
-    mainCanvas.height = avatarContainer.offsetHeight;
-    var mainContext = mainCanvas.getContext('2d');
-
-    // Function to load image
-    function loadImage(partElement) {
-        return new Promise((resolve, reject) => {
-            var img = new Image();
-            img.crossOrigin = "Anonymous";
-            img.src = partElement.style.backgroundImage.slice(5, -2); // Extract URL from backgroundImage style
-            img.onload = function() {
-                resolve(img);
-            };
-            img.onerror = reject;
-        });
-    }
-
-    // Function to draw image
-    function drawImage(partElement, img) {
-        var partCanvas = document.createElement('canvas');
-        partCanvas.width = partElement.offsetWidth;
-        partCanvas.height = partElement.offsetHeight;
-        var partContext = partCanvas.getContext('2d');
-
-        // Apply the filter and draw the image
-        partContext.filter = window.getComputedStyle(partElement).getPropertyValue('filter');
-        partContext.drawImage(img, 0, 0, partElement.offsetWidth, partElement.offsetHeight);
-
-        // Draw the part canvas onto the main canvas
-        mainContext.drawImage(partCanvas, partElement.offsetLeft, partElement.offsetTop);
-    }
-
-    // Load all images
-    var promises = avatarParts.map(part => {
-        var partElement = document.getElementById(part);
-        if (partElement.style.backgroundImage) {
-            return loadImage(partElement).then(img => ({ partElement, img }));
-        } else {
-            return Promise.resolve(null);
-        }
-    });
-
-    // Draw all images in order
-    Promise.all(promises).then(results => {
-        results.forEach(result => {
-            if (result) {
-                drawImage(result.partElement, result.img);
-            }
-        });
-        var imgData = mainCanvas.toDataURL('image/png');
-        saveAvatar(imgData);
-    }).catch(error => {
-        console.error('Error capturing avatar:', error);
-        alert('Error capturing avatar: ' + error);
-    });
-});
-
-function saveAvatar(imgData) {
     var requiredParts = ['gender', 'eyes', 'mouth', 'shirt', 'pants', 'hair'];
     var missingParts = [];
     
@@ -78,12 +15,17 @@ function saveAvatar(imgData) {
         return;
     }
 
-    fetch('/save-avatar', {
+    // The server composites the avatar from the chosen item ids
+    fetch('/save-avatar-outfit', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ image: imgData }),
+        body: JSON.stringify({
+            gender: selectedGender,
+            items: Object.values(selectedItems),
+            filters: { gender: selectedFilters.gender || '', eyes: selectedFilters.eyes || '' },
+        }),
     })
     .then(response => {
         if (!response.ok) {
@@ -102,9 +44,13 @@ function saveAvatar(imgData) {
         console.error('Error saving avatar:', error);
         alert('Error saving avatar: ' + error);
     });
-}
+});
 
 var selectedGender = '';
+// Item id chosen for each part, keyed by part name
+var selectedItems = {};
+// Colour filter applied to each part; skin tone and eye colour are sent with the outfit
+var selectedFilters = {};
 
 function filterOptions() {
     var gender = selectedGender;
@@ -133,6 +79,7 @@ function updateAvatarPart(partId, imageUrl) {
 function resetFilter(partId) {
     var partElement = document.getElementById(partId);
     partElement.style.filter = '';
+    delete selectedFilters[partId];
 }
 
 function changeGender(gender) {
@@ -146,6 +93,8 @@ function changeGender(gender) {
 }
 
 function resetCustomItems() {
+    selectedItems = {};
+    selectedFilters = {};
     var customParts = ['eyes', 'mouth', 'misc', 'pants', 'shirt', 'hair', 'shoes'];
     customParts.forEach(part => {
         if (part !== 'gender') {
@@ -196,6 +145,7 @@ document.querySelectorAll('#miscType .option').forEach(button => {
             var miscElement = document.getElementById('misc');
             miscElement.style.backgroundImage = '';
             miscElement.style.filter = '';
+            delete selectedItems.misc;
         } else {
             updateAvatarPart(part, imageUrl);
         }
@@ -220,11 +170,20 @@ document.querySelectorAll('.color-btn').forEach(button => {
         
         var option = this.closest('.option');
         if (option) {
+            // A skin tone button also picks its body when another one is shown
+            if (part === 'gender' && option.getAttribute('data-gender') !== selectedGender) {
+                changeGender(option.getAttribute('data-gender'));
+            }
             var imageUrl = option.getAttribute('data-image');
             console.log('Updating part:', part, 'with image URL:', imageUrl);
             
             updateAvatarPart(part, imageUrl);
             changeColor(part, filter);
+            // Skin tone and eye colour buttons carry only a filter, not an item
+            var itemId = this.getAttribute('data-item-id');
+            if (itemId) {
+                selectedItems[part] = itemId;
+            }
         } else {
             console.error('Parent option not found for color button:', this);
         }
@@ -234,6 +193,7 @@ document.querySelectorAll('.color-btn').forEach(button => {
 function changeColor(partId, filter) {
     var partElement = document.getElementById(partId);
     partElement.style.filter = filter;
+    selectedFilters[partId] = filter || '';
 }
 
 function setDefaultClothing() {
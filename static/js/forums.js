@@ -27,4 +27,89 @@ window.addEventListener('resize', function() {
         document.getElementById("navicon").style.display = "block";
         document.getElementById("logout-button").style.display = "none";  
     }
-});
\ No newline at end of file
+});
+
+// Infinite scroll for the topic list: when the "Load more topics" link comes
+// into view, the next page is fetched from /forums/topics and appended.
+// forums.html includes this file twice, so only set it up once.
+if (!window.topicScrollReady) {
+    window.topicScrollReady = true;
+    document.addEventListener('DOMContentLoaded', function() {
+        const loadMore = document.getElementById('load-more-topics');
+        if (!loadMore || !('IntersectionObserver' in window)) {
+            return;
+        }
+        const topicList = document.getElementById('topic-list');
+        let loading = false;
+
+        function renderTopic(topic) {
+            const row = document.createElement('div');
+            row.className = 'd-flex text-body-secondary pt-3';
+            if (topic.profile_pic) {
+                const pic = document.createElement('img');
+                pic.src = topic.profile_pic;
+                pic.alt = 'Profile Picture';
+                pic.className = 'profile-pic';
+                row.appendChild(pic);
+            }
+            const info = document.createElement('p');
+            info.className = 'pb-3 mb-0 small lh-sm border-bottom info';
+            const user = document.createElement('strong');
+            user.className = 'text-gray-dark';
+            user.textContent = '@' + topic.username;
+            const title = document.createElement('strong');
+            title.className = 'text-gray-dark';
+            const link = document.createElement('a');
+            link.href = topic.url;
+            link.textContent = topic.title;
+            title.append(' ', link);
+            const activity = document.createElement('span');
+            activity.className = 'text-body-tertiary';
+            activity.textContent = topic.comment_count + ' comments';
+            if (topic.last_comment_at) {
+                const lastReply = new Date(topic.last_comment_at);
+                activity.textContent += ' \u00b7 last reply ' + lastReply.toLocaleString([], {day: '2-digit', month: 'short', year: 'numeric', hour: '2-digit', minute: '2-digit'});
+            }
+            info.append(user, document.createElement('br'), title, document.createElement('br'), topic.description || '',
+                        document.createElement('br'), activity);
+            row.appendChild(info);
+            if (topic.delete_url) {
+                const form = document.createElement('form');
+                form.className = 'delete';
+                form.id = 'delete-form-' + topic.id;
+                form.action = topic.delete_url;
+                form.method = 'post';
+                const button = document.createElement('button');
+                button.type = 'button';
+                button.className = 'font';
+                button.textContent = 'Delete';
+                button.addEventListener('click', function() { confirmDeleteTopic(topic.id); });
+                form.appendChild(button);
+                row.appendChild(form);
+            }
+            return row;
+        }
+
+        const observer = new IntersectionObserver(function(entries) {
+            if (!entries[0].isIntersecting || loading) {
+                return;
+            }
+            loading = true;
+            fetch('/forums/topics?before=' + encodeURIComponent(loadMore.dataset.nextBefore))
+                .then(response => response.json())
+                .then(data => {
+                    data.topics.forEach(topic => topicList.insertBefore(renderTopic(topic), loadMore));
+                    if (data.next_before === null) {
+                        observer.disconnect();
+                        loadMore.remove();
+                    } else {
+                        loadMore.dataset.nextBefore = data.next_before;
+                        loadMore.href = '/forums?before=' + data.next_before;
+                    }
+                })
+                .catch(error => console.error('Error loading topics:', error))
+                .finally(() => { loading = false; });
+        });
+        observer.observe(loadMore);
+    });
+}
@@ -78,6 +78,20 @@ document.addEventListener('DOMContentLoaded', () => {
     const yesButton = document.getElementById('yesButton');
     const purchaseItemImg = document.getElementById('purchase-item-img');
     let activePriceButton; 
+    // Item ids the user owns, fetched once per page load
+    let ownedItems = new Set();
+
+    fetch('/owned_items')
+    .then(response => {
+        if (!response.ok) {
+            throw new Error('Network response was not ok');
+        }
+        return response.json();
+    })
+    .then(data => {
+        ownedItems = new Set(data.owned);
+    })
+    .catch(error => console.error('Error loading owned items:', error));
 
     buttons.forEach(button => {
         button.addEventListener('click', () => {
@@ -85,30 +99,19 @@ document.addEventListener('DOMContentLoaded', () => {
             const filter = button.getAttribute('data-filter');
             const itemId = button.getAttribute('data-item-id');
             const itemElement = button.closest('.item');
-            const itemImgUrl = itemElement.querySelector('img').src;
+            // Atlas sprites keep the real image URL in data-src
+            const itemImg = itemElement.querySelector('img');
+            const itemImgUrl = itemImg.dataset.src || itemImg.src;
 
             console.log(`Applying filter: ${filter}`);
 
-            fetch(`/check_inventory/${itemId}`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify({ itemId: itemId })
-            })
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error('Network response was not ok');
-                }
-                return response.json();
-            })
-            .then(data => {
-                if (data.owned) {
-                    confirmText.textContent = `You already own this item. Would you still like to buy it for ${itemPrice} Lamocoins?`;
-                } else {
-                    confirmText.textContent = `Would you like to buy this item for ${itemPrice} Lamocoins?`;
-                }
-            })
+            if (ownedItems.has(itemId)) {
+                confirmText.textContent = `You already own this item.`;
+                yesButton.style.display = 'none';
+            } else {
+                confirmText.textContent = `Would you like to buy this item for ${itemPrice} Lamocoins?`;
+                yesButton.style.display = '';
+            }
 
             purchaseItemImg.src = itemImgUrl;
             purchaseItemImg.style.filter = filter;
@@ -0,0 +1,58 @@
+# The app reads DATABASE_URL at import and create_app() runs once per
+# process, so every test shares one app on a throwaway SQLite file and gets
+# freshly created tables.
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import event
+
+workdir = tempfile.mkdtemp(prefix='lamopets-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'test.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db, seed_catalog, User
+
+app = create_app({
+    'TESTING': True,
+    'WTF_CSRF_ENABLED': False,
+    'BCRYPT_LOG_ROUNDS': 4,
+    'SECRET_KEY': 'tests',
+    'UPLOAD_FOLDER': os.path.join(workdir, 'avatars'),
+    'RENDER_CACHE_FOLDER': os.path.join(workdir, 'avatar_renders'),
+})
+
+@pytest.fixture
+def database():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed_catalog()
+        yield db
+        db.session.remove()
+
+@pytest.fixture
+def login(database):
+    # Registers a user and returns a test client logged in as them
+    def login(username, moderator=False):
+        client = app.test_client()
+        client.post('/register', data={'username': username, 'password': 'secret1'})
+        if moderator:
+            db.session.execute(db.update(User).where(User.username == username).values(moderator='yes'))
+            db.session.commit()
+        client.post('/login', data={'username': username, 'password': 'secret1'})
+        return client
+    return login
+
+@pytest.fixture
+def statements(database):
+    # SQL statements run on the engine while the test is active
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', record)
@@ -0,0 +1,18 @@
+import pytest
+
+@pytest.mark.parametrize('body', [
+    ['not', 'an', 'object'],
+    {'gender': ['Male'], 'items': []},
+    {'gender': 'Male', 'items': [['x']]},
+    {'gender': 'Male', 'items': [{'id': 'x'}]},
+    {'gender': 'Male', 'items': 'H01BLACK-M'},
+    {'gender': 'Male', 'items': [], 'filters': {'gender': ['sepia(65%)']}},
+    {'gender': 'Male', 'items': [], 'filters': ['sepia(65%)']},
+])
+def test_save_avatar_outfit_rejects_malformed_json(login, body):
+    client = login('dresser')
+
+    response = client.post('/save-avatar-outfit', json=body)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Invalid outfit'}
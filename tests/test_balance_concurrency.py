@@ -0,0 +1,48 @@
+import random
+import threading
+
+from app import db, catalog_cache, AdoptedPet, User, DAILY_CHANCES, MINIGAMES
+
+THREADS = 8
+ROUNDS_PER_THREAD = 12
+SCORE = 5
+
+def test_concurrent_rewards_and_adoptions_lose_no_updates(login):
+    # One client per thread, all logged in as the same user
+    clients = [login('player') for _ in range(THREADS)]
+    pet = min(catalog_cache.get().pets, key=lambda pet: pet.price)
+    start_balance = db.session.scalar(db.select(User.currency_balance).where(User.username == 'player'))
+    results = [[] for _ in range(THREADS)]
+    ready = threading.Barrier(THREADS)
+
+    def play(index):
+        rng = random.Random(index)
+        ready.wait()
+        for _ in range(ROUNDS_PER_THREAD):
+            if rng.random() < 0.5:
+                game = rng.choice(MINIGAMES)
+                response = clients[index].post(f'/gain_currency_{game}', json=SCORE)
+                results[index].append((game, response.status_code, response.get_json()))
+            else:
+                response = clients[index].post(f'/adopt_pet/{pet.species}', json={'pet_name': 'Stressy'})
+                results[index].append(('adopt', response.status_code, response.get_json()))
+
+    threads = [threading.Thread(target=play, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    outcomes = [outcome for thread_results in results for outcome in thread_results]
+    assert all(status in (200, 400) for _, status, _ in outcomes), outcomes
+    rewards = {game: sum(1 for kind, status, _ in outcomes if kind == game and status == 200) for game in MINIGAMES}
+    adoptions = sum(1 for kind, status, _ in outcomes if kind == 'adopt' and status == 200)
+    assert all(body['daily_chances'] >= 0 for kind, status, body in outcomes if kind in MINIGAMES and status == 200)
+
+    db.session.expire_all()
+    user = db.session.scalar(db.select(User).where(User.username == 'player'))
+    assert user.currency_balance == start_balance + sum(rewards.values()) * SCORE - adoptions * pet.price
+    assert db.session.scalar(db.select(db.func.count()).select_from(AdoptedPet).where(AdoptedPet.user_id == user.id)) == adoptions
+    for game in MINIGAMES:
+        # Every accepted round used up exactly one chance
+        assert getattr(user, f'daily_chances_{game}') == DAILY_CHANCES - rewards[game] >= 0
@@ -0,0 +1,30 @@
+from app import db, repair_forum_counters, Topic, Comment, COMMENT_PAGE_SIZE
+
+def seed_topic(top_level_comments):
+    db.session.execute(db.insert(Topic), [{'id': 1, 'title': 'Long thread', 'description': '', 'username': 'author'}])
+    db.session.execute(db.insert(Comment), [{'id': n, 'text': f'Comment {n}', 'topicId': 1, 'username': 'author'}
+                                            for n in range(1, top_level_comments + 1)])
+    repair_forum_counters()
+
+def test_new_comment_redirects_to_the_page_showing_it(login):
+    seed_topic(COMMENT_PAGE_SIZE + 5)
+    client = login('poster')
+
+    response = client.post('/topic/1', data={'comment': 'Late reply', 'parent_id': ''})
+
+    new_id = COMMENT_PAGE_SIZE + 6
+    assert response.status_code == 302
+    assert response.location == f'/topic/1?after={new_id - 1}#comment-{new_id}'
+    assert f'id="comment-{new_id}"' in client.get(response.location).get_data(as_text=True)
+
+def test_reply_redirects_to_the_page_starting_at_its_thread(login):
+    seed_topic(COMMENT_PAGE_SIZE + 5)
+    client = login('poster')
+    parent_id = COMMENT_PAGE_SIZE + 2
+
+    response = client.post('/topic/1', data={'comment': 'Nested reply', 'parent_id': str(parent_id)})
+
+    reply_id = COMMENT_PAGE_SIZE + 6
+    assert response.location == f'/topic/1?after={parent_id - 1}#comment-{reply_id}'
+    page = client.get(response.location).get_data(as_text=True)
+    assert f'id="comment-{parent_id}"' in page and f'id="comment-{reply_id}"' in page
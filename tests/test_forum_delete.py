@@ -0,0 +1,52 @@
+from app import db, repair_forum_counters, Topic, Comment, MAX_NESTING_LEVEL
+
+COMMENTS = 5000
+# Statements per delete request, counting the user and row lookups and the
+# counter refresh. Deleting row by row would run thousands
+QUERY_BUDGET = 10
+
+def seed_topic(comment_count=COMMENTS):
+    # One topic whose comments form chains of MAX_NESTING_LEVEL + 1 levels
+    db.session.execute(db.insert(Topic), [{'id': 1, 'title': 'Busy topic', 'description': '', 'username': 'author'}])
+    rows = []
+    for n in range(1, comment_count + 1):
+        depth = (n - 1) % (MAX_NESTING_LEVEL + 1)
+        rows.append({'id': n, 'text': f'Comment {n}', 'topicId': 1, 'username': 'author',
+                     'parent_id': n - 1 if depth else None, 'depth': depth})
+    db.session.execute(db.insert(Comment), rows)
+    repair_forum_counters()
+
+def test_delete_topic_with_5000_comments_within_query_budget(login, statements):
+    seed_topic()
+    client = login('moderator', moderator=True)
+    statements.clear()
+
+    response = client.post('/delete/topic/1')
+
+    assert response.status_code == 302
+    assert len(statements) <= QUERY_BUDGET, statements
+    assert db.session.get(Topic, 1) is None
+    assert db.session.scalar(db.select(db.func.count()).select_from(Comment)) == 0
+
+def test_delete_comment_subtree_within_query_budget(login, statements):
+    seed_topic()
+    client = login('moderator', moderator=True)
+    statements.clear()
+
+    # Comment 1 starts the first chain: it and its two nested replies go
+    response = client.post('/delete/comment/1')
+
+    assert response.status_code == 302
+    assert len(statements) <= QUERY_BUDGET, statements
+    remaining = db.session.scalars(db.select(Comment.id).where(Comment.id <= MAX_NESTING_LEVEL + 2)).all()
+    assert remaining == [MAX_NESTING_LEVEL + 2]
+    db.session.expire_all()
+    topic = db.session.get(Topic, 1)
+    assert topic.comment_count == COMMENTS - (MAX_NESTING_LEVEL + 1)
+
+def test_delete_comment_requires_author_or_moderator(login):
+    seed_topic(3)
+    client = login('someone')
+
+    assert client.post('/delete/comment/1').status_code == 403
+    assert db.session.scalar(db.select(db.func.count()).select_from(Comment)) == 3
@@ -0,0 +1,24 @@
+from sqlalchemy import text
+
+from app import db, catalog_cache, migrate_inventory_table, Inventory, User
+
+def test_duplicate_inventory_rows_are_refunded_at_the_recycle_rate(login):
+    login('collector')
+    user = db.session.scalar(db.select(User).where(User.username == 'collector'))
+    start_balance = user.currency_balance
+    first, second = sorted(catalog_cache.get().items_by_id.values(), key=lambda item: item.id)[:2]
+    # The layout before the unique index: text user ids and repeated rows
+    db.session.execute(text('DROP TABLE inventory'))
+    db.session.execute(text('CREATE TABLE inventory (id INTEGER PRIMARY KEY, user_id VARCHAR, item_id INTEGER)'))
+    rows = [first.id] * 3 + [second.id] * 2
+    db.session.execute(text('INSERT INTO inventory (user_id, item_id) VALUES (:user_id, :item_id)'),
+                       [{'user_id': str(user.id), 'item_id': item_id} for item_id in rows])
+    db.session.commit()
+
+    migrate_inventory_table()
+
+    owned = db.session.scalars(db.select(Inventory.item_id).where(Inventory.user_id == user.id).order_by(Inventory.item_id)).all()
+    assert owned == [first.id, second.id]
+    db.session.expire_all()
+    refund = 2 * (first.price // 2) + second.price // 2
+    assert db.session.get(User, user.id).currency_balance == start_balance + refund
@@ -0,0 +1,6 @@
+# WSGI entry point. Production runs several workers from one preloaded master:
+#   gunicorn -c gunicorn.conf.py wsgi:app
+# The Flask CLI uses it too: flask --app wsgi <command>
+from app import create_app
+
+app = create_app()